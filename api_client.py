@@ -1,67 +1,165 @@
-import http.client
+import hashlib
 import json
 import uuid
 import os
+import threading
+import time
 import websockets
 import requests
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Optional, Dict, Any, Callable, Union, BinaryIO
 from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+
+from config import (
+    API_TIMEOUT,
+    API_CONNECT_TIMEOUT,
+    API_UPLOAD_TIMEOUT,
+    API_POOL_CONNECTIONS,
+    API_POOL_MAXSIZE,
+    UPLOAD_MAX_IN_FLIGHT,
+    UPLOAD_CHUNK_RETRIES,
+    UPLOAD_RETRY_BACKOFF,
+    UPLOAD_SKIP_DUPLICATES,
+)
+from chunk_sizing import get_chunk_sizer
+from chunk_source import ChunkSource, open_chunk_source
+from resilience import CircuitOpenError, RetryPolicy, resilient_request
+from response_cache import ResponseCache
+from singleflight import get_singleflight
+from upload_dedup import UPLOADED, get_dedup_index
+from upload_manifest import ManifestStore, sha256_hex
+
+
+# One connection pool per process. HTTPAdapter's urllib3 PoolManager is
+# thread-safe, so every session-scoped client mounts this same adapter while
+# keeping its own headers, cookies and credentials.
+_shared_adapter = HTTPAdapter(
+    pool_connections=API_POOL_CONNECTIONS,
+    pool_maxsize=API_POOL_MAXSIZE,
+    pool_block=True,
+)
+
+
+# Chunks are keyed by upload uuid and index, so resending one is always safe
+_CHUNK_RETRY_POLICY = RetryPolicy(attempts=UPLOAD_CHUNK_RETRIES + 1, base_delay=UPLOAD_RETRY_BACKOFF)
+
+
+def _build_session() -> requests.Session:
+    """Create a keep-alive session on the process-wide bounded connection pool.
+
+    ``pool_maxsize`` caps open connections per host and ``pool_block`` makes
+    callers wait for a free connection instead of opening extra ones.
+    """
+    session = requests.Session()
+    session.mount("https://", _shared_adapter)
+    session.mount("http://", _shared_adapter)
+    return session
+
 
 class SwechaAPIClient:
-    def __init__(self):
+    def __init__(self, cache: Optional[ResponseCache] = None):
         self.base_host = "api.corpus.swecha.org"
         self.api_base = "/api/v1"
         self.api_base_url = "https://api.corpus.swecha.org/api/v1"
         self.auth_token = None
         self.user_data = None
-        self.chunk_size = 5 * 1024 * 1024  # 5MB 
+        self.chunk_size = None  # fixed chunk size in bytes; None plans one per upload from measured throughput
+        self.chunk_sizer = get_chunk_sizer()
+        self.max_in_flight = UPLOAD_MAX_IN_FLIGHT
+        self.manifests = ManifestStore()
+        # Cache for slow-changing reads (categories, profile, contributions)
+        self.cache = cache if cache is not None else ResponseCache()
+        # Identical reads already in flight from any session are shared, not repeated
+        self.flight = get_singleflight()
 
-        self.session = requests.Session()
+        # Per-client session (own auth headers) over the shared connection pool
+        self.session = _build_session()
     
     def _make_request(self, method: str, endpoint: str, payload: Dict = None, headers: Dict = None, require_auth: bool = False) -> Dict:
-        """Make HTTP request to Swecha API"""
-        conn = http.client.HTTPSConnection(self.base_host, timeout=10)  # Add timeout
-        
+        """Make HTTP request to Swecha API over the pooled keep-alive session.
+
+        Requests go through ``resilience``: idempotent ones are retried with
+        jittered backoff and every endpoint has a circuit breaker. Transport
+        errors come back with ``status_code`` None, an open circuit as 503.
+        """
         default_headers = {"content-type": "application/json"}
         if headers:
             default_headers.update(headers)
         
         if require_auth and self.auth_token:
             default_headers["authorization"] = f"Bearer {self.auth_token}"
+        elif not require_auth and "authorization" not in {k.lower() for k in default_headers}:
+            # Don't leak the session-level bearer token to unauthenticated endpoints
+            default_headers["authorization"] = None
         
         payload_str = json.dumps(payload) if payload else None
         
         try:
-            conn.request(method, f"{self.api_base}{endpoint}", payload_str, default_headers)
-            res = conn.getresponse()
-            data = res.read()
+            res = resilient_request(
+                lambda: self.session.request(
+                    method,
+                    f"{self.api_base_url}{endpoint}",
+                    data=payload_str,
+                    headers=default_headers,
+                    timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT),
+                ),
+                method,
+                endpoint,
+            )
+            data = res.content
             try:
                 response_data = json.loads(data.decode("utf-8"))
             except Exception:
-                response_data = {"raw": data.decode("utf-8")}
+                response_data = {"raw": data.decode("utf-8", errors="replace")}
             # Add debug info for server errors
-            if res.status >= 500:
-                print("DEBUG: Server Error", res.status, endpoint)
+            if res.status_code >= 500:
+                print("DEBUG: Server Error", res.status_code, endpoint)
                 print("Payload:", payload)
                 print("Response:", response_data)
             return {
-                "status_code": res.status,
+                "status_code": res.status_code,
                 "data": response_data,
-                "success": 200 <= res.status < 300
+                "success": 200 <= res.status_code < 300
+            }
+        except CircuitOpenError as e:
+            return {
+                "status_code": 503,
+                "data": {"error": str(e)},
+                "success": False
             }
         except Exception as e:
             print("DEBUG: Exception during API request:", str(e))
             return {
-                "status_code": 500,
+                "status_code": None,  # no HTTP response
                 "data": {"error": str(e)},
                 "success": False
             }
-        finally:
-            conn.close()
     
+    def _cached_request(self, endpoint_key: str, fetch: Callable[[], Dict], *key_args,
+                        per_user: bool = True) -> Dict:
+        """Serve a read from the response cache, fetching and storing it on a miss.
+
+        Entries are keyed by the auth token so one login never sees another's
+        data; only successful responses are cached. A miss joins an identical
+        fetch already in flight from another session; ``per_user=False`` lets
+        every login share it, for reads whose response doesn't depend on who
+        asks.
+        """
+        key = (endpoint_key, self.auth_token) + key_args
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        flight_key = ("api",) + (key if per_user else (endpoint_key,) + key_args)
+        response = self.flight.do(flight_key, fetch)
+        if response.get("success"):
+            self.cache.set(key, response)
+        return response
+
     def login(self, phone: str, password: str) -> Dict[str, Any]:
         """Login user with phone and password"""
         payload = {
@@ -75,6 +173,7 @@ class SwechaAPIClient:
             # Extract token and user data from response
             token = response["data"].get("access_token")
             if token:
+                self.cache.invalidate()
                 self.auth_token = token
                 # For login endpoint, user data might be in a different structure
                 # Try to get user data from the response
@@ -121,13 +220,23 @@ class SwechaAPIClient:
         return self._make_request("POST", "/auth/change-password", payload, require_auth=True)
     
     def get_user_contributions(self, user_id: str) -> Dict[str, Any]:
-        """Get user contributions"""
-        return self._make_request("GET", f"/users/{user_id}/contributions", require_auth=True)
-    def _handle_response(self, response: requests.Response) -> Optional[Dict]:
-        """Handle API response and errors"""
+        """Get user contributions (cached for API_CACHE_TTLS['contributions'])"""
+        return self._cached_request(
+            "contributions",
+            lambda: self._make_request("GET", f"/users/{user_id}/contributions", require_auth=True),
+            user_id,
+        )
+    def _handle_response(self, response: requests.Response, notify: bool = True) -> Optional[Dict]:
+        """Handle API response and errors.
+
+        ``notify=False`` skips the Streamlit error widgets, for calls made off
+        the script thread (e.g. parallel chunk uploads).
+        """
         try:
             if response.status_code in [200, 201]:
                 return response.json()
+            if not notify:
+                return None
             elif response.status_code == 401:
                 st.error("Authentication failed. Please login again.")
                 st.session_state.authenticated = False
@@ -143,10 +252,11 @@ class SwechaAPIClient:
                 st.error(f"API Error ({response.status_code}): {response.text}")
                 return None
         except Exception as e:
-            st.error(f"Error processing response: {str(e)}")
+            if notify:
+                st.error(f"Error processing response: {str(e)}")
             return None 
     
-    def upload_audio_chunk(self, chunk_data: bytes, filename: str, chunk_index: int, total_chunks: int, upload_uuid: str) -> Dict:
+    def upload_audio_chunk(self, chunk_data: bytes, filename: str, chunk_index: int, total_chunks: int, upload_uuid: str, notify: bool = True) -> Dict:
         """Upload a single chunk of a file (POST /api/v1/records/upload/chunk)"""
         try:
             files = {"chunk": (filename, chunk_data, "application/octet-stream")}
@@ -162,22 +272,105 @@ class SwechaAPIClient:
             if self.auth_token:
                 headers["Authorization"] = f"Bearer {self.auth_token}"
 
-            response = self.session.post(
-                f"{self.api_base_url}/records/upload/chunk",  # Fixed URL - removed duplicate /api/v1
-                files=files,
-                data=data,
-                headers=headers
+            response = resilient_request(
+                lambda: self.session.post(
+                    f"{self.api_base_url}/records/upload/chunk",  # Fixed URL - removed duplicate /api/v1
+                    files=files,
+                    data=data,
+                    headers=headers,
+                    timeout=(API_CONNECT_TIMEOUT, API_UPLOAD_TIMEOUT),
+                ),
+                "POST",
+                "/records/upload/chunk",
+                idempotent=True,
+                policy=_CHUNK_RETRY_POLICY,
             )
-            response_data = self._handle_response(response)
+            response_data = self._handle_response(response, notify=notify)
             if response_data:
-                return {"success": True, "data": response_data}
+                return {"success": True, "data": response_data, "status_code": response.status_code}
             else:
-                return {"success": False, "data": {"error": "Failed to upload chunk"}}
+                return {"success": False, "data": {"error": f"Failed to upload chunk {chunk_index}: {response.text}"}, "status_code": response.status_code}
         except requests.RequestException as e:
-            st.error(f"File chunk upload error: {str(e)}")
-            return {"success": False, "data": {"error": str(e)}}
+            if notify:
+                st.error(f"File chunk upload error: {str(e)}")
+            return {"success": False, "data": {"error": str(e)}, "status_code": None}
+
+    def _upload_chunk_with_retry(self, chunk_data: bytes, filename: str, chunk_index: int, total_chunks: int, upload_uuid: str) -> Dict:
+        """Upload one chunk, retrying transient failures per ``_CHUNK_RETRY_POLICY``.
+
+        Client errors (4xx other than 429) are not retried since resending the
+        same chunk cannot succeed. The chunk's timing (retries included) feeds
+        the chunk sizer.
+        """
+        started = time.monotonic()
+        result = self.upload_audio_chunk(chunk_data, filename, chunk_index, total_chunks, upload_uuid, notify=False)
+        if result.get("success"):
+            self.chunk_sizer.observe(len(chunk_data), time.monotonic() - started)
+        elif result.get("status_code") is None:
+            self.chunk_sizer.failed()  # timeout or dropped connection
+        result["chunk_index"] = chunk_index
+        return result
+
+    def _upload_chunks(self, chunk_indexes: list, read_chunk: Callable[[int], memoryview], filename: str, total_chunks: int,
+                       upload_uuid: str, max_in_flight: int, progress_callback: Optional[Callable] = None,
+                       on_chunk_acked: Optional[Callable[[int], None]] = None) -> Dict:
+        """Upload the given chunks with at most ``max_in_flight`` requests outstanding.
+
+        Chunks are read lazily as slots free up, so only ``max_in_flight``
+        chunk buffers are alive at once. Completion is tracked per index and
+        the upload only counts as done once every chunk has been acknowledged.
+        ``on_chunk_acked`` and ``progress_callback`` run on the calling thread.
+        Returns ``{"success": True, "acked": [...]}`` or the first failed
+        chunk result (with ``acked`` attached).
+        """
+        acked = set()
+        bytes_sent = 0
+        pending = iter(chunk_indexes)
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_in_flight)) as executor:
+            in_flight = {}
+
+            def submit_next() -> bool:
+                index = next(pending, None)
+                if index is None:
+                    return False
+                chunk_data = read_chunk(index)
+                future = executor.submit(self._upload_chunk_with_retry, chunk_data, filename, index, total_chunks, upload_uuid)
+                in_flight[future] = len(chunk_data)
+                return True
+
+            for _ in range(max(1, max_in_flight)):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    size = in_flight.pop(future)
+                    result = future.result()
+                    if result.get("success"):
+                        acked.add(result["chunk_index"])
+                        bytes_sent += size
+                        if on_chunk_acked:
+                            on_chunk_acked(result["chunk_index"])
+                        if progress_callback:
+                            progress_callback(len(acked), total_chunks, bytes_sent)
+                    elif failure is None:
+                        failure = result
+                    # Stop feeding new chunks once one has failed for good
+                    if failure is None:
+                        submit_next()
 
-    def finalize_audio_upload(self, title: str, description: str, media_type: str, filename: str, total_chunks: int, release_rights: str, language: str, upload_uuid: str, user_id: str, category_id: str, latitude: Optional[float] = None, longitude: Optional[float] = None, use_uid_filename: Optional[bool] = None) -> Optional[Dict]:
+        if failure is not None:
+            failure["acked"] = sorted(acked)
+            return failure
+        missing = [i for i in chunk_indexes if i not in acked]
+        if missing:
+            return {"success": False, "data": {"error": f"Chunks not acknowledged: {missing}"}, "acked": sorted(acked)}
+        return {"success": True, "acked": sorted(acked)}
+
+    def finalize_audio_upload(self, title: str, description: str, media_type: str, filename: str, total_chunks: int, release_rights: str, language: str, upload_uuid: str, user_id: str, category_id: str, latitude: Optional[float] = None, longitude: Optional[float] = None, use_uid_filename: Optional[bool] = None, notify: bool = True) -> Optional[Dict]:
         """Finalize chunked upload and create a record (POST /api/v1/records/upload)"""
         try:
             data = {
@@ -204,74 +397,193 @@ class SwechaAPIClient:
             if self.auth_token:
                 headers["Authorization"] = f"Bearer {self.auth_token}"
 
-            response = self.session.post(
-                f"{self.api_base_url}/records/upload",  # Fixed URL - removed duplicate /api/v1
-                data=data, # Send data as form-encoded
-                headers=headers
+            # Creates a record, so only retried if the server never saw it
+            response = resilient_request(
+                lambda: self.session.post(
+                    f"{self.api_base_url}/records/upload",  # Fixed URL - removed duplicate /api/v1
+                    data=data, # Send data as form-encoded
+                    headers=headers,
+                    timeout=(API_CONNECT_TIMEOUT, API_UPLOAD_TIMEOUT),
+                ),
+                "POST",
+                "/records/upload",
             )
-            response_data = self._handle_response(response)
+            response_data = self._handle_response(response, notify=notify)
             if response_data:
-                return {"success": True, "data": response_data}
+                return {"success": True, "data": response_data, "status_code": response.status_code}
             else:
-                return {"success": False, "data": {"error": "Failed to finalize upload"}}
+                return {"success": False, "data": {"error": "Failed to finalize upload"}, "status_code": response.status_code}
         except requests.RequestException as e:
-            st.error(f"Record finalization error: {str(e)}")
+            if notify:
+                st.error(f"Record finalization error: {str(e)}")
             return None
 
-    def upload_complete_audio(self, filepath: str = None, audio_data: bytes = None, filename: str = None, title: str = "",
+    def upload_complete_audio(self, filepath: str = None, audio_data: Union[bytes, bytearray, memoryview, BinaryIO] = None,
+                              filename: str = None, title: str = "",
                               category_id: str = "", language: str = "telugu",
-                              release_rights: str = "creator", description: str = "") -> dict:
+                              release_rights: str = "creator", description: str = "",
+                              max_in_flight: Optional[int] = None,
+                              progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                              resumable: bool = True, notify: bool = True,
+                              skip_duplicates: Optional[bool] = None) -> dict:
         """
-        Upload a full audio file (splits into 5MB chunks, uploads, then finalizes).
-        Supports both filepath and audio_data parameters.
+        Upload a full audio file (splits into chunks, uploads, then finalizes).
+        Supports both filepath and audio_data parameters; ``audio_data`` may be
+        a bytes-like buffer or a file-like object. Content is streamed in
+        ``memoryview`` windows (files are memory-mapped), so memory use stays
+        around one chunk per in-flight request.
+
+        Chunks are sent concurrently (``max_in_flight`` requests at a time,
+        defaulting to ``self.max_in_flight``) with per-chunk retries; the
+        record is finalized only after every chunk is acknowledged.
+        ``progress_callback(chunks_done, total_chunks, bytes_sent)`` is called
+        as chunks complete.
+
+        With ``resumable`` set, acknowledged chunks are recorded in a local
+        manifest; retrying the same file after a failure reuses its
+        ``upload_uuid`` and only sends the chunks the server has not acked.
+
+        Unless ``self.chunk_size`` is set, the chunk size is planned per
+        upload from the throughput of earlier chunks (see ``chunk_sizing``).
+
+        ``notify=False`` keeps Streamlit widgets out of uploads run off the
+        script thread (see ``upload_queue``).
+
+        With ``skip_duplicates`` (default ``UPLOAD_SKIP_DUPLICATES``) the
+        content's SHA-256 is looked up in the local dedup index first: content
+        this user already uploaded returns the earlier record with
+        ``"duplicate": True`` and nothing is sent; content still being
+        uploaded elsewhere fails with status 409.
         """
         if not self.auth_token:
             return {"success": False, "data": {"error": "Not authenticated"}}
 
-        # Handle audio_data parameter
         if audio_data is not None:
-            if not filename:
-                filename = f"audio_{uuid.uuid4().hex[:8]}.wav"
-            audio_bytes = audio_data
+            source = audio_data
         elif filepath:
-            filename = filepath.split("/")[-1]
-            with open(filepath, "rb") as f:
-                audio_bytes = f.read()
+            source = filepath
         else:
             return {"success": False, "data": {"error": "Either filepath or audio_data must be provided"}}
 
+        try:
+            chunk_source = open_chunk_source(source)
+        except (OSError, TypeError) as e:
+            return {"success": False, "data": {"error": f"Could not read audio: {e}"}}
+
+        with chunk_source:
+            return self._upload_from_source(
+                chunk_source, filename, title, category_id, language, release_rights, description,
+                max_in_flight, progress_callback, resumable, notify,
+                UPLOAD_SKIP_DUPLICATES if skip_duplicates is None else skip_duplicates,
+            )
+
+    def _upload_from_source(self, chunk_source: ChunkSource, filename: Optional[str], title: str, category_id: str,
+                            language: str, release_rights: str, description: str, max_in_flight: Optional[int],
+                            progress_callback: Optional[Callable[[int, int, int], None]], resumable: bool,
+                            notify: bool = True, skip_duplicates: bool = False) -> dict:
+        """Chunk, upload and finalize the content of an open ChunkSource.
+
+        Nameless content is named after its hash, so a retry of the same
+        bytes finds the same manifest.
+        """
         upload_uuid = str(uuid.uuid4())
-        total_size = len(audio_bytes)
-        total_chunks = (total_size + self.chunk_size - 1) // self.chunk_size
+        chunk_size = self.chunk_size or self.chunk_sizer.plan()
+        total_size = chunk_source.total_size
         media_type = "audio"
         user_id = self.user_data.get("id", "")
 
+        def read_chunk(chunk_index: int) -> memoryview:
+            return chunk_source.read(chunk_index * chunk_size, chunk_size)
+
+        def hash_chunks():
+            # One streaming pass hashes the whole content and every chunk
+            content_hasher = hashlib.sha256()
+            hashes = []
+            for _, view in chunk_source.iter_chunks(chunk_size):
+                content_hasher.update(view)
+                hashes.append(sha256_hex(view))
+            return content_hasher.hexdigest(), hashes
+
+        manifest = None
+        filename = filename or chunk_source.name
+        if resumable or skip_duplicates or not filename:
+            content_hash, chunk_hashes = hash_chunks()
+        if not filename:
+            filename = f"audio_{content_hash[:16]}.wav"
+        if resumable:
+            resumed_size = self.manifests.chunk_size_for(user_id, filename, content_hash)
+            if resumed_size and resumed_size != chunk_size:
+                # Finish a partial upload with the chunk size it was started with
+                chunk_size = resumed_size
+                _, chunk_hashes = hash_chunks()
+            manifest = self.manifests.find(user_id, filename, content_hash, chunk_size, chunk_hashes)
+            if manifest:
+                upload_uuid = manifest.upload_uuid
+        total_chunks = (total_size + chunk_size - 1) // chunk_size
+        chunk_indexes = manifest.missing_chunks() if manifest else list(range(total_chunks))
+
+        dedup = get_dedup_index() if skip_duplicates else None
+        if dedup:
+            existing = dedup.claim(user_id, content_hash, upload_uuid, filename, total_size)
+            if existing is not None:
+                return self._duplicate_result(existing)
+        if resumable and not manifest:
+            manifest = self.manifests.create(user_id, upload_uuid, filename, content_hash, chunk_size, total_size, chunk_hashes)
+
         # Upload chunks (0-based indexing)
-        for chunk_index in range(total_chunks):
-            start = chunk_index * self.chunk_size
-            end = min(start + self.chunk_size, total_size)
-            chunk_data = audio_bytes[start:end]
-
-            result = self.upload_audio_chunk(
-            chunk_data,      # file_data
-            filename,        # filename
-            chunk_index,     # chunk_index (0-based)
-            total_chunks,    # total_chunks
-            upload_uuid      # upload_uuid
-            )
-            if not result.get("success"):
-                return result  # stop on failure
+        result = self._upload_chunks(
+            chunk_indexes,
+            read_chunk,
+            filename,
+            total_chunks,
+            upload_uuid,
+            max_in_flight or self.max_in_flight,
+            progress_callback,
+            on_chunk_acked=manifest.mark_acked if manifest else None,
+        )
+        if not result.get("success"):
+            if dedup:
+                dedup.release(user_id, content_hash)
+            result["upload_uuid"] = upload_uuid
+            return result  # stop on failure; the manifest keeps acked chunks for a retry
 
         # Finalize upload
         finalize_result = self.finalize_audio_upload(
             title,description,media_type,filename,total_chunks, release_rights, 
-             language,upload_uuid,user_id,category_id,latitude=None,longitude=None,use_uid_filename=None
+             language,upload_uuid,user_id,category_id,latitude=None,longitude=None,use_uid_filename=None,
+            notify=notify,
         )
         
-        if finalize_result:
+        if finalize_result and finalize_result.get("success"):
+            if manifest:
+                manifest.delete()
+            if dedup:
+                dedup.complete(user_id, content_hash, finalize_result.get("data"))
+            # The new record changes the user's contribution counts
+            self.cache.invalidate("contributions")
             return {"success": True, "data": finalize_result}
         else:
-            return {"success": False, "data": {"error": "Failed to finalize upload"}}
+            if dedup:
+                dedup.release(user_id, content_hash)
+            # None when the request never got an answer, so callers can tell transient from permanent failures
+            status_code = finalize_result.get("status_code") if finalize_result else None
+            return {"success": False, "data": {"error": "Failed to finalize upload"}, "status_code": status_code}
+
+    @staticmethod
+    def _duplicate_result(entry: Dict) -> Dict:
+        """Answer for content found in the dedup index"""
+        if entry["status"] == UPLOADED:
+            return {
+                "success": True,
+                "duplicate": True,
+                "data": {"success": True, "data": entry["record"], "duplicate": True, "uploaded_at": entry["updated_at"]},
+            }
+        return {
+            "success": False,
+            "duplicate": True,
+            "status_code": 409,
+            "data": {"error": "This recording is already being uploaded"},
+        }
 
     def send_login_otp(self, phone_number: str) -> dict:
         """Send OTP for login"""
@@ -291,6 +603,7 @@ class SwechaAPIClient:
         if response.get("success"):
             token = response["data"].get("access_token")
             if token:
+                self.cache.invalidate()
                 self.auth_token = token
                 self.user_data = response["data"].get("user", {})
                 # Set authorization header in session
@@ -298,19 +611,20 @@ class SwechaAPIClient:
         return response
 
     def get_user_info(self) -> dict:
-        """Get user info using auth token"""
+        """Get user info using auth token (cached for API_CACHE_TTLS['user_info'])"""
         if not self.auth_token:
             return {"success": False, "data": {"error": "Not authenticated"}}
         headers = {"authorization": f"Bearer {self.auth_token}"}
-        return self._make_request("GET", "/auth/me", headers=headers, require_auth=True)
+        return self._cached_request(
+            "user_info",
+            lambda: self._make_request("GET", "/auth/me", headers=headers, require_auth=True),
+        )
 
     def get_user_audio_contributions(self, user_id: str) -> dict:
         """Get only audio contributions count for user"""
         if not self.auth_token:
             return {"success": False, "data": {"error": "Not authenticated"}}
-        headers = {"authorization": f"Bearer {self.auth_token}"}
-        endpoint = f"/users/{user_id}/contributions"
-        response = self._make_request("GET", endpoint, headers=headers, require_auth=True)
+        response = self.get_user_contributions(user_id)
         audio_count = 0
         if response.get("success"):
             contrib = response.get("data", {}).get("contributions_by_media_type", {})
@@ -319,15 +633,22 @@ class SwechaAPIClient:
         return response
 
     def get_categories(self) -> dict:
-        """Get available categories for uploads"""
+        """Get available categories for uploads (cached for API_CACHE_TTLS['categories'])"""
         if not self.auth_token:
             return {"success": False, "data": {"error": "Not authenticated"}}
-        
+        # The category list is the same for every user, so a class logging in together fetches it once
+        return self._cached_request("categories", self._fetch_categories, per_user=False)
+
+    def _fetch_categories(self) -> dict:
         try:
-            response = self.session.get(
-                f"{self.api_base_url}/categories",
-                headers={"Authorization": f"Bearer {self.auth_token}"},
-                timeout=10
+            response = resilient_request(
+                lambda: self.session.get(
+                    f"{self.api_base_url}/categories",
+                    headers={"Authorization": f"Bearer {self.auth_token}"},
+                    timeout=(API_CONNECT_TIMEOUT, API_TIMEOUT),
+                ),
+                "GET",
+                "/categories",
             )
             if response.status_code == 200:
                 return {"success": True, "data": response.json()}
@@ -336,9 +657,57 @@ class SwechaAPIClient:
         except requests.RequestException as e:
             return {"success": False, "data": {"error": str(e)}}
 
-# Global API client instance
-api_client = SwechaAPIClient()
+# Session-scoped API clients
+_SESSION_STATE_KEY = "_swecha_api_client"
+_process_client = None
+_process_client_lock = threading.Lock()
+
+
+def _in_streamlit_session() -> bool:
+    try:
+        return get_script_run_ctx() is not None
+    except Exception:
+        return False
+
+
+def get_api_client() -> SwechaAPIClient:
+    """Get the API client for the current Streamlit session, creating it if necessary.
+
+    Each browser session gets its own client (token, user data, headers) stored
+    in ``st.session_state``; all of them share one connection pool. Outside a
+    Streamlit script run (CLI tools, test scripts) a process-wide client is used.
+    """
+    global _process_client
+    if _in_streamlit_session():
+        client = st.session_state.get(_SESSION_STATE_KEY)
+        if client is None:
+            client = SwechaAPIClient()
+            st.session_state[_SESSION_STATE_KEY] = client
+        return client
+    with _process_client_lock:
+        if _process_client is None:
+            _process_client = SwechaAPIClient()
+        return _process_client
+
+
+def reset_api_client():
+    """Drop the current session's client (e.g. on logout) so no credentials linger"""
+    global _process_client
+    if _in_streamlit_session():
+        st.session_state.pop(_SESSION_STATE_KEY, None)
+    else:
+        with _process_client_lock:
+            _process_client = None
+
+
+# For backward compatibility: ``from api_client import api_client`` resolves to
+# the calling session's client on every attribute access
+class SessionAPIClient:
+    def __getattr__(self, name):
+        return getattr(get_api_client(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_api_client(), name, value)
+
 
-def get_api_client():
-    """Get the global API client instance"""
-    return api_client
+api_client = SessionAPIClient()
@@ -0,0 +1,385 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from typing import Any, BinaryIO, Callable, Dict, Optional, Union
+
+import httpx
+
+from chunk_sizing import get_chunk_sizer
+from chunk_source import ChunkSource, ViewReader, open_chunk_source
+from config import (
+    API_POOL_MAXSIZE,
+    API_TIMEOUT,
+    ASYNC_MAX_CONCURRENCY,
+    UPLOAD_CHUNK_RETRIES,
+    UPLOAD_MAX_IN_FLIGHT,
+    UPLOAD_RETRY_BACKOFF,
+)
+from resilience import CircuitOpenError, RetryPolicy, resilient_request_async
+from upload_manifest import ManifestStore, sha256_hex
+
+_CHUNK_RETRY_POLICY = RetryPolicy(attempts=UPLOAD_CHUNK_RETRIES + 1, base_delay=UPLOAD_RETRY_BACKOFF)
+
+
+class AsyncSwechaAPIClient:
+    """asyncio counterpart of ``SwechaAPIClient`` built on ``httpx.AsyncClient``.
+
+    Exposes the same methods (as coroutines) and returns the same
+    ``{"success", "data", "status_code"}`` dicts, without any Streamlit
+    calls, for batch tooling that drives many requests from one process.
+    ``max_concurrency`` bounds the number of requests in flight across all
+    coroutines sharing this client.
+
+        async with AsyncSwechaAPIClient() as client:
+            await client.login(phone, password)
+            results = await asyncio.gather(*(client.get_user_contributions(uid) for uid in ids))
+    """
+
+    def __init__(self, max_concurrency: int = ASYNC_MAX_CONCURRENCY):
+        self.api_base_url = "https://api.corpus.swecha.org/api/v1"
+        self.auth_token = None
+        self.user_data = None
+        self.chunk_size = None  # fixed chunk size in bytes; None plans one per upload, as SwechaAPIClient does
+        self.chunk_sizer = get_chunk_sizer()
+        self.max_in_flight = UPLOAD_MAX_IN_FLIGHT
+        self.manifests = ManifestStore()
+        self.max_concurrency = max_concurrency
+
+        self.client = httpx.AsyncClient(
+            timeout=API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=max(max_concurrency, API_POOL_MAXSIZE),
+                max_keepalive_connections=API_POOL_MAXSIZE,
+            ),
+        )
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _auth_headers(self) -> Dict:
+        return {"Authorization": f"Bearer {self.auth_token}"} if self.auth_token else {}
+
+    @staticmethod
+    def _json(res: httpx.Response) -> Any:
+        try:
+            return res.json()
+        except ValueError:
+            return {"raw": res.text}
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> httpx.Response:
+        async with self.semaphore:
+            return await self.client.request(method, f"{self.api_base_url}{endpoint}", **kwargs)
+
+    async def _make_request(self, method: str, endpoint: str, payload: Dict = None, require_auth: bool = False) -> Dict:
+        """Make a JSON request to the Swecha API"""
+        headers = {"content-type": "application/json"}
+        if require_auth:
+            headers.update(self._auth_headers())
+        try:
+            res = await self._send(method, endpoint, json=payload if payload else None, headers=headers)
+            return {
+                "status_code": res.status_code,
+                "data": self._json(res),
+                "success": 200 <= res.status_code < 300
+            }
+        except httpx.HTTPError as e:
+            return {
+                "status_code": None,  # no HTTP response, as in SwechaAPIClient
+                "data": {"error": str(e)},
+                "success": False
+            }
+
+    # ---------------- Auth ----------------
+    async def login(self, phone: str, password: str) -> Dict[str, Any]:
+        """Login user with phone and password"""
+        response = await self._make_request("POST", "/auth/login", {"phone": phone, "password": password})
+        if response["success"]:
+            token = response["data"].get("access_token")
+            if token:
+                self.auth_token = token
+                user_data = response["data"].get("user", {})
+                if not user_data:
+                    user_info = await self.get_user_info()
+                    if user_info.get("success"):
+                        user_data = user_info.get("data", {})
+                self.user_data = user_data
+        return response
+
+    async def send_signup_otp(self, phone_number: str) -> Dict[str, Any]:
+        """Send OTP for signup"""
+        return await self._make_request("POST", "/auth/signup/send-otp", {"phone_number": phone_number})
+
+    async def verify_signup_otp(self, phone_number: str, otp_code: str, name: str, email: str, password: str, has_given_consent: bool = True) -> Dict[str, Any]:
+        """Verify OTP and complete signup"""
+        payload = {
+            "phone_number": phone_number,
+            "otp_code": otp_code,
+            "name": name,
+            "email": email,
+            "password": password,
+            "has_given_consent": has_given_consent
+        }
+        return await self._make_request("POST", "/auth/signup/verify-otp", payload)
+
+    async def send_login_otp(self, phone_number: str) -> Dict[str, Any]:
+        """Send OTP for login"""
+        return await self._make_request("POST", "/auth/login/send-otp", {"phone_number": phone_number})
+
+    async def verify_login_otp(self, phone_number: str, otp_code: str, has_given_consent: bool = True) -> Dict[str, Any]:
+        """Verify OTP and login"""
+        payload = {
+            "phone_number": phone_number,
+            "otp_code": otp_code,
+            "has_given_consent": has_given_consent
+        }
+        response = await self._make_request("POST", "/auth/login/verify-otp", payload)
+        if response.get("success"):
+            token = response["data"].get("access_token")
+            if token:
+                self.auth_token = token
+                self.user_data = response["data"].get("user", {})
+        return response
+
+    async def change_password(self, current_password: str, new_password: str) -> Dict[str, Any]:
+        """Change user password"""
+        payload = {"current_password": current_password, "new_password": new_password}
+        return await self._make_request("POST", "/auth/change-password", payload, require_auth=True)
+
+    # ---------------- Users / Categories ----------------
+    async def get_user_info(self) -> Dict[str, Any]:
+        """Get user info using auth token"""
+        if not self.auth_token:
+            return {"success": False, "data": {"error": "Not authenticated"}}
+        return await self._make_request("GET", "/auth/me", require_auth=True)
+
+    async def get_user_contributions(self, user_id: str) -> Dict[str, Any]:
+        """Get user contributions"""
+        return await self._make_request("GET", f"/users/{user_id}/contributions", require_auth=True)
+
+    async def get_user_audio_contributions(self, user_id: str) -> Dict[str, Any]:
+        """Get only audio contributions count for user"""
+        if not self.auth_token:
+            return {"success": False, "data": {"error": "Not authenticated"}}
+        response = await self.get_user_contributions(user_id)
+        audio_count = 0
+        if response.get("success"):
+            audio_count = response.get("data", {}).get("contributions_by_media_type", {}).get("audio", 0)
+        response["audio_count"] = audio_count
+        return response
+
+    async def get_categories(self) -> Dict[str, Any]:
+        """Get available categories for uploads"""
+        if not self.auth_token:
+            return {"success": False, "data": {"error": "Not authenticated"}}
+        response = await self._make_request("GET", "/categories", require_auth=True)
+        if not response["success"]:
+            response["data"] = {"error": f"Status {response['status_code']}: {response['data']}"}
+        return response
+
+    # ---------------- Chunked upload ----------------
+    async def upload_audio_chunk(self, chunk_data: bytes, filename: str, chunk_index: int, total_chunks: int, upload_uuid: str) -> Dict:
+        """Upload a single chunk of a file (POST /api/v1/records/upload/chunk).
+
+        Retried per ``_CHUNK_RETRY_POLICY`` under the endpoint's circuit
+        breaker, shared with ``SwechaAPIClient``.
+        """
+        data = {
+            "filename": filename,
+            "chunk_index": str(chunk_index),
+            "total_chunks": str(total_chunks),
+            "upload_uuid": upload_uuid
+        }
+
+        def send():
+            # A fresh reader per attempt; it streams the view instead of copying it
+            files = {"chunk": (filename, ViewReader(chunk_data), "application/octet-stream")}
+            return self._send("POST", "/records/upload/chunk", files=files, data=data, headers=self._auth_headers())
+
+        try:
+            res = await resilient_request_async(
+                send, "POST", "/records/upload/chunk", idempotent=True, policy=_CHUNK_RETRY_POLICY,
+                errors=(httpx.HTTPError,),
+            )
+        except (httpx.HTTPError, CircuitOpenError) as e:
+            return {"success": False, "data": {"error": str(e)}, "status_code": None}
+        if res.status_code in [200, 201]:
+            return {"success": True, "data": self._json(res), "status_code": res.status_code}
+        return {"success": False, "data": {"error": f"Failed to upload chunk {chunk_index}: {res.text}"}, "status_code": res.status_code}
+
+    async def _upload_chunk_with_retry(self, chunk_data: bytes, filename: str, chunk_index: int, total_chunks: int, upload_uuid: str) -> Dict:
+        """Upload one chunk; its timing (retries included) feeds the chunk sizer"""
+        started = time.monotonic()
+        result = await self.upload_audio_chunk(chunk_data, filename, chunk_index, total_chunks, upload_uuid)
+        if result.get("success"):
+            self.chunk_sizer.observe(len(chunk_data), time.monotonic() - started)
+        elif result.get("status_code") is None:
+            self.chunk_sizer.failed()  # timeout, dropped connection or open circuit
+        result["chunk_index"] = chunk_index
+        return result
+
+    async def finalize_audio_upload(self, title: str, description: str, media_type: str, filename: str, total_chunks: int, release_rights: str, language: str, upload_uuid: str, user_id: str, category_id: str, latitude: Optional[float] = None, longitude: Optional[float] = None, use_uid_filename: Optional[bool] = None) -> Dict:
+        """Finalize chunked upload and create a record (POST /api/v1/records/upload)"""
+        data = {
+            "title": title,
+            "description": description,
+            "media_type": media_type,
+            "filename": filename,
+            "total_chunks": str(total_chunks),
+            "release_rights": release_rights,
+            "language": language,
+            "upload_uuid": upload_uuid,
+            "user_id": user_id,
+            "category_id": category_id,
+        }
+        if latitude is not None:
+            data["latitude"] = str(latitude)
+        if longitude is not None:
+            data["longitude"] = str(longitude)
+        if use_uid_filename is not None:
+            data["use_uid_filename"] = str(use_uid_filename).lower()
+        try:
+            res = await self._send("POST", "/records/upload", data=data, headers=self._auth_headers())
+        except httpx.HTTPError as e:
+            return {"success": False, "data": {"error": str(e)}, "status_code": None}
+        if res.status_code in [200, 201]:
+            return {"success": True, "data": self._json(res), "status_code": res.status_code}
+        return {"success": False, "data": {"error": f"Failed to finalize upload: {res.text}"}, "status_code": res.status_code}
+
+    async def upload_complete_audio(self, filepath: str = None, audio_data: Union[bytes, bytearray, memoryview, BinaryIO] = None,
+                                    filename: str = None, title: str = "",
+                                    category_id: str = "", language: str = "telugu",
+                                    release_rights: str = "creator", description: str = "",
+                                    max_in_flight: Optional[int] = None,
+                                    progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                                    resumable: bool = True) -> Dict:
+        """Chunk, upload and finalize an audio file; see ``SwechaAPIClient.upload_complete_audio``"""
+        if not self.auth_token:
+            return {"success": False, "data": {"error": "Not authenticated"}}
+        source = audio_data if audio_data is not None else filepath
+        if source is None:
+            return {"success": False, "data": {"error": "Either filepath or audio_data must be provided"}}
+        try:
+            chunk_source = open_chunk_source(source)
+        except (OSError, TypeError) as e:
+            return {"success": False, "data": {"error": f"Could not read audio: {e}"}}
+
+        with chunk_source:
+            return await self._upload_from_source(
+                chunk_source, filename, title, category_id, language, release_rights, description,
+                max_in_flight or self.max_in_flight, progress_callback, resumable,
+            )
+
+    async def _upload_from_source(self, chunk_source: ChunkSource, filename: Optional[str], title: str, category_id: str,
+                                  language: str, release_rights: str, description: str, max_in_flight: int,
+                                  progress_callback: Optional[Callable[[int, int, int], None]], resumable: bool) -> Dict:
+        """Chunk, upload and finalize an open ChunkSource.
+
+        Hashing and manifest writes are blocking file I/O and run in worker
+        threads, off the event loop.
+        """
+        upload_uuid = str(uuid.uuid4())
+        chunk_size = self.chunk_size or self.chunk_sizer.plan()
+        total_size = chunk_source.total_size
+        user_id = (self.user_data or {}).get("id", "")
+
+        def hash_chunks(size: int):
+            content_hasher = hashlib.sha256()
+            hashes = []
+            for _, view in chunk_source.iter_chunks(size):
+                content_hasher.update(view)
+                hashes.append(sha256_hex(view))
+            return content_hasher.hexdigest(), hashes
+
+        manifest = None
+        filename = filename or chunk_source.name
+        if resumable or not filename:
+            content_hash, chunk_hashes = await asyncio.to_thread(hash_chunks, chunk_size)
+        if not filename:
+            # Named after the content so a retry finds the same manifest
+            filename = f"audio_{content_hash[:16]}.wav"
+        if resumable:
+            resumed_size = await asyncio.to_thread(self.manifests.chunk_size_for, user_id, filename, content_hash)
+            if resumed_size and resumed_size != chunk_size:
+                # Finish a partial upload (from either client) with the chunk size it was started with
+                chunk_size = resumed_size
+                _, chunk_hashes = await asyncio.to_thread(hash_chunks, chunk_size)
+            manifest = await asyncio.to_thread(self.manifests.find, user_id, filename, content_hash, chunk_size, chunk_hashes)
+            if manifest:
+                upload_uuid = manifest.upload_uuid
+            else:
+                manifest = await asyncio.to_thread(
+                    self.manifests.create, user_id, upload_uuid, filename, content_hash, chunk_size, total_size, chunk_hashes
+                )
+        total_chunks = (total_size + chunk_size - 1) // chunk_size
+        chunk_indexes = manifest.missing_chunks() if manifest else list(range(total_chunks))
+
+        manifest_lock = asyncio.Lock()  # one manifest save at a time
+        acked = set()
+        bytes_sent = 0
+        pending = iter(chunk_indexes)
+        in_flight = {}
+        failure = None
+
+        def send_next() -> bool:
+            # Chunks are read as slots free up, like SwechaAPIClient._upload_chunks
+            index = next(pending, None)
+            if index is None:
+                return False
+            chunk_data = chunk_source.read(index * chunk_size, chunk_size)
+            task = asyncio.ensure_future(self._upload_chunk_with_retry(chunk_data, filename, index, total_chunks, upload_uuid))
+            in_flight[task] = len(chunk_data)
+            return True
+
+        for _ in range(max(1, max_in_flight)):
+            if not send_next():
+                break
+
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                size = in_flight.pop(task)
+                result = task.result()
+                if result.get("success"):
+                    acked.add(result["chunk_index"])
+                    bytes_sent += size
+                    if manifest:
+                        async with manifest_lock:
+                            await asyncio.to_thread(manifest.mark_acked, result["chunk_index"])
+                    if progress_callback:
+                        progress_callback(len(acked), total_chunks, bytes_sent)
+                elif failure is None:
+                    failure = result
+                # Stop sending new chunks once one has failed for good; those
+                # already in flight finish so their acks reach the manifest
+                if failure is None:
+                    send_next()
+
+        if failure is not None:
+            failure["acked"] = sorted(acked)
+            failure["upload_uuid"] = upload_uuid
+            return failure
+
+        finalize_result = await self.finalize_audio_upload(
+            title, description, "audio", filename, total_chunks, release_rights,
+            language, upload_uuid, user_id, category_id
+        )
+        if finalize_result.get("success"):
+            if manifest:
+                await asyncio.to_thread(manifest.delete)
+            return {"success": True, "data": finalize_result}
+        return {"success": False, "data": {"error": "Failed to finalize upload"}, "status_code": finalize_result.get("status_code")}
@@ -0,0 +1,95 @@
+"""
+Banded dynamic time warping over feature matrices.
+
+The DP is filled one reference row at a time, restricted to a band around
+the (length-scaled) diagonal. Within a row the only sequential dependency is
+the horizontal step ``D[i, j-1] + c[i, j]``; writing ``a[j]`` for the best of
+the diagonal/vertical predecessors plus ``c[i, j]`` and ``S`` for the row's
+cumulative cost, ``D[i, j] = S[j] + min_{k <= j}(a[k] - S[k])``, which is one
+``cumsum`` and one ``minimum.accumulate``. A row therefore costs a few NumPy
+calls instead of a Python loop over columns.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+# Relative weight of each feature column (energy, pitch, voicing) in the frame distance
+FEATURE_WEIGHTS = np.array([1.0, 0.5, 1.0], dtype=np.float32)
+
+
+def frame_costs(ref: np.ndarray, user: np.ndarray, lo: int, hi: int, i: int) -> np.ndarray:
+    """Weighted L1 distance between reference frame ``i`` and user frames ``lo:hi``.
+
+    Pitch differences only count where both frames are voiced.
+    """
+    diff = np.abs(user[lo:hi] - ref[i]) * FEATURE_WEIGHTS
+    both_voiced = (user[lo:hi, 2] > 0) & (ref[i, 2] > 0)
+    diff[:, 1] = np.where(both_voiced, np.minimum(diff[:, 1], 6.0), 0.0)
+    return diff.sum(axis=1)
+
+
+def banded_dtw(ref: np.ndarray, user: np.ndarray, band_ratio: float) -> Tuple[float, np.ndarray, np.ndarray]:
+    """Align ``user`` to ``ref``.
+
+    Returns ``(total_cost, path, step_costs)`` where ``path`` is an
+    ``(n_steps, 2)`` array of ``(ref_frame, user_frame)`` pairs and
+    ``step_costs`` the local cost at each step.
+    """
+    n, m = len(ref), len(user)
+    radius = max(int(band_ratio * max(n, m)), abs(n - m) // 8 + 1, 2)
+    centres = np.round(np.arange(n) * (m - 1) / max(n - 1, 1)).astype(int)
+    los = np.clip(centres - radius, 0, m - 1)
+    his = np.clip(centres + radius + 1, 1, m)
+    # Rows must overlap so the band stays connected
+    his = np.maximum(his, np.concatenate([los[1:] + 1, [m]]))
+    width = int((his - los).max())
+
+    acc = np.full((n, width), np.inf)
+    local = np.full((n, width), np.inf)
+    prev = np.full(m + 1, np.inf)  # D[i-1, j] at index j + 1; index 0 is the j = -1 sentinel
+    prev[0] = 0.0
+
+    for i in range(n):
+        lo, hi = los[i], his[i]
+        cost = frame_costs(ref, user, lo, hi, i)
+        best_prev = np.minimum(prev[lo:hi], prev[lo + 1:hi + 1])  # diagonal, vertical
+        a = cost + best_prev
+        running = np.cumsum(cost)
+        row = running + np.minimum.accumulate(a - running)
+        acc[i, :hi - lo] = row
+        local[i, :hi - lo] = cost
+        prev = np.full(m + 1, np.inf)
+        prev[lo + 1:hi + 1] = row
+
+    path, steps = _backtrack(acc, local, los, his)
+    return float(acc[n - 1, his[n - 1] - 1 - los[n - 1]]), path, steps
+
+
+def _backtrack(acc: np.ndarray, local: np.ndarray, los: np.ndarray, his: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def value(i: int, j: int) -> float:
+        if i < 0 or j < los[i] or j >= his[i]:
+            return np.inf
+        return acc[i, j - los[i]]
+
+    i, j = len(los) - 1, his[-1] - 1
+    path: List[Tuple[int, int]] = []
+    steps: List[float] = []
+    while i >= 0 and j >= 0:
+        path.append((i, j))
+        steps.append(local[i, j - los[i]])
+        if i == 0 and j == 0:
+            break
+        candidates = (value(i - 1, j - 1), value(i - 1, j), value(i, j - 1))
+        move = int(np.argmin(candidates))
+        if i == 0:
+            move = 2
+        elif j == 0:
+            move = 1
+        if move == 0:
+            i, j = i - 1, j - 1
+        elif move == 1:
+            i -= 1
+        else:
+            j -= 1
+    return np.array(path[::-1]), np.array(steps[::-1])
@@ -0,0 +1,133 @@
+"""
+Vectorized recording analysis: duration, loudness, clipping and silence.
+
+Everything works on the ``(frames, channels)`` float arrays produced by
+``audio.pcm.decode_wav``. Loudness is measured per 20 ms frame by reshaping
+the signal into a ``(n_frames, frame_len)`` matrix, so a whole recording is
+analysed with a handful of NumPy reductions.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from audio.pcm import decode_wav, encode_wav, is_wav, to_mono
+from config import (
+    AUDIO_CLIPPING_WARN_RATIO,
+    AUDIO_MIN_VOICED_SECONDS,
+    AUDIO_SILENCE_THRESHOLD_DB,
+    AUDIO_TRIM_PADDING_MS,
+)
+
+FRAME_MS = 20
+_CLIP_LEVEL = 0.999
+_EPS = 1e-10
+
+
+def _to_db(value):
+    return 20.0 * np.log10(np.maximum(value, _EPS))
+
+
+def frame_rms(samples: np.ndarray, rate: int, frame_ms: int = FRAME_MS) -> Tuple[np.ndarray, int]:
+    """RMS of each non-overlapping frame of the mono mix, and the frame length in samples"""
+    mono = to_mono(samples)[:, 0]
+    frame_len = max(1, int(rate * frame_ms / 1000))
+    n_frames = -(-len(mono) // frame_len)
+    padded = np.zeros(n_frames * frame_len, dtype=np.float32)
+    padded[:len(mono)] = mono
+    frames = padded.reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1)), frame_len
+
+
+class AudioStats:
+    """Summary of a decoded recording"""
+
+    def __init__(self, samples: np.ndarray, rate: int, silence_threshold_db: float = AUDIO_SILENCE_THRESHOLD_DB):
+        self.sample_rate = rate
+        self.channels = samples.shape[1]
+        self.duration = len(samples) / float(rate) if rate else 0.0
+        self.peak = float(np.abs(samples).max()) if samples.size else 0.0
+        self.rms_db = float(_to_db(np.sqrt(np.mean(samples * samples)))) if samples.size else float(_to_db(0.0))
+        self.clipping_ratio = float(np.mean(np.abs(samples) >= _CLIP_LEVEL)) if samples.size else 0.0
+
+        rms, frame_len = frame_rms(samples, rate) if samples.size else (np.zeros(0), 1)
+        voiced = _to_db(rms) > silence_threshold_db
+        frame_seconds = frame_len / float(rate) if rate else 0.0
+        if voiced.any():
+            first = int(np.argmax(voiced))
+            last = len(voiced) - 1 - int(np.argmax(voiced[::-1]))
+            self.leading_silence = first * frame_seconds
+            self.trailing_silence = min(self.duration, (len(voiced) - 1 - last) * frame_seconds)
+        else:
+            self.leading_silence = self.duration
+            self.trailing_silence = 0.0
+        self.voiced_duration = float(voiced.sum()) * frame_seconds
+
+    def as_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def analyze_wav(data: bytes) -> Optional[AudioStats]:
+    """Stats for WAV bytes, or None for other formats"""
+    if not is_wav(data):
+        return None
+    samples, rate = decode_wav(data)
+    return AudioStats(samples, rate)
+
+
+def wav_duration_seconds(data: bytes) -> float:
+    """Duration of WAV bytes in seconds (0.0 if they can't be parsed)"""
+    try:
+        stats = analyze_wav(data)
+    except Exception:
+        return 0.0
+    return round(stats.duration, 2) if stats else 0.0
+
+
+def trim_silence(samples: np.ndarray, rate: int, silence_threshold_db: float = AUDIO_SILENCE_THRESHOLD_DB,
+                 padding_ms: int = AUDIO_TRIM_PADDING_MS) -> np.ndarray:
+    """Cut leading/trailing frames quieter than the threshold, keeping ``padding_ms`` either side"""
+    if not samples.size:
+        return samples
+    rms, frame_len = frame_rms(samples, rate)
+    voiced = np.flatnonzero(_to_db(rms) > silence_threshold_db)
+    if not len(voiced):
+        return samples[:0]
+    pad = int(rate * padding_ms / 1000)
+    start = max(0, voiced[0] * frame_len - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame_len + pad)
+    return samples[start:end]
+
+
+def trim_wav(data: bytes) -> bytes:
+    """Silence-trimmed copy of WAV bytes; non-WAV input is returned unchanged"""
+    if not is_wav(data):
+        return data
+    samples, rate = decode_wav(data)
+    trimmed = trim_silence(samples, rate)
+    if len(trimmed) == len(samples) or not len(trimmed):
+        return data
+    return encode_wav(trimmed, rate)
+
+
+def check_recording(data: bytes, min_voiced_seconds: float = AUDIO_MIN_VOICED_SECONDS) -> Tuple[bool, str, Optional[AudioStats]]:
+    """Decide whether a recording is worth uploading.
+
+    Returns ``(ok, message, stats)``; ``message`` explains a rejection or
+    carries a warning (e.g. clipping) for an accepted recording. Formats we
+    can't decode (MP3/OGG files) are accepted if they aren't empty.
+    """
+    if not data:
+        return False, "Recording is empty. Please record again.", None
+    try:
+        stats = analyze_wav(data)
+    except Exception as e:
+        return False, f"Could not read the recording ({e}). Please record again.", None
+    if stats is None:
+        return True, "", None
+    if stats.voiced_duration < min_voiced_seconds:
+        return False, (f"Recording seems silent or too short ({stats.voiced_duration:.1f}s of speech). "
+                       "Please record again."), stats
+    if stats.clipping_ratio > AUDIO_CLIPPING_WARN_RATIO:
+        return True, "Recording is clipping (too loud); consider moving away from the microphone.", stats
+    return True, "", stats
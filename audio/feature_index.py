@@ -0,0 +1,225 @@
+"""
+Precomputed reference-audio features, keyed by ``sloka_key`` ("12.1").
+
+Layout under ``REFERENCE_FEATURES_DIR``::
+
+    index.json       {sloka_key: {url, source, file, duration, frames, voiced_ratio, built_at}}
+    <sloka_key>.npy  float16 (frames, 3) matrix from ``audio.features``
+                     (energy envelope, relative pitch contour, voicing)
+
+Keys are chapter and sloka numbers rather than row ids, which differ
+between Supabase and the offline corpus, so an index built against one
+backend serves the app on any other.
+
+Arrays are opened with ``mmap_mode="r"`` and kept once loaded, so lookups
+after the first are dict hits. ``build`` is incremental: a sloka is only
+re-extracted when its URL changes or its audio's ETag (or content hash, for
+servers without ETags) differs from the one recorded in the index. The
+build revalidates every reference with a conditional GET, however recently
+the audio cache checked it.
+
+Build or refresh it with::
+
+    python -m audio.feature_index build [--workers 4] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from audio.features import HOP_MS, features_from_bytes
+from audio.pcm import require_compressed_decoder
+from config import PREFETCH_WORKERS, REFERENCE_FEATURES_DIR
+from reference_audio_cache import get_reference_audio_cache
+
+_INDEX_FILE = "index.json"
+_KEY_RE = re.compile(r"^\d+\.\d+$")
+
+
+class ReferenceFeatureIndex:
+    """On-disk feature matrices for every sloka's reference recitation"""
+
+    def __init__(self, directory: str = REFERENCE_FEATURES_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._index_mtime = None
+        self._index: Dict[str, Dict] = self._load_index()
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, _INDEX_FILE)
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            self._index_mtime = os.path.getmtime(self._index_path())
+            with open(self._index_path()) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Entries from before the index was keyed by sloka_key are rebuilt
+        return {key: entry for key, entry in index.items() if _KEY_RE.match(key)}
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path())
+        self._index_mtime = os.path.getmtime(self._index_path())
+
+    def _reload_if_rebuilt(self):
+        """Pick up an index rewritten by another process (e.g. the build CLI)"""
+        try:
+            mtime = os.path.getmtime(self._index_path())
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            with self._lock:
+                self._index = self._load_index()
+                self._arrays.clear()
+
+    # ---------------- Reads ----------------
+    def info(self, key: str) -> Optional[Dict]:
+        """Index entry (duration, frames, voiced ratio...) for a sloka"""
+        return self._index.get(key)
+
+    def get(self, key: str, reference_url: Optional[str] = None) -> Optional[np.ndarray]:
+        """Feature matrix for the sloka with ``sloka_key`` ``key``, or None if missing (or built from a different URL)"""
+        self._reload_if_rebuilt()
+        entry = self._index.get(key)
+        if entry is None or (reference_url and entry["url"] != reference_url):
+            return None
+        features = self._arrays.get(key)
+        if features is None:
+            try:
+                features = np.load(os.path.join(self.directory, entry["file"]), mmap_mode="r")
+            except (OSError, ValueError):
+                return None
+            with self._lock:
+                self._arrays[key] = features
+        return features
+
+    # ---------------- Build ----------------
+    def _build_one(self, key: str, sloka: Dict, force: bool) -> str:
+        url = sloka.get("reference_audio_url")
+        entry = self._index.get(key)
+        if not url:
+            return "skipped"
+
+        cache = get_reference_audio_cache()
+        # Always ask the server: a fresh-looking cache entry may predate a re-upload
+        path = cache.path_for(url, revalidate=True)
+        if path is None:
+            return "failed"
+        etag = cache.etag(url)
+        if not force and entry and entry["url"] == url and etag and entry["source"] == etag:
+            return "unchanged"
+
+        with open(path, "rb") as f:
+            data = f.read()
+        source = etag or hashlib.sha256(data).hexdigest()
+        if not force and entry and entry["url"] == url and entry["source"] == source:
+            return "unchanged"
+
+        features = features_from_bytes(data)
+        file_name = f"{key}.npy"
+        # Write aside and swap in, so readers with the old file mapped aren't truncated under them
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, features.astype(np.float16))
+        os.replace(tmp_path, os.path.join(self.directory, file_name))
+        with self._lock:
+            self._arrays.pop(key, None)
+            self._index[key] = {
+                "url": url,
+                "source": source,
+                "file": file_name,
+                "duration": round(len(features) * HOP_MS / 1000.0, 2),
+                "frames": len(features),
+                "voiced_ratio": round(float(features[:, 2].mean()), 3) if len(features) else 0.0,
+                "built_at": time.time(),
+            }
+        return "built"
+
+    def build(self, slokas: Iterable[Tuple[str, Dict]], workers: int = PREFETCH_WORKERS,
+              force: bool = False) -> Dict[str, int]:
+        """Extract features for ``(sloka_key, sloka)`` pairs that are new or whose audio changed.
+
+        Returns counts of ``built``, ``unchanged``, ``skipped`` (no audio)
+        and ``failed`` slokas.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        counts = {"built": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+
+        def run(item: Tuple[str, Dict]) -> str:
+            key, sloka = item
+            try:
+                return self._build_one(key, sloka, force)
+            except Exception as e:
+                print(f"Feature extraction failed for sloka {key}: {e}")
+                return "failed"
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for outcome in executor.map(run, slokas):
+                counts[outcome] += 1
+                if outcome == "built" and counts["built"] % 25 == 0:
+                    # Checkpoint so an interrupted build keeps its progress
+                    with self._lock:
+                        self._save_index()
+        with self._lock:
+            self._save_index()
+        return counts
+
+
+_index_instance = None
+_index_lock = threading.Lock()
+
+
+def get_feature_index() -> ReferenceFeatureIndex:
+    """Get the process-wide feature index, creating it if necessary"""
+    global _index_instance
+    if _index_instance is None:
+        with _index_lock:
+            if _index_instance is None:
+                _index_instance = ReferenceFeatureIndex()
+    return _index_instance
+
+
+def _all_slokas():
+    from database.backends import sloka_key
+    from database.db_utils import get_db_manager
+
+    db = get_db_manager()
+    for chapter in db.get_all_chapters():
+        for sloka in db.get_slokas_by_chapter(chapter["id"]):
+            yield sloka_key(chapter["chapter_number"], sloka["sloka_number"]), sloka
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute reference audio features for every sloka")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build or incrementally refresh the feature index")
+    build.add_argument("--workers", type=int, default=PREFETCH_WORKERS)
+    build.add_argument("--force", action="store_true", help="re-extract every sloka")
+    build.add_argument("--output", default=REFERENCE_FEATURES_DIR)
+    args = parser.parse_args(argv)
+
+    try:
+        require_compressed_decoder()
+    except RuntimeError as e:
+        parser.exit(1, f"{e}\n")
+    counts = ReferenceFeatureIndex(args.output).build(_all_slokas(), workers=args.workers, force=args.force)
+    print(", ".join(f"{n} {name}" for name, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
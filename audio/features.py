@@ -0,0 +1,90 @@
+"""
+Frame-level prosody features for comparing recitations.
+
+Each recording becomes a ``(n_frames, 3)`` float32 matrix sampled every
+``HOP_MS``:
+
+* log energy, z-normalised so recording level doesn't matter
+* pitch in semitones relative to the speaker's median (0 when unvoiced),
+  so a different voice or key still lines up
+* voicing flag
+
+Framing uses a strided view, and pitch is estimated for all frames at once
+from FFT autocorrelation.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio.pcm import decode_audio, resample, to_mono
+from config import SCORING_SAMPLE_RATE
+
+WINDOW_MS = 32
+HOP_MS = 10
+MIN_F0 = 70.0
+MAX_F0 = 400.0
+_VOICING_THRESHOLD = 0.35
+_EPS = 1e-8
+
+
+def frame_signal(signal: np.ndarray, rate: int) -> np.ndarray:
+    """``(n_frames, window)`` view of a 1-D signal with ``HOP_MS`` hops"""
+    window = int(rate * WINDOW_MS / 1000)
+    hop = int(rate * HOP_MS / 1000)
+    if len(signal) < window:
+        signal = np.pad(signal, (0, window - len(signal)))
+    return sliding_window_view(signal, window)[::hop]
+
+
+def pitch_track(frames: np.ndarray, rate: int, block: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-frame f0 (Hz) and voicing from the normalised autocorrelation peak.
+
+    Frames are processed ``block`` at a time to bound the FFT buffers.
+    """
+    if len(frames) > block:
+        parts = [pitch_track(frames[i:i + block], rate, block) for i in range(0, len(frames), block)]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+    window = frames.shape[1]
+    centred = (frames - frames.mean(axis=1, keepdims=True)) * np.hanning(window)
+    n_fft = 1 << (2 * window - 1).bit_length()
+    spectrum = np.fft.rfft(centred, n=n_fft, axis=1)
+    autocorr = np.fft.irfft(spectrum * np.conj(spectrum), n=n_fft, axis=1)[:, :window]
+    autocorr /= autocorr[:, :1] + _EPS
+
+    min_lag = int(rate / MAX_F0)
+    max_lag = min(int(rate / MIN_F0), window - 1)
+    search = autocorr[:, min_lag:max_lag]
+    best = search.argmax(axis=1)
+    strength = search[np.arange(len(search)), best]
+    f0 = rate / (best + min_lag).astype(np.float32)
+    voiced = strength > _VOICING_THRESHOLD
+    return np.where(voiced, f0, 0.0).astype(np.float32), voiced
+
+
+def extract_features(samples: np.ndarray, rate: int) -> np.ndarray:
+    """Feature matrix (energy, relative pitch, voicing) for decoded samples"""
+    mono = to_mono(samples)
+    if rate != SCORING_SAMPLE_RATE:
+        mono = resample(mono, rate, SCORING_SAMPLE_RATE)
+        rate = SCORING_SAMPLE_RATE
+    frames = frame_signal(mono[:, 0], rate)
+
+    energy = np.log(np.mean(frames * frames, axis=1) + _EPS)
+    energy = (energy - energy.mean()) / (energy.std() + _EPS)
+
+    f0, voiced = pitch_track(frames, rate)
+    # Unvoiced frames often pass the autocorrelation test in silence; require some energy too
+    voiced &= energy > -0.5
+    semitones = np.zeros(len(f0), dtype=np.float32)
+    if voiced.any():
+        log_f0 = 12.0 * np.log2(f0[voiced])
+        semitones[voiced] = log_f0 - np.median(log_f0)
+
+    return np.stack([energy, semitones, voiced.astype(np.float32)], axis=1).astype(np.float32)
+
+
+def features_from_bytes(data: bytes) -> np.ndarray:
+    samples, rate = decode_audio(data)
+    return extract_features(samples, rate)
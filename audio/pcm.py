@@ -0,0 +1,166 @@
+"""
+PCM WAV decoding/encoding with NumPy.
+
+Samples are returned as float32 arrays of shape ``(frames, channels)``
+scaled to [-1, 1], whatever the WAV sample width. Other formats go through
+``soundfile`` (a declared dependency) or, failing that, the ``ffmpeg`` CLI;
+``compressed_decoder`` tells whether one of them can read MP3.
+"""
+
+import io
+import shutil
+import subprocess
+import wave
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except Exception:
+    SOUNDFILE_AVAILABLE = False
+
+FFMPEG_TIMEOUT = 120  # seconds per ffmpeg decode/encode call
+
+
+def is_wav(data: bytes) -> bool:
+    return len(data) >= 12 and data[:4] == b"RIFF" and data[8:12] == b"WAVE"
+
+
+def wav_sample_width(data: bytes) -> int:
+    """Bytes per sample of a WAV file, read from its header"""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        return wf.getsampwidth()
+
+
+def decode_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode WAV bytes into ``(samples, sample_rate)``"""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        raw = wf.readframes(wf.getnframes())
+
+    if width == 1:
+        # 8-bit WAV is unsigned
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        # Widen each little-endian 24-bit sample to int32 (sign carried by the top byte)
+        triplets = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+    return samples.reshape(-1, channels), rate
+
+
+def encode_wav(samples: np.ndarray, sample_rate: int, sample_width: int = 2) -> bytes:
+    """Encode float samples (``(frames,)`` or ``(frames, channels)``) as 16-bit or 24-bit PCM WAV"""
+    if samples.ndim == 1:
+        samples = samples[:, None]
+    clipped = np.clip(samples, -1.0, 1.0)
+    if sample_width == 3:
+        # Low three bytes of each little-endian int32
+        ints = (clipped * 8388607.0).round().astype("<i4")
+        pcm = ints.view(np.uint8).reshape(-1, 4)[:, :3]
+    elif sample_width == 2:
+        pcm = (clipped * 32767.0).round().astype("<i2")
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width} bytes")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(samples.shape[1])
+        wf.setsampwidth(sample_width)
+        wf.setframerate(int(sample_rate))
+        wf.writeframes(pcm.tobytes())
+    return buffer.getvalue()
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """Average channels into a ``(frames, 1)`` array"""
+    if samples.shape[1] == 1:
+        return samples
+    return samples.mean(axis=1, keepdims=True, dtype=np.float32)
+
+
+def _lowpass_kernel(cutoff: float, taps: int = 63) -> np.ndarray:
+    """Hamming-windowed sinc FIR; ``cutoff`` is a fraction of the input Nyquist rate"""
+    n = np.arange(taps) - (taps - 1) / 2.0
+    kernel = cutoff * np.sinc(cutoff * n) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample(samples: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    """Resample every channel to ``target_rate``.
+
+    Downsampling low-pass filters first so speech doesn't alias, then
+    interpolates linearly onto the new time grid.
+    """
+    if rate == target_rate or len(samples) == 0:
+        return samples
+    if target_rate < rate:
+        kernel = _lowpass_kernel(target_rate / rate)
+        samples = np.stack([np.convolve(samples[:, c], kernel, mode="same") for c in range(samples.shape[1])], axis=1)
+    frames = int(round(len(samples) * target_rate / rate))
+    old_t = np.arange(len(samples), dtype=np.float64) / rate
+    new_t = np.arange(frames, dtype=np.float64) / target_rate
+    return np.stack([np.interp(new_t, old_t, samples[:, c]) for c in range(samples.shape[1])], axis=1).astype(np.float32)
+
+
+def _decode_ffmpeg(data: bytes) -> Optional[bytes]:
+    """Convert any container ffmpeg understands into WAV bytes"""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-i", "pipe:0", "-c:a", "pcm_s16le", "-f", "wav", "pipe:1"]
+    try:
+        return subprocess.run(cmd, input=data, capture_output=True, timeout=FFMPEG_TIMEOUT, check=True).stdout or None
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"ffmpeg decode failed: {e}")
+        return None
+
+
+def compressed_decoder() -> Optional[str]:
+    """Decoder used for MP3/OGG/FLAC: "soundfile", "ffmpeg", or None if neither is usable"""
+    # libsndfile only reads MP3 from 1.1.0 on
+    if SOUNDFILE_AVAILABLE and tuple(int(p) for p in sf.__libsndfile_version__.split(".")[:2]) >= (1, 1):
+        return "soundfile"
+    if shutil.which("ffmpeg"):
+        return "ffmpeg"
+    return None
+
+
+def require_compressed_decoder() -> str:
+    """Raise RuntimeError unless MP3 can be decoded; the feature build checks this before starting"""
+    decoder = compressed_decoder()
+    if decoder is None:
+        raise RuntimeError(
+            "Reference audio is MP3, which needs soundfile (libsndfile >= 1.1) or the ffmpeg CLI: "
+            "run `pip install -r requirements.txt` or put ffmpeg on PATH"
+        )
+    return decoder
+
+
+def decode_audio(data: bytes) -> Tuple[np.ndarray, int]:
+    """Decode WAV (NumPy), or MP3/OGG/FLAC via soundfile or the ffmpeg CLI.
+
+    Raises ValueError when no available decoder understands the data.
+    """
+    if is_wav(data):
+        return decode_wav(data)
+    if SOUNDFILE_AVAILABLE:
+        try:
+            samples, rate = sf.read(io.BytesIO(data), dtype="float32", always_2d=True)
+            return samples, rate
+        except Exception:
+            pass
+    wav = _decode_ffmpeg(data)
+    if wav is None:
+        raise ValueError("Cannot decode this audio format (install soundfile or ffmpeg)")
+    return decode_wav(wav)
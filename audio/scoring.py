@@ -0,0 +1,115 @@
+"""
+Score a user's recitation against the sloka's reference audio.
+
+Reference features come from the precomputed ``ReferenceFeatureIndex`` when
+it has the sloka; otherwise they are extracted once per reference URL and
+kept in a bounded in-memory LRU. Either way, scoring a new recording only
+costs the user-side feature extraction plus one banded DTW.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+from audio.alignment import banded_dtw
+from audio.feature_index import get_feature_index
+from audio.features import HOP_MS, extract_features, features_from_bytes
+from audio.pcm import decode_audio
+from config import SCORING_BAND_RATIO, SCORING_CACHE_ENTRIES, SCORING_SEGMENTS
+from reference_audio_cache import get_reference_audio_cache
+
+# Mean per-step cost that maps to a score of 50
+_HALF_SCORE_COST = 0.5
+
+
+class RecitationScorer:
+    """Aligns recordings to reference recitations and reports similarity"""
+
+    def __init__(self, max_entries: int = SCORING_CACHE_ENTRIES, band_ratio: float = SCORING_BAND_RATIO,
+                 segments: int = SCORING_SEGMENTS):
+        self.max_entries = max_entries
+        self.band_ratio = band_ratio
+        self.segments = segments
+        self._features = OrderedDict()
+        self._lock = threading.Lock()
+
+    def reference_features(self, reference_url: str, sloka_key: Optional[str] = None) -> Optional[np.ndarray]:
+        """Feature matrix for a reference recording, computed at most once per URL"""
+        if sloka_key:
+            indexed = get_feature_index().get(sloka_key, reference_url)
+            if indexed is not None:
+                return np.asarray(indexed, dtype=np.float32)
+        with self._lock:
+            features = self._features.get(reference_url)
+            if features is not None:
+                self._features.move_to_end(reference_url)
+                return features
+
+        path = get_reference_audio_cache().path_for(reference_url)
+        if path is None:
+            return None
+        with open(path, "rb") as f:
+            features = features_from_bytes(f.read())
+
+        with self._lock:
+            self._features[reference_url] = features
+            while len(self._features) > self.max_entries:
+                self._features.popitem(last=False)
+        return features
+
+    def score(self, reference_url: str, recording: bytes, sloka_key: Optional[str] = None) -> Dict:
+        """Compare ``recording`` with the reference audio at ``reference_url``.
+
+        Returns ``{"success", "data"}`` like the API client; ``data`` holds
+        ``score`` (0-100), ``mean_cost``, ``tempo_ratio`` and ``segments``,
+        a list of ``{"start", "end", "deviation"}`` in reference seconds.
+        """
+        try:
+            ref = self.reference_features(reference_url, sloka_key)
+            if ref is None:
+                return {"success": False, "data": {"error": "Reference audio is unavailable"}}
+            samples, rate = decode_audio(recording)
+            user = extract_features(samples, rate)
+        except Exception as e:
+            return {"success": False, "data": {"error": str(e)}}
+
+        _, path, steps = banded_dtw(ref, user, self.band_ratio)
+        mean_cost = float(steps.mean())
+        score = 100.0 / (1.0 + (mean_cost / _HALF_SCORE_COST) ** 2)
+
+        # Average the local cost of the path steps falling in each reference section
+        edges = np.linspace(0, len(ref), self.segments + 1)
+        section = np.clip(np.searchsorted(edges, path[:, 0], side="right") - 1, 0, self.segments - 1)
+        totals = np.bincount(section, weights=steps, minlength=self.segments)
+        counts = np.maximum(np.bincount(section, minlength=self.segments), 1)
+        hop = HOP_MS / 1000.0
+        segments = [
+            {"start": round(edges[k] * hop, 2), "end": round(edges[k + 1] * hop, 2),
+             "deviation": round(float(totals[k] / counts[k]), 3)}
+            for k in range(self.segments)
+        ]
+        return {
+            "success": True,
+            "data": {
+                "score": round(score, 1),
+                "mean_cost": round(mean_cost, 3),
+                "tempo_ratio": round(len(user) / len(ref), 2),
+                "segments": segments,
+            },
+        }
+
+
+_scorer_instance = None
+_scorer_lock = threading.Lock()
+
+
+def get_recitation_scorer() -> RecitationScorer:
+    """Get the process-wide scorer, creating it if necessary"""
+    global _scorer_instance
+    if _scorer_instance is None:
+        with _scorer_lock:
+            if _scorer_instance is None:
+                _scorer_instance = RecitationScorer()
+    return _scorer_instance
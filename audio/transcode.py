@@ -0,0 +1,159 @@
+"""
+Pre-upload audio encoding.
+
+Browser recordings arrive as 44.1 kHz stereo-or-mono 16-bit WAV.
+``transcode_for_upload`` re-encodes them before they are queued:
+
+* ``wav``  - PCM WAV, done in NumPy (always available)
+* ``flac`` - lossless, via ``soundfile`` if installed, else the ``ffmpeg`` CLI
+* ``opus`` - Ogg/Opus at ``UPLOAD_OPUS_BITRATE``, via ``soundfile`` or ``ffmpeg``
+
+By default recordings are stored as FLAC at their recorded rate and channel
+count, so nothing is lost. Downmixing (``UPLOAD_ENCODE_MONO``) and
+resampling (``UPLOAD_ENCODE_SAMPLE_RATE``) are opt-in.
+
+Non-WAV uploads (MP3/OGG files) can only be re-encoded with ffmpeg. Whenever
+the requested encoder is missing, fails, or doesn't make the file smaller,
+the original bytes are uploaded unchanged.
+"""
+
+import io
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+import numpy as np
+
+from audio.pcm import (
+    FFMPEG_TIMEOUT,
+    SOUNDFILE_AVAILABLE,
+    decode_wav,
+    encode_wav,
+    is_wav,
+    resample,
+    to_mono,
+    wav_sample_width,
+)
+from config import (
+    UPLOAD_ENCODE_FORMAT,
+    UPLOAD_ENCODE_MONO,
+    UPLOAD_ENCODE_SAMPLE_RATE,
+    UPLOAD_OPUS_BITRATE,
+)
+
+_EXTENSIONS = {"wav": ".wav", "flac": ".flac", "opus": ".ogg"}
+
+
+class TranscodeResult:
+    """Encoded audio plus what it saved"""
+
+    def __init__(self, data: bytes, filename: str, original_size: int, codec: str):
+        self.data = data
+        self.filename = filename
+        self.original_size = original_size
+        self.size = len(data)
+        self.codec = codec
+
+    @property
+    def changed(self) -> bool:
+        return self.codec != "original"
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of the original size saved (0.0 when unchanged)"""
+        return 1.0 - self.size / self.original_size if self.original_size else 0.0
+
+    def summary(self) -> str:
+        if not self.changed:
+            return f"{self.size / 1e6:.2f} MB (uploaded as recorded)"
+        return (f"{self.original_size / 1e6:.2f} MB → {self.size / 1e6:.2f} MB {self.codec.upper()} "
+                f"({self.reduction:.0%} smaller)")
+
+
+def _with_extension(filename: str, fmt: str) -> str:
+    return os.path.splitext(filename)[0] + _EXTENSIONS[fmt]
+
+
+def _encode_soundfile(samples: np.ndarray, rate: int, fmt: str, sample_width: int) -> bytes:
+    import soundfile as sf
+
+    buffer = io.BytesIO()
+    if fmt == "flac":
+        sf.write(buffer, samples, rate, format="FLAC", subtype="PCM_24" if sample_width == 3 else "PCM_16")
+    else:
+        sf.write(buffer, samples, rate, format="OGG", subtype="OPUS")
+    return buffer.getvalue()
+
+
+def _encode_ffmpeg(data: bytes, fmt: str, mono: bool, sample_rate: int) -> Optional[bytes]:
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error", "-i", "pipe:0"]
+    if mono:
+        cmd += ["-ac", "1"]
+    if fmt == "opus":
+        # Opus only runs at 48/24/16/12/8 kHz; let libopus pick when the target isn't one of them
+        if sample_rate in (8000, 12000, 16000, 24000, 48000):
+            cmd += ["-ar", str(sample_rate)]
+        cmd += ["-c:a", "libopus", "-b:a", UPLOAD_OPUS_BITRATE, "-f", "ogg", "pipe:1"]
+    else:
+        if sample_rate:
+            cmd += ["-ar", str(sample_rate)]
+        cmd += ["-c:a", "flac" if fmt == "flac" else "pcm_s16le", "-f", fmt if fmt == "flac" else "wav", "pipe:1"]
+    try:
+        proc = subprocess.run(cmd, input=data, capture_output=True, timeout=FFMPEG_TIMEOUT, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"ffmpeg encode to {fmt} failed: {e}")
+        return None
+    return proc.stdout or None
+
+
+def _encode_wav_input(data: bytes, fmt: str, mono: bool, sample_rate: int) -> Optional[bytes]:
+    """Fast path: decode WAV with NumPy, downmix/resample, then encode.
+
+    Lossless outputs keep 24-bit (and 32-bit, which FLAC caps at 24) input
+    at 24 bits; everything narrower is written as 16-bit.
+    """
+    sample_width = 3 if wav_sample_width(data) >= 3 else 2
+    samples, rate = decode_wav(data)
+    if mono:
+        samples = to_mono(samples)
+    if sample_rate and sample_rate < rate:
+        samples = resample(samples, rate, sample_rate)
+        rate = sample_rate
+    if fmt == "wav":
+        return encode_wav(samples, rate, sample_width)
+    if SOUNDFILE_AVAILABLE:
+        try:
+            return _encode_soundfile(samples, rate, fmt, sample_width)
+        except Exception as e:
+            print(f"soundfile encode to {fmt} failed: {e}")
+    # ffmpeg does its own downmix/resample from the prepared WAV
+    return _encode_ffmpeg(encode_wav(samples, rate, sample_width), fmt, mono=False, sample_rate=0 if fmt != "opus" else rate)
+
+
+def transcode_for_upload(data: bytes, filename: str, fmt: str = UPLOAD_ENCODE_FORMAT,
+                         mono: bool = UPLOAD_ENCODE_MONO, sample_rate: int = UPLOAD_ENCODE_SAMPLE_RATE) -> TranscodeResult:
+    """Re-encode ``data`` for upload, returning the original when that isn't possible or smaller"""
+    original = TranscodeResult(data, filename, len(data), "original")
+    fmt = (fmt or "off").lower()
+    if fmt == "off" or not data:
+        return original
+    if fmt not in _EXTENSIONS:
+        print(f"Unknown upload encoding {fmt!r}; uploading audio unchanged")
+        return original
+
+    try:
+        if is_wav(data):
+            encoded = _encode_wav_input(data, fmt, mono, sample_rate)
+        else:
+            encoded = _encode_ffmpeg(data, fmt, mono, sample_rate)
+    except Exception as e:
+        print(f"Audio encoding failed, uploading original: {e}")
+        return original
+
+    if not encoded or len(encoded) >= len(data):
+        return original
+    return TranscodeResult(encoded, _with_extension(filename, fmt), len(data), fmt)
@@ -0,0 +1,341 @@
+"""
+Bulk ingestion of contributed recordings from a folder.
+
+    python -m bulk_ingest recordings/chapter2 --phone +91XXXXXXXXXX [--workers 3] [--max-bytes-per-sec 2000000]
+
+Each audio file under the folder is mapped to a sloka from its name
+(``ch2_sloka47_recitation.wav``, ``chapter-2_s47.mp3`` or ``2_47.wav``; see
+``media_metadata.parse_recording_filename``), checked and silence-trimmed
+like recordings from the app, encoded with ``transcode_for_upload`` and sent
+through ``SwechaAPIClient.upload_complete_audio`` with the same title and
+description the upload UI would use.
+
+``--workers`` files are uploaded at once, each with ``--max-in-flight``
+chunk requests, and every chunk draws from one shared token bucket so the
+whole run stays under ``--max-bytes-per-sec``.
+
+Every outcome is appended to a JSONL ledger keyed by the SHA-256 of the
+file's content. A rerun skips content that was already uploaded (even if the
+file was renamed or copied into another folder) and retries the rest;
+identical files within one run are uploaded once.
+"""
+
+import argparse
+import getpass
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from audio.analysis import check_recording, trim_wav
+from audio.transcode import transcode_for_upload
+from chunk_source import ChunkSource, open_chunk_source
+from config import (
+    BULK_INGEST_LEDGER,
+    BULK_INGEST_MAX_BYTES_PER_SEC,
+    BULK_INGEST_MAX_IN_FLIGHT,
+    BULK_INGEST_WORKERS,
+)
+from media_metadata import build_media_metadata, parse_recording_filename
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".flac", ".opus", ".m4a")
+DEFAULT_CATEGORY_ID = "ab9fa2ce-1f83-4e91-b89d-cca18e8b301e"
+
+# Ledger outcomes
+UPLOADED = "uploaded"
+DUPLICATE = "duplicate"
+UNMAPPED = "unmapped"
+REJECTED = "rejected"
+FAILED = "failed"
+
+
+class TokenBucket:
+    """Byte budget shared by every upload thread; a rate of 0 disables it.
+
+    Callers may take more than the bucket holds (a whole chunk at once); the
+    balance goes negative and they sleep until it has been paid back.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, amount: int):
+        if self.rate <= 0 or amount <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+class ThrottledChunkSource(ChunkSource):
+    """Charges each chunk read for sending against a TokenBucket"""
+
+    def __init__(self, inner: ChunkSource, bucket: TokenBucket):
+        self._inner = inner
+        self._bucket = bucket
+        self.total_size = inner.total_size
+        self.name = inner.name
+
+    def read(self, offset: int, length: int):
+        view = self._inner.read(offset, length)
+        self._bucket.consume(len(view))
+        return view
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Tuple[int, memoryview]]:
+        # Whole-content passes (manifest hashing) don't touch the network
+        return self._inner.iter_chunks(chunk_size)
+
+    def close(self):
+        self._inner.close()
+
+
+class Ledger:
+    """Append-only JSONL record of ingestion outcomes, keyed by content hash"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.uploaded: Dict[str, Dict] = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    if entry.get("status") == UPLOADED:
+                        self.uploaded[entry["sha256"]] = entry
+        except OSError:
+            pass
+
+    def append(self, entry: Dict):
+        entry["at"] = time.time()
+        line = json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            if entry["status"] == UPLOADED:
+                self.uploaded[entry["sha256"]] = entry
+
+
+class SlokaLookup:
+    """(chapter_number, sloka_number) -> (chapter, sloka) rows from the corpus"""
+
+    def __init__(self, db_manager):
+        self._db = db_manager
+        self._lock = threading.Lock()
+        self._chapters = {ch.get("chapter_number"): ch for ch in db_manager.get_all_chapters()}
+        self._slokas: Dict[int, Dict[int, Dict]] = {}
+
+    def find(self, chapter_number: int, sloka_number: int) -> Optional[Tuple[Dict, Dict]]:
+        chapter = self._chapters.get(chapter_number)
+        if chapter is None:
+            return None
+        with self._lock:
+            slokas = self._slokas.get(chapter_number)
+            if slokas is None:
+                slokas = {s.get("sloka_number"): s for s in self._db.get_slokas_by_chapter(chapter["id"])}
+                self._slokas[chapter_number] = slokas
+        sloka = slokas.get(sloka_number)
+        return (chapter, sloka) if sloka else None
+
+
+def find_audio_files(folder: str) -> List[str]:
+    """Audio files under ``folder``, in a stable order"""
+    paths = []
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        paths.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(AUDIO_EXTENSIONS))
+    return paths
+
+
+class BulkIngester:
+    """Uploads a folder of recordings with shared concurrency and bandwidth limits"""
+
+    def __init__(self, client, lookup: SlokaLookup, ledger: Ledger, category_id: str,
+                 workers: int = BULK_INGEST_WORKERS, max_in_flight: int = BULK_INGEST_MAX_IN_FLIGHT,
+                 max_bytes_per_sec: float = BULK_INGEST_MAX_BYTES_PER_SEC, default_kind: str = "recitation",
+                 language: str = "telugu", dry_run: bool = False):
+        self.client = client
+        self.lookup = lookup
+        self.ledger = ledger
+        self.category_id = category_id
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.bucket = TokenBucket(max_bytes_per_sec)
+        self.default_kind = default_kind
+        self.language = language
+        self.dry_run = dry_run
+        self._claimed = set()
+        self._claim_lock = threading.Lock()
+
+    def _claim(self, content_hash: str) -> bool:
+        """True for the first file with this content in the run and ledger"""
+        with self._claim_lock:
+            if content_hash in self._claimed or content_hash in self.ledger.uploaded:
+                return False
+            self._claimed.add(content_hash)
+            return True
+
+    def ingest_file(self, path: str) -> Dict:
+        """Upload one file and return its ledger entry"""
+        with open(path, "rb") as f:
+            data = f.read()
+        entry = {"path": path, "sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+        if not self._claim(entry["sha256"]):
+            previous = self.ledger.uploaded.get(entry["sha256"])
+            entry.update(status=DUPLICATE, duplicate_of=previous["path"] if previous else None)
+            return entry
+
+        parsed = parse_recording_filename(os.path.basename(path), self.default_kind)
+        match = self.lookup.find(parsed[0], parsed[1]) if parsed else None
+        if match is None:
+            entry.update(status=UNMAPPED, error="File name does not identify a known chapter and sloka")
+            return entry
+        chapter, sloka = match
+        kind = parsed[2]
+        entry.update(chapter=parsed[0], sloka=parsed[1], kind=kind)
+
+        ok, message, _ = check_recording(data)
+        if not ok:
+            entry.update(status=REJECTED, error=message)
+            return entry
+
+        user_id = (self.client.user_data or {}).get("id") or "user"
+        filename, title, description = build_media_metadata(chapter, sloka, user_id, kind, os.path.basename(path))
+        encoded = transcode_for_upload(trim_wav(data), filename)
+        entry.update(filename=encoded.filename, upload_size=encoded.size)
+        if self.dry_run:
+            entry["status"] = "planned"
+            return entry
+
+        source = ThrottledChunkSource(open_chunk_source(encoded.data), self.bucket)
+        result = self.client.upload_complete_audio(
+            audio_data=source,
+            filename=encoded.filename,
+            title=title,
+            category_id=self.category_id,
+            language=self.language,
+            release_rights="creator",
+            description=description,
+            max_in_flight=self.max_in_flight,
+            notify=False,
+        )
+        if result.get("duplicate"):
+            # Uploaded from this account before, outside the ledger (e.g. through the app)
+            entry.update(status=DUPLICATE, record=(result.get("data") or {}).get("data"), error=(result.get("data") or {}).get("error"))
+        elif result.get("success"):
+            entry.update(status=UPLOADED, record=(result.get("data") or {}).get("data"))
+        else:
+            entry.update(status=FAILED, error=(result.get("data") or {}).get("error"))
+        return entry
+
+    def _run_one(self, path: str) -> Dict:
+        try:
+            entry = self.ingest_file(path)
+        except Exception as e:
+            entry = {"path": path, "sha256": None, "status": FAILED, "error": str(e)}
+        if entry["status"] in (FAILED, UNMAPPED, REJECTED) and entry.get("sha256"):
+            # Let a later file with the same content (or the next run) try again
+            with self._claim_lock:
+                self._claimed.discard(entry["sha256"])
+        if not self.dry_run:
+            self.ledger.append(entry)
+        return entry
+
+    def run(self, paths: List[str]) -> Dict[str, int]:
+        """Ingest ``paths`` and return a count per outcome"""
+        counts: Dict[str, int] = {}
+        started = time.monotonic()
+        sent = 0
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            for n, entry in enumerate(executor.map(self._run_one, paths), 1):
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+                if entry["status"] == UPLOADED:
+                    sent += entry.get("upload_size", 0)
+                detail = entry.get("error") or entry.get("filename") or entry.get("duplicate_of") or ""
+                print(f"[{n}/{len(paths)}] {entry['status']:<9} {entry['path']} {detail}")
+        elapsed = time.monotonic() - started
+        if sent:
+            print(f"Sent {sent / 1e6:.1f} MB in {elapsed:.0f}s ({sent / max(elapsed, 1e-6) / 1e6:.2f} MB/s)")
+        return counts
+
+
+def _login(client, phone: str, password: str) -> bool:
+    response = client.login(phone, password)
+    if not response.get("success") or not client.auth_token:
+        print(f"Sign in failed: {(response.get('data') or {}).get('message', 'Invalid credentials')}")
+        return False
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upload a folder of sloka recordings to the Swecha corpus")
+    parser.add_argument("folder", help="folder of recordings named like ch2_sloka47_recitation.wav")
+    parser.add_argument("--phone", default=os.getenv("SWECHA_PHONE"), help="account phone number (or SWECHA_PHONE)")
+    parser.add_argument("--category-id", help="category for the records (default: first category from the API)")
+    parser.add_argument("--kind", choices=("recitation", "explanation"), default="recitation",
+                        help="kind for files whose name doesn't say")
+    parser.add_argument("--language", default="telugu")
+    parser.add_argument("--workers", type=int, default=BULK_INGEST_WORKERS, help="files uploaded at once")
+    parser.add_argument("--max-in-flight", type=int, default=BULK_INGEST_MAX_IN_FLIGHT, help="chunk requests per file")
+    parser.add_argument("--max-bytes-per-sec", type=float, default=BULK_INGEST_MAX_BYTES_PER_SEC,
+                        help="bandwidth cap shared by all workers (0 = unlimited)")
+    parser.add_argument("--ledger", default=BULK_INGEST_LEDGER, help="JSONL progress ledger used to resume")
+    parser.add_argument("--dry-run", action="store_true", help="map and encode files without uploading")
+    args = parser.parse_args(argv)
+
+    from api_client import SwechaAPIClient
+    from database.db_utils import get_db_manager
+
+    paths = find_audio_files(args.folder)
+    if not paths:
+        print(f"No audio files found in {args.folder}")
+        return 1
+
+    client = SwechaAPIClient()
+    category_id = args.category_id
+    if not args.dry_run:
+        if not args.phone:
+            parser.error("--phone (or SWECHA_PHONE) is required to upload")
+        password = os.getenv("SWECHA_PASSWORD") or getpass.getpass("Password: ")
+        if not _login(client, args.phone, password):
+            return 1
+        if not category_id:
+            categories = client.get_categories()
+            category_id = ((categories.get("data") or [{}])[0].get("id") if categories.get("success") else None)
+    category_id = category_id or DEFAULT_CATEGORY_ID
+
+    ingester = BulkIngester(
+        client,
+        SlokaLookup(get_db_manager()),
+        Ledger(args.ledger),
+        category_id,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+        max_bytes_per_sec=args.max_bytes_per_sec,
+        default_kind=args.kind,
+        language=args.language,
+        dry_run=args.dry_run,
+    )
+    counts = ingester.run(paths)
+    print(", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    return 1 if counts.get(FAILED) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
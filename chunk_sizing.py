@@ -0,0 +1,88 @@
+"""
+Adaptive chunk sizes for chunked uploads.
+
+Every chunk request reports its size and round-trip time. The sizer keeps
+an exponentially weighted average of per-request throughput and sizes the next upload's chunks so that one request takes about
+``UPLOAD_CHUNK_TARGET_SECONDS``: large chunks on fast links (fewer requests
+and less per-request overhead), small ones on slow links (well inside
+request timeouts). Throughput is measured per request, fixed latency
+included, so sizing chunks as ``throughput * target`` upload after upload
+settles on ``bandwidth * (target - latency)``, the size whose round trip is
+the target.
+
+Sizes stay within ``UPLOAD_CHUNK_MIN_BYTES``..``UPLOAD_CHUNK_MAX_BYTES`` and
+change by at most ``_MAX_STEP`` times between uploads. The server is told
+``total_chunks`` with every chunk, so the size is fixed for one upload and
+adapts from one upload to the next.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from config import (
+    UPLOAD_CHUNK_INITIAL_BYTES,
+    UPLOAD_CHUNK_MAX_BYTES,
+    UPLOAD_CHUNK_MIN_BYTES,
+    UPLOAD_CHUNK_TARGET_SECONDS,
+)
+
+_ALPHA = 0.3  # weight of the newest measurement
+_MAX_STEP = 4.0
+_ALIGN = 64 * 1024
+
+
+class ChunkSizer:
+    """Tracks chunk upload throughput and picks the chunk size for the next upload"""
+
+    def __init__(self, initial: int = UPLOAD_CHUNK_INITIAL_BYTES, minimum: int = UPLOAD_CHUNK_MIN_BYTES,
+                 maximum: int = UPLOAD_CHUNK_MAX_BYTES, target_seconds: float = UPLOAD_CHUNK_TARGET_SECONDS):
+        self.minimum = minimum
+        self.maximum = max(maximum, minimum)
+        self.target_seconds = target_seconds
+        self.throughput: Optional[float] = None  # bytes/s of one chunk request, latency included
+        self._size = min(max(initial, self.minimum), self.maximum)
+        self._lock = threading.Lock()
+
+    def observe(self, nbytes: int, seconds: float):
+        """Record an acknowledged chunk of ``nbytes`` that took ``seconds``"""
+        if nbytes <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            rate = nbytes / seconds
+            if self.throughput is None:
+                self.throughput = rate
+            else:
+                self.throughput += _ALPHA * (rate - self.throughput)
+
+    def failed(self):
+        """Record a chunk lost to a timeout or dropped connection; halves the estimate"""
+        with self._lock:
+            self.throughput = (self.throughput or self._size / self.target_seconds) / 2
+
+    def plan(self) -> int:
+        """Chunk size in bytes for the next upload"""
+        with self._lock:
+            if self.throughput is not None:
+                wanted = self.throughput * self.target_seconds
+                wanted = min(max(wanted, self._size / _MAX_STEP), self._size * _MAX_STEP)
+                aligned = int(wanted) // _ALIGN * _ALIGN
+                self._size = min(max(aligned, self.minimum), self.maximum)
+            return self._size
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"chunk_size": self._size, "throughput": self.throughput}
+
+
+_sizer_instance = None
+_sizer_lock = threading.Lock()
+
+
+def get_chunk_sizer() -> ChunkSizer:
+    """Get the process-wide sizer; every upload from this process shares the same link to the API"""
+    global _sizer_instance
+    if _sizer_instance is None:
+        with _sizer_lock:
+            if _sizer_instance is None:
+                _sizer_instance = ChunkSizer()
+    return _sizer_instance
@@ -0,0 +1,188 @@
+"""
+Zero-copy chunk readers for chunked audio uploads.
+
+Upload content can be a file path, a bytes-like buffer or a file-like
+object. Each is exposed through the same ``read(offset, length)`` call, which
+hands back a ``memoryview`` window where possible so the uploader never
+holds more than the chunks currently in flight.
+"""
+
+import io
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from typing import Iterator, Tuple, Union
+
+
+class ChunkSource:
+    """Random-access, read-only view over upload content"""
+
+    total_size = 0
+    name = None
+
+    def read(self, offset: int, length: int):
+        raise NotImplementedError
+
+    def iter_chunks(self, chunk_size: int) -> Iterator[Tuple[int, memoryview]]:
+        """Yield ``(chunk_index, view)`` pairs covering the whole content"""
+        index = 0
+        for offset in range(0, self.total_size, chunk_size):
+            yield index, self.read(offset, chunk_size)
+            index += 1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class BufferChunkSource(ChunkSource):
+    """Chunks sliced out of an in-memory buffer without copying"""
+
+    def __init__(self, buffer, name: str = None):
+        self._view = memoryview(buffer).cast("B")
+        self.total_size = self._view.nbytes
+        self.name = name
+
+    def read(self, offset: int, length: int) -> memoryview:
+        return self._view[offset:offset + length]
+
+    def close(self):
+        try:
+            self._view.release()
+        except BufferError:
+            pass
+
+
+class MmapChunkSource(ChunkSource):
+    """Chunks served from a memory-mapped file; only touched pages are loaded"""
+
+    def __init__(self, path: str, delete_on_close: bool = False):
+        self.path = path
+        self.name = os.path.basename(path)
+        self._delete_on_close = delete_on_close
+        self._file = open(path, "rb")
+        self.total_size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses zero-length files
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.total_size else None
+        self._view = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+
+    def read(self, offset: int, length: int) -> memoryview:
+        return self._view[offset:offset + length]
+
+    def close(self):
+        try:
+            self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # A chunk view is still referenced somewhere; let GC unmap it
+            pass
+        self._file.close()
+        if self._delete_on_close:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+
+class FileObjectChunkSource(ChunkSource):
+    """Chunks read on demand from a seekable file-like object.
+
+    Reads are serialized because concurrent chunk workers share one file
+    position. Each call allocates exactly one chunk.
+    """
+
+    def __init__(self, fileobj, name: str = None):
+        self._fileobj = fileobj
+        self._lock = threading.Lock()
+        self._start = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        self.total_size = fileobj.tell() - self._start
+        fileobj.seek(self._start)
+        self.name = name
+
+    def read(self, offset: int, length: int) -> memoryview:
+        with self._lock:
+            self._fileobj.seek(self._start + offset)
+            return memoryview(self._fileobj.read(length))
+
+
+class ViewReader(io.RawIOBase):
+    """Seekable read-only file over a chunk view.
+
+    HTTP clients stream a file body in small reads, so wrapping a view in
+    this sends it without first copying the whole chunk into ``bytes``.
+    """
+
+    def __init__(self, view):
+        self._view = memoryview(view).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        end = min(self._pos + len(buffer), self._view.nbytes)
+        size = end - self._pos
+        buffer[:size] = self._view[self._pos:end]
+        self._pos = end
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self._view.nbytes}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _fileobj_name(fileobj) -> str:
+    name = getattr(fileobj, "name", None)
+    return os.path.basename(name) if isinstance(name, str) else None
+
+
+def open_chunk_source(source: Union[str, os.PathLike, bytes, bytearray, memoryview, "object"]) -> ChunkSource:
+    """Wrap a path, buffer or file-like object in the cheapest ChunkSource.
+
+    - paths are memory-mapped
+    - bytes-like objects (and ``BytesIO``, via ``getbuffer``) are viewed in place
+    - file-like objects backed by a real file descriptor are memory-mapped
+    - other seekable streams are read chunk by chunk
+    - non-seekable streams are spooled to a temporary file first
+    """
+    if isinstance(source, ChunkSource):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        return MmapChunkSource(os.fspath(source))
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return BufferChunkSource(source)
+    if not hasattr(source, "read"):
+        raise TypeError(f"Unsupported upload source: {type(source).__name__}")
+
+    name = _fileobj_name(source)
+    if hasattr(source, "getbuffer"):
+        source_view = source.getbuffer()
+        return BufferChunkSource(source_view[source.tell():], name=name)
+    seekable = getattr(source, "seekable", lambda: False)()
+    if seekable and name and hasattr(source, "fileno") and source.tell() == 0 and os.path.isfile(source.name):
+        return MmapChunkSource(source.name)
+    if seekable:
+        return FileObjectChunkSource(source, name=name)
+
+    fd, tmp_path = tempfile.mkstemp(suffix=".upload")
+    with os.fdopen(fd, "wb") as tmp:
+        shutil.copyfileobj(source, tmp)
+    chunk_source = MmapChunkSource(tmp_path, delete_on_close=True)
+    chunk_source.name = name
+    return chunk_source
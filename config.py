@@ -14,6 +14,103 @@ SIGNIN_API_KEY = os.getenv("SIGNIN_API_KEY", "")
 SIGNUP_API_KEY = os.getenv("SIGNUP_API_KEY", "")
 AUDIO_UPLOAD_API_KEY = os.getenv("AUDIO_UPLOAD_API_KEY", "")
 
+# HTTP transport for the Swecha API (pooled keep-alive connections)
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "4"))  # number of hosts kept pooled
+API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "16"))  # open connections per host
+ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "100"))  # in-flight requests per AsyncSwechaAPIClient
+
+# Retries and circuit breaking for Swecha API calls (see resilience.py)
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))  # API_TIMEOUT is the read timeout
+API_UPLOAD_TIMEOUT = float(os.getenv("API_UPLOAD_TIMEOUT", "60"))  # read timeout for chunk uploads and finalize
+API_RETRY_ATTEMPTS = int(os.getenv("API_RETRY_ATTEMPTS", "3"))  # attempts per request, including the first
+API_RETRY_BACKOFF = float(os.getenv("API_RETRY_BACKOFF", "0.3"))  # seconds; full-jitter, doubled per attempt
+API_RETRY_MAX_DELAY = float(os.getenv("API_RETRY_MAX_DELAY", "5"))
+API_BREAKER_FAILURES = int(os.getenv("API_BREAKER_FAILURES", "5"))  # consecutive failures that open an endpoint's circuit
+API_BREAKER_RESET_SECONDS = float(os.getenv("API_BREAKER_RESET_SECONDS", "30"))  # fail fast this long before probing again
+
+# Response cache for slow-changing API reads (TTL in seconds, 0 disables)
+API_CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "256"))
+API_CACHE_TTLS = {
+    "categories": float(os.getenv("API_CACHE_TTL_CATEGORIES", "3600")),
+    "user_info": float(os.getenv("API_CACHE_TTL_USER_INFO", "300")),
+    "contributions": float(os.getenv("API_CACHE_TTL_CONTRIBUTIONS", "120")),
+}
+
+# Chunked audio uploads
+UPLOAD_MAX_IN_FLIGHT = int(os.getenv("UPLOAD_MAX_IN_FLIGHT", "4"))  # concurrent chunk requests per upload
+UPLOAD_CHUNK_RETRIES = int(os.getenv("UPLOAD_CHUNK_RETRIES", "3"))  # extra attempts per failed chunk
+UPLOAD_RETRY_BACKOFF = float(os.getenv("UPLOAD_RETRY_BACKOFF", "0.5"))  # seconds, doubled per attempt (full jitter)
+UPLOAD_CHUNK_INITIAL_BYTES = int(os.getenv("UPLOAD_CHUNK_INITIAL_BYTES", str(2 * 1024 * 1024)))  # before any throughput is measured
+UPLOAD_CHUNK_MIN_BYTES = int(os.getenv("UPLOAD_CHUNK_MIN_BYTES", str(256 * 1024)))
+UPLOAD_CHUNK_MAX_BYTES = int(os.getenv("UPLOAD_CHUNK_MAX_BYTES", str(5 * 1024 * 1024)))  # largest chunk the server accepts
+UPLOAD_CHUNK_TARGET_SECONDS = float(os.getenv("UPLOAD_CHUNK_TARGET_SECONDS", "4"))  # chunks are sized to take about this long
+UPLOAD_MANIFEST_DIR = os.getenv("UPLOAD_MANIFEST_DIR", os.path.join(".cache", "upload_manifests"))
+UPLOAD_MANIFEST_MAX_AGE = float(os.getenv("UPLOAD_MANIFEST_MAX_AGE", str(24 * 3600)))  # seconds before a partial upload is abandoned
+
+# Content-hash dedup of uploads (per user)
+UPLOAD_SKIP_DUPLICATES = os.getenv("UPLOAD_SKIP_DUPLICATES", "1") not in ("0", "false", "False")  # answer repeats from the index
+UPLOAD_DEDUP_DB = os.getenv("UPLOAD_DEDUP_DB", os.path.join(".cache", "upload_dedup.sqlite3"))
+UPLOAD_DEDUP_PENDING_SECONDS = float(os.getenv("UPLOAD_DEDUP_PENDING_SECONDS", "3600"))  # claims of unfinished uploads expire after this
+
+# Pre-upload audio encoding: "off", "wav" (PCM, NumPy only), "flac" or "opus" (soundfile or ffmpeg)
+UPLOAD_ENCODE_FORMAT = os.getenv("UPLOAD_ENCODE_FORMAT", "flac")  # lossless; originals are kept when no encoder is available
+UPLOAD_ENCODE_MONO = os.getenv("UPLOAD_ENCODE_MONO", "0") in ("1", "true", "True")  # downmix to mono (opt-in)
+UPLOAD_ENCODE_SAMPLE_RATE = int(os.getenv("UPLOAD_ENCODE_SAMPLE_RATE", "0"))  # Hz; 0 keeps the recorded rate
+UPLOAD_OPUS_BITRATE = os.getenv("UPLOAD_OPUS_BITRATE", "32k")
+
+# Recording checks and silence trimming before upload
+AUDIO_SILENCE_THRESHOLD_DB = float(os.getenv("AUDIO_SILENCE_THRESHOLD_DB", "-45"))  # frame RMS (dBFS) below this is silence
+AUDIO_MIN_VOICED_SECONDS = float(os.getenv("AUDIO_MIN_VOICED_SECONDS", "1.0"))  # reject recordings with less speech
+AUDIO_TRIM_PADDING_MS = int(os.getenv("AUDIO_TRIM_PADDING_MS", "250"))  # silence kept around trimmed speech
+AUDIO_CLIPPING_WARN_RATIO = float(os.getenv("AUDIO_CLIPPING_WARN_RATIO", "0.01"))  # share of clipped samples worth a warning
+
+# Background upload queue (jobs survive restarts in a SQLite file)
+UPLOAD_QUEUE_DB = os.getenv("UPLOAD_QUEUE_DB", os.path.join(".cache", "upload_queue.sqlite3"))
+UPLOAD_QUEUE_SPOOL_DIR = os.getenv("UPLOAD_QUEUE_SPOOL_DIR", os.path.join(".cache", "upload_spool"))
+UPLOAD_QUEUE_WORKERS = int(os.getenv("UPLOAD_QUEUE_WORKERS", "2"))
+UPLOAD_QUEUE_MAX_ATTEMPTS = int(os.getenv("UPLOAD_QUEUE_MAX_ATTEMPTS", "3"))
+UPLOAD_QUEUE_STALE_SECONDS = float(os.getenv("UPLOAD_QUEUE_STALE_SECONDS", "120"))  # requeue running jobs without a heartbeat
+UPLOAD_QUEUE_POLL_SECONDS = float(os.getenv("UPLOAD_QUEUE_POLL_SECONDS", "2"))  # UI status refresh interval
+UPLOAD_QUEUE_RETRY_BACKOFF = float(os.getenv("UPLOAD_QUEUE_RETRY_BACKOFF", "10"))  # seconds before a failed job is retried; full jitter, doubled per attempt
+UPLOAD_QUEUE_RETRY_MAX_DELAY = float(os.getenv("UPLOAD_QUEUE_RETRY_MAX_DELAY", "300"))
+UPLOAD_QUEUE_RETENTION_SECONDS = float(os.getenv("UPLOAD_QUEUE_RETENTION_SECONDS", str(7 * 24 * 3600)))  # finished jobs kept this long
+
+# Bulk ingestion CLI (python -m bulk_ingest <folder>)
+BULK_INGEST_WORKERS = int(os.getenv("BULK_INGEST_WORKERS", "3"))  # files uploaded at once
+BULK_INGEST_MAX_IN_FLIGHT = int(os.getenv("BULK_INGEST_MAX_IN_FLIGHT", "2"))  # chunk requests per file
+BULK_INGEST_MAX_BYTES_PER_SEC = int(os.getenv("BULK_INGEST_MAX_BYTES_PER_SEC", "0"))  # shared by all workers, 0 = unlimited
+BULK_INGEST_LEDGER = os.getenv("BULK_INGEST_LEDGER", os.path.join(".cache", "bulk_ingest_ledger.jsonl"))
+
+# Corpus (chapters/slokas) cache, shared by all sessions in a process
+CORPUS_REFRESH_SECONDS = float(os.getenv("CORPUS_REFRESH_SECONDS", "3600"))  # 0 = load once per process
+
+# Corpus storage backend: "supabase", "local" (data/chapter*.json), "binary" (compiled corpus file)
+# or "auto" (Supabase, falling back to the binary file if built, else the JSON files)
+CORPUS_BACKEND = os.getenv("CORPUS_BACKEND", "auto")
+LOCAL_CORPUS_DIR = os.getenv("LOCAL_CORPUS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+CORPUS_BINARY_PATH = os.getenv("CORPUS_BINARY_PATH", os.path.join(".cache", "corpus.bin"))  # built by `make build-corpus`
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "5"))  # seconds before falling back to the local corpus
+CORPUS_FALLBACK_COOLDOWN = float(os.getenv("CORPUS_FALLBACK_COOLDOWN", "60"))  # seconds to skip Supabase after a failure
+
+# Full-text sloka search (rebuilt when the corpus version changes)
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", os.path.join(".cache", "search_index.json"))
+SEARCH_RESULTS_LIMIT = int(os.getenv("SEARCH_RESULTS_LIMIT", "10"))
+
+# On-disk reference audio cache, filled by prefetching neighbouring slokas
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(".cache", "reference_audio"))
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+AUDIO_CACHE_REVALIDATE_SECONDS = float(os.getenv("AUDIO_CACHE_REVALIDATE_SECONDS", "86400"))  # conditional GET after this
+PREFETCH_RADIUS = int(os.getenv("PREFETCH_RADIUS", "1"))  # slokas either side of the one shown
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+
+# Recitation scoring against the reference audio
+SCORING_SAMPLE_RATE = int(os.getenv("SCORING_SAMPLE_RATE", "16000"))  # features are extracted at this rate
+SCORING_BAND_RATIO = float(os.getenv("SCORING_BAND_RATIO", "0.15"))  # DTW band half-width, as a share of the longer take
+SCORING_SEGMENTS = int(os.getenv("SCORING_SEGMENTS", "8"))  # reference sections reported separately
+SCORING_CACHE_ENTRIES = int(os.getenv("SCORING_CACHE_ENTRIES", "64"))  # reference feature matrices kept in memory
+REFERENCE_FEATURES_DIR = os.getenv("REFERENCE_FEATURES_DIR", os.path.join(".cache", "reference_features"))  # built by `make build-features`
+
 # Legacy configuration (kept for reference audio functionality)
 AUDIO_STORAGE_PATH = os.getenv("AUDIO_STORAGE_PATH", r"gita\Gita_Guru\sloka")
 
@@ -0,0 +1,310 @@
+import glob
+import json
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    CORPUS_BINARY_PATH,
+    CORPUS_FALLBACK_COOLDOWN,
+    LOCAL_CORPUS_DIR,
+    SUPABASE_KEY,
+    SUPABASE_TIMEOUT,
+    SUPABASE_URL,
+)
+
+# Stable ids for rows that only exist in the local JSON files
+_LOCAL_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "gita-guru/local-corpus")
+
+
+def sloka_key(chapter_number: int, sloka_number: int) -> str:
+    """Backend-independent key for a sloka, e.g. ``"12.1"``.
+
+    Row ids are only stable within one backend (the local files mint their
+    own), so anything persisted or compared across backends (feature
+    index, search index) is keyed by chapter and sloka number instead.
+    """
+    return f"{int(chapter_number)}.{int(sloka_number)}"
+
+
+class CorpusBackend:
+    """Read-only source of chapter and sloka rows.
+
+    Rows use the Supabase schema field names (see ``database/schema.sql``).
+    Methods raise on failure; ``DatabaseManager`` handles and reports errors.
+    """
+
+    name = "base"
+
+    def load_corpus(self) -> Tuple[List[Dict], List[Dict]]:
+        """Return every ``(chapters, slokas)`` row"""
+        raise NotImplementedError
+
+    def corpus_version(self) -> Any:
+        """Cheap token that changes whenever the corpus does (None if unknown)"""
+        return None
+
+    def get_chapter_by_number(self, chapter_number: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_sloka_by_chapter_and_number(self, chapter_id: str, sloka_number: int) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_all_chapters(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_slokas_by_chapter(self, chapter_id: str) -> List[Dict]:
+        raise NotImplementedError
+
+
+class SupabaseBackend(CorpusBackend):
+    """Chapters and slokas tables in Supabase"""
+
+    name = "supabase"
+    # Supabase returns at most this many rows per request
+    page_size = 1000
+
+    def __init__(self, url: str = SUPABASE_URL, key: str = SUPABASE_KEY, timeout: float = SUPABASE_TIMEOUT):
+        from supabase import Client, ClientOptions, create_client
+
+        self.supabase: Client = create_client(url, key, options=ClientOptions(postgrest_client_timeout=timeout))
+
+    def load_corpus(self):
+        """Fetch every chapter with its slokas embedded, in one request per page"""
+        chapters, slokas = [], []
+        start = 0
+        while True:
+            result = (
+                self.supabase.table('chapters')
+                .select('*, slokas(*)')
+                .order('chapter_number')
+                .range(start, start + self.page_size - 1)
+                .execute()
+            )
+            rows = result.data or []
+            for row in rows:
+                embedded = row.pop('slokas', None) or []
+                for sloka in embedded:
+                    sloka.setdefault('chapter_id', row['id'])
+                slokas.extend(embedded)
+                chapters.append(row)
+            if len(rows) < self.page_size:
+                return chapters, slokas
+            start += self.page_size
+
+    def corpus_version(self):
+        """Row count and latest updated_at of both tables"""
+        version = []
+        for table in ('chapters', 'slokas'):
+            result = self.supabase.table(table).select('updated_at', count='exact').order('updated_at', desc=True).limit(1).execute()
+            version.append((result.count, result.data[0]['updated_at'] if result.data else None))
+        return tuple(version)
+
+    def get_chapter_by_number(self, chapter_number):
+        result = self.supabase.table('chapters').select('*').eq('chapter_number', chapter_number).execute()
+        return result.data[0] if result.data else None
+
+    def get_sloka_by_chapter_and_number(self, chapter_id, sloka_number):
+        result = self.supabase.table('slokas').select('*').eq('chapter_id', chapter_id).eq('sloka_number', sloka_number).execute()
+        return result.data[0] if result.data else None
+
+    def get_all_chapters(self):
+        return self.supabase.table('chapters').select('*').order('chapter_number').execute().data
+
+    def get_slokas_by_chapter(self, chapter_id):
+        return self.supabase.table('slokas').select('*').eq('chapter_id', chapter_id).order('sloka_number').execute().data
+
+
+class LocalFileBackend(CorpusBackend):
+    """Corpus read from the bundled ``data/chapter*.json`` files.
+
+    The files use their own field names (``chapter``, ``sloka_text``,
+    ``telugu_meaning``, ``audio_link``...); rows are normalized to the
+    Supabase schema with deterministic UUIDs and indexed once at load, so
+    every lookup is a dict access. Those UUIDs are not the Supabase ids; use
+    ``sloka_key`` for anything that must match across backends.
+    """
+
+    name = "local"
+
+    def __init__(self, data_dir: str = LOCAL_CORPUS_DIR):
+        self.data_dir = data_dir
+        self._chapters: List[Dict] = []
+        self._chapters_by_number: Dict[int, Dict] = {}
+        self._slokas_by_chapter: Dict[str, List[Dict]] = {}
+        self._slokas_by_key: Dict[Tuple[str, int], Dict] = {}
+        self._version = None
+        self._load()
+
+    @staticmethod
+    def _chapter_id(chapter_number: int) -> str:
+        return str(uuid.uuid5(_LOCAL_NAMESPACE, f"chapter:{chapter_number}"))
+
+    @staticmethod
+    def _sloka_id(chapter_number: int, sloka_number: int) -> str:
+        return str(uuid.uuid5(_LOCAL_NAMESPACE, f"sloka:{chapter_number}:{sloka_number}"))
+
+    def _load(self):
+        paths = sorted(glob.glob(os.path.join(self.data_dir, "chapter*.json")))
+        chapters: Dict[int, Dict] = {}
+        slokas: List[Dict] = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                rows = json.load(f)
+            for row in rows:
+                chapter_number = int(row["chapter"])
+                chapter = chapters.setdefault(chapter_number, {
+                    "id": self._chapter_id(chapter_number),
+                    "chapter_number": chapter_number,
+                    "chapter_name": "",
+                })
+                if row.get("chapter_name") and not chapter["chapter_name"]:
+                    chapter["chapter_name"] = row["chapter_name"]
+                sloka_number = int(row["sloka_number"])
+                slokas.append({
+                    "id": self._sloka_id(chapter_number, sloka_number),
+                    "chapter_id": chapter["id"],
+                    "sloka_number": sloka_number,
+                    "sloka_text_telugu": row.get("sloka_text", ""),
+                    "meaning_telugu": row.get("telugu_meaning", ""),
+                    "meaning_english": row.get("english_meaning", ""),
+                    "reference_audio_url": row.get("reference_audio_url") or row.get("audio_link"),
+                })
+
+        self._chapters = [chapters[n] for n in sorted(chapters)]
+        self._chapters_by_number = chapters
+        for sloka in sorted(slokas, key=lambda s: s["sloka_number"]):
+            self._slokas_by_chapter.setdefault(sloka["chapter_id"], []).append(sloka)
+            self._slokas_by_key[(sloka["chapter_id"], sloka["sloka_number"])] = sloka
+        self._version = tuple((os.path.basename(p), os.path.getmtime(p)) for p in paths)
+
+    def load_corpus(self):
+        return list(self._chapters), [s for ch in self._chapters for s in self._slokas_by_chapter.get(ch["id"], [])]
+
+    def corpus_version(self):
+        return self._version
+
+    def get_chapter_by_number(self, chapter_number):
+        return self._chapters_by_number.get(int(chapter_number))
+
+    def get_sloka_by_chapter_and_number(self, chapter_id, sloka_number):
+        return self._slokas_by_key.get((chapter_id, int(sloka_number)))
+
+    def get_all_chapters(self):
+        return list(self._chapters)
+
+    def get_slokas_by_chapter(self, chapter_id):
+        return list(self._slokas_by_chapter.get(chapter_id, []))
+
+
+class BinaryFileBackend(CorpusBackend):
+    """Corpus served from a memory-mapped file built by ``database.binary_corpus``.
+
+    Rows are lazy mappings: string fields are decoded from the shared page
+    cache only when read.
+    """
+
+    name = "binary"
+
+    def __init__(self, path: str = CORPUS_BINARY_PATH):
+        from database.binary_corpus import BinaryCorpus
+
+        self.corpus = BinaryCorpus(path)
+        self._chapter_index = {ch["id"]: i for i, ch in enumerate(self.corpus.chapters())}
+        self._chapter_by_number = {ch["chapter_number"]: ch for ch in self.corpus.chapters()}
+
+    def load_corpus(self):
+        return list(self.corpus.chapters()), self.corpus.all_slokas()
+
+    def corpus_version(self):
+        return self.corpus.source_version
+
+    def get_chapter_by_number(self, chapter_number):
+        return self._chapter_by_number.get(int(chapter_number))
+
+    def get_sloka_by_chapter_and_number(self, chapter_id, sloka_number):
+        for sloka in self.get_slokas_by_chapter(chapter_id):
+            if sloka["sloka_number"] == int(sloka_number):
+                return sloka
+        return None
+
+    def get_all_chapters(self):
+        return list(self.corpus.chapters())
+
+    def get_slokas_by_chapter(self, chapter_id):
+        index = self._chapter_index.get(chapter_id)
+        return self.corpus.slokas_for_chapter(index) if index is not None else []
+
+
+class FallbackBackend(CorpusBackend):
+    """Use ``primary`` and switch to ``fallback`` when it errors, times out or is empty.
+
+    After a primary failure the fallback is used directly for ``cooldown``
+    seconds so a slow Supabase doesn't cost a timeout on every call.
+    """
+
+    def __init__(self, primary: CorpusBackend, fallback: CorpusBackend, cooldown: float = CORPUS_FALLBACK_COOLDOWN):
+        self.primary = primary
+        self.fallback = fallback
+        self.cooldown = cooldown
+        self._primary_down_until = 0.0
+
+    @property
+    def name(self):
+        return f"{self.primary.name}+{self.fallback.name}"
+
+    def _call(self, method: str, *args, require_data: bool = False):
+        if time.monotonic() >= self._primary_down_until:
+            try:
+                result = getattr(self.primary, method)(*args)
+                if not require_data or result[0]:
+                    return self.primary.name, result
+                print(f"{self.primary.name} corpus is empty, using {self.fallback.name} corpus")
+            except Exception as e:
+                print(f"{self.primary.name} corpus unavailable ({e}), using {self.fallback.name} corpus")
+                self._primary_down_until = time.monotonic() + self.cooldown
+        return self.fallback.name, getattr(self.fallback, method)(*args)
+
+    def load_corpus(self):
+        return self._call('load_corpus', require_data=True)[1]
+
+    def corpus_version(self):
+        # Tag the version with its source so switching backends forces a reload
+        return self._call('corpus_version')
+
+    def get_chapter_by_number(self, chapter_number):
+        return self._call('get_chapter_by_number', chapter_number)[1]
+
+    def get_sloka_by_chapter_and_number(self, chapter_id, sloka_number):
+        return self._call('get_sloka_by_chapter_and_number', chapter_id, sloka_number)[1]
+
+    def get_all_chapters(self):
+        return self._call('get_all_chapters')[1]
+
+    def get_slokas_by_chapter(self, chapter_id):
+        return self._call('get_slokas_by_chapter', chapter_id)[1]
+
+
+def _offline_backend() -> CorpusBackend:
+    """Compiled corpus file when one has been built, else the JSON files"""
+    if os.path.exists(CORPUS_BINARY_PATH):
+        try:
+            return BinaryFileBackend()
+        except (OSError, ValueError) as e:
+            print(f"Ignoring corpus file {CORPUS_BINARY_PATH}: {e}")
+    return LocalFileBackend()
+
+
+def create_backend(kind: str) -> CorpusBackend:
+    """Build the backend named by ``CORPUS_BACKEND``: supabase, local, binary or auto"""
+    kind = (kind or "auto").lower()
+    if kind == "supabase":
+        return SupabaseBackend()
+    if kind == "local":
+        return LocalFileBackend()
+    if kind == "binary":
+        return BinaryFileBackend()
+    if kind == "auto":
+        return FallbackBackend(SupabaseBackend(), _offline_backend())
+    raise ValueError(f"Unknown corpus backend: {kind}")
@@ -0,0 +1,214 @@
+"""
+Compact, memory-mapped corpus file.
+
+Layout (little-endian)::
+
+    header   magic "GGCB", format version, record counts, section offsets
+    chapters fixed-size records: number, id, name, first sloka, sloka count
+    slokas   fixed-size records: number, chapter index, id, text, meanings, audio url
+    strings  UTF-8 string table, deduplicated
+
+Every string field is an ``(offset, length)`` reference into the string
+table. Records are decoded only when a field is read, so opening the file
+costs one ``mmap`` call and every Streamlit worker shares the same page cache.
+
+Build it from any corpus backend with::
+
+    python -m database.binary_corpus build --source local --output .cache/corpus.bin
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"GGCB"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIIIIIII")
+_STR_REF = "II"
+_CHAPTER = struct.Struct("<i" + _STR_REF * 2 + "II")
+_SLOKA = struct.Struct("<iI" + _STR_REF * 5)
+_NULL_LENGTH = 0xFFFFFFFF
+
+_CHAPTER_STR_FIELDS = ("id", "chapter_name")
+_SLOKA_STR_FIELDS = ("id", "sloka_text_telugu", "meaning_telugu", "meaning_english", "reference_audio_url")
+
+
+class _StringTable:
+    def __init__(self):
+        self._buffer = bytearray()
+        self._refs: Dict[str, Tuple[int, int]] = {}
+
+    def add(self, value: Optional[str]) -> Tuple[int, int]:
+        if value is None:
+            return 0, _NULL_LENGTH
+        value = str(value)
+        ref = self._refs.get(value)
+        if ref is None:
+            encoded = value.encode("utf-8")
+            ref = (len(self._buffer), len(encoded))
+            self._buffer.extend(encoded)
+            self._refs[value] = ref
+        return ref
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buffer)
+
+
+def build_binary_corpus(chapters: List[Dict], slokas: List[Dict], path: str, source_version=None) -> str:
+    """Write chapters and slokas (Supabase row shape) to ``path`` atomically"""
+    strings = _StringTable()
+    chapters = sorted(chapters, key=lambda ch: int(ch["chapter_number"]))
+    chapter_index = {ch["id"]: i for i, ch in enumerate(chapters)}
+    slokas = sorted(
+        (s for s in slokas if s.get("chapter_id") in chapter_index),
+        key=lambda s: (chapter_index[s["chapter_id"]], int(s["sloka_number"])),
+    )
+
+    sloka_blob = bytearray()
+    ranges: Dict[int, List[int]] = {}
+    for i, sloka in enumerate(slokas):
+        ch_idx = chapter_index[sloka["chapter_id"]]
+        first_count = ranges.setdefault(ch_idx, [i, 0])
+        first_count[1] += 1
+        refs = [n for field in _SLOKA_STR_FIELDS for n in strings.add(sloka.get(field))]
+        sloka_blob.extend(_SLOKA.pack(int(sloka["sloka_number"]), ch_idx, *refs))
+
+    chapter_blob = bytearray()
+    for i, chapter in enumerate(chapters):
+        first, count = ranges.get(i, [0, 0])
+        refs = [n for field in _CHAPTER_STR_FIELDS for n in strings.add(chapter.get(field))]
+        chapter_blob.extend(_CHAPTER.pack(int(chapter["chapter_number"]), *refs, first, count))
+
+    version_ref = strings.add(json.dumps(source_version, default=str))
+    string_blob = strings.getvalue()
+    chapters_offset = _HEADER.size
+    slokas_offset = chapters_offset + len(chapter_blob)
+    strings_offset = slokas_offset + len(sloka_blob)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(chapters), len(slokas),
+        chapters_offset, slokas_offset, strings_offset, len(string_blob), *version_ref,
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(chapter_blob)
+        f.write(sloka_blob)
+        f.write(string_blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+class _LazyRecord(Mapping):
+    """Row that decodes each string field from the mapped file on first access"""
+
+    __slots__ = ("_corpus", "_values", "_refs", "_str_fields")
+
+    def __init__(self, corpus: "BinaryCorpus", values: Dict, refs: Tuple[int, ...], str_fields: Tuple[str, ...]):
+        self._corpus = corpus
+        self._values = values
+        self._refs = refs
+        self._str_fields = str_fields
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        try:
+            i = self._str_fields.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        value = self._corpus._string(self._refs[2 * i], self._refs[2 * i + 1])
+        self._values[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base_keys()
+        yield from self._str_fields
+
+    def __len__(self) -> int:
+        return len(self._base_keys()) + len(self._str_fields)
+
+    def _base_keys(self):
+        return [k for k in self._values if k not in self._str_fields]
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class BinaryCorpus:
+    """Read-only, memory-mapped view of a file written by ``build_binary_corpus``"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.chapter_count, self.sloka_count, self._chapters_offset,
+         self._slokas_offset, self._strings_offset, _, version_off, version_len) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} Gita corpus file")
+        self.source_version = json.loads(self._string(version_off, version_len))
+        self._chapters = None
+        self._sloka_ranges = None
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if length == _NULL_LENGTH:
+            return None
+        start = self._strings_offset + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _chapter_record(self, index: int) -> Tuple[Mapping, Tuple[int, int]]:
+        number, *refs, first, count = _CHAPTER.unpack_from(self._mmap, self._chapters_offset + index * _CHAPTER.size)
+        return _LazyRecord(self, {"chapter_number": number}, tuple(refs), _CHAPTER_STR_FIELDS), (first, count)
+
+    def chapters(self) -> List[Mapping]:
+        if self._chapters is None:
+            records = [self._chapter_record(i) for i in range(self.chapter_count)]
+            self._sloka_ranges = [r[1] for r in records]
+            self._chapters = [r[0] for r in records]
+        return self._chapters
+
+    def sloka(self, index: int) -> Mapping:
+        number, ch_idx, *refs = _SLOKA.unpack_from(self._mmap, self._slokas_offset + index * _SLOKA.size)
+        values = {"sloka_number": number, "chapter_id": self.chapters()[ch_idx]["id"]}
+        return _LazyRecord(self, values, tuple(refs), _SLOKA_STR_FIELDS)
+
+    def slokas_for_chapter(self, chapter_index: int) -> List[Mapping]:
+        self.chapters()
+        first, count = self._sloka_ranges[chapter_index]
+        return [self.sloka(i) for i in range(first, first + count)]
+
+    def all_slokas(self) -> List[Mapping]:
+        return [self.sloka(i) for i in range(self.sloka_count)]
+
+
+def main(argv=None):
+    from config import CORPUS_BINARY_PATH
+    from database.backends import create_backend
+
+    parser = argparse.ArgumentParser(description="Compile the Gita corpus into a memory-mappable binary file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build the corpus file from a backend")
+    build.add_argument("--source", default="auto", help="corpus backend to read from: supabase, local or auto")
+    build.add_argument("--output", default=CORPUS_BINARY_PATH)
+    args = parser.parse_args(argv)
+
+    backend = create_backend(args.source)
+    chapters, slokas = backend.load_corpus()
+    build_binary_corpus(chapters, slokas, args.output, source_version=backend.corpus_version())
+    print(f"Wrote {len(chapters)} chapters and {len(slokas)} slokas to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import CORPUS_REFRESH_SECONDS
+from database.backends import sloka_key
+from singleflight import get_singleflight
+
+
+class CorpusSnapshot:
+    """Immutable in-memory copy of the chapters and slokas tables.
+
+    Indexed by chapter number, chapter id, ``(chapter_id, sloka_number)`` and
+    ``sloka_key`` so every ``DatabaseManager`` read is a dict lookup.
+    """
+
+    def __init__(self, chapters: List[Dict], slokas: List[Dict], version: Any = None):
+        self.chapters = sorted(chapters, key=lambda ch: ch.get('chapter_number') or 0)
+        self.chapters_by_number: Dict[int, Dict] = {ch.get('chapter_number'): ch for ch in self.chapters}
+        self.chapters_by_id: Dict[str, Dict] = {ch.get('id'): ch for ch in self.chapters}
+        self.slokas_by_chapter: Dict[str, List[Dict]] = {}
+        self.slokas_by_key: Dict[Tuple[str, int], Dict] = {}
+        self.slokas_by_number: Dict[str, Dict] = {}
+        for sloka in sorted(slokas, key=lambda s: s.get('sloka_number') or 0):
+            self.slokas_by_chapter.setdefault(sloka.get('chapter_id'), []).append(sloka)
+            self.slokas_by_key[(sloka.get('chapter_id'), sloka.get('sloka_number'))] = sloka
+            key = self.key_of(sloka)
+            if key is not None:
+                self.slokas_by_number[key] = sloka
+        self.version = version
+        self.loaded_at = time.monotonic()
+
+    def key_of(self, sloka: Dict) -> Optional[str]:
+        """``sloka_key`` of a row, or None if its chapter is unknown"""
+        chapter = self.chapters_by_id.get(sloka.get('chapter_id'))
+        if chapter is None or chapter.get('chapter_number') is None or sloka.get('sloka_number') is None:
+            return None
+        return sloka_key(chapter['chapter_number'], sloka['sloka_number'])
+
+
+class CorpusCache:
+    """Process-wide corpus store shared by every Streamlit session.
+
+    ``loader`` returns ``(chapters, slokas)`` and is called once per process,
+    then again when the snapshot is older than ``refresh_interval`` seconds.
+    If a ``version_probe`` is given it is consulted first and the full reload
+    is skipped while the version is unchanged. Readers never wait on a
+    refresh that another thread is already running; they keep the previous
+    snapshot until the new one is swapped in. Callers that arrive during the
+    first load share its outcome, so a failed load is attempted once per
+    burst of readers rather than once per reader.
+    """
+
+    def __init__(self, loader: Callable[[], Tuple[List[Dict], List[Dict]]],
+                 refresh_interval: float = CORPUS_REFRESH_SECONDS,
+                 version_probe: Optional[Callable[[], Any]] = None):
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.version_probe = version_probe
+        self._snapshot: Optional[CorpusSnapshot] = None
+        self._lock = threading.Lock()
+        self._flight = get_singleflight()
+
+    def _is_stale(self, snapshot: Optional[CorpusSnapshot]) -> bool:
+        if snapshot is None or snapshot.loaded_at == float('-inf'):
+            return True  # never loaded, or invalidated (even with periodic refresh off)
+        return self.refresh_interval > 0 and time.monotonic() - snapshot.loaded_at > self.refresh_interval
+
+    def snapshot(self) -> Optional[CorpusSnapshot]:
+        """Return the current snapshot, loading or refreshing it when due.
+
+        Returns None only if the corpus has never loaded successfully.
+        """
+        snapshot = self._snapshot
+        if not self._is_stale(snapshot):
+            return snapshot
+        if snapshot is None:
+            # First load blocks, and concurrent callers wait on that one attempt
+            self._flight.do(("corpus", id(self)), self._load)
+            return self._snapshot
+        # Later refreshes are done by whichever thread gets the lock
+        if not self._lock.acquire(blocking=False):
+            return snapshot
+        try:
+            if self._is_stale(self._snapshot):
+                self._refresh()
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def _load(self):
+        with self._lock:
+            if self._is_stale(self._snapshot):
+                self._refresh()
+
+    def _refresh(self):
+        current = self._snapshot
+        version = None
+        if self.version_probe:
+            try:
+                version = self.version_probe()
+            except Exception as e:
+                print(f"Error checking corpus version: {e}")
+        try:
+            if current is not None and version is not None and version == current.version:
+                current.loaded_at = time.monotonic()
+                return
+            chapters, slokas = self.loader()
+            self._snapshot = CorpusSnapshot(chapters, slokas, version)
+        except Exception as e:
+            print(f"Error refreshing corpus cache: {e}")
+            if current is not None:
+                # Keep serving the old data and retry after another interval
+                current.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Force a reload on the next read"""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.loaded_at = float('-inf')
+                self._snapshot.version = None
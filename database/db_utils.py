@@ -1,55 +1,142 @@
 import os
+import threading
 import uuid
-from supabase import create_client, Client
-from config import SUPABASE_URL, SUPABASE_KEY
+from config import CORPUS_BACKEND, SEARCH_INDEX_PATH, SEARCH_RESULTS_LIMIT
 from datetime import datetime
 
+from database.backends import CorpusBackend, create_backend
+from database.corpus_cache import CorpusCache, CorpusSnapshot
+from database.fuzzy_index import FuzzyIndex
+from database.search_index import SearchIndex
+from singleflight import get_singleflight
+
+
 class DatabaseManager:
-    def __init__(self):
-        # Public client for reading chapters, slokas, and reference audio
-        self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    def __init__(self, backend: CorpusBackend = None):
+        # Read-only source of chapters, slokas, and reference audio URLs
+        self.backend = backend or create_backend(CORPUS_BACKEND)
+        # The Gita text is effectively immutable: load it once and share it
+        self.corpus = CorpusCache(self.backend.load_corpus, version_probe=self.backend.corpus_version)
+        # Concurrent identical backend reads (while the corpus can't load) share one call
+        self.flight = get_singleflight()
+        # (snapshot, search index, fuzzy index) for the snapshot the indexes were built from
+        self._search = None
+        self._search_lock = threading.Lock()
+
+    def refresh_corpus(self):
+        """Drop the cached corpus so the next read reloads it"""
+        self.corpus.invalidate()
+
+    def _coalesced(self, name: str, read, *args):
+        """Run a backend read, sharing it with identical reads already in flight"""
+        return self.flight.do(("db", id(self.backend), name) + args, lambda: read(*args))
 
     # ---------------- Chapters / Slokas (Read Only) ----------------
     def get_chapter_by_number(self, chapter_number: int):
+        snapshot = self.corpus.snapshot()
+        if snapshot is not None:
+            return snapshot.chapters_by_number.get(int(chapter_number))
         try:
-            result = self.supabase.table('chapters').select('*').eq('chapter_number', chapter_number).execute()
-            return result.data[0] if result.data else None
+            return self._coalesced("chapter", self.backend.get_chapter_by_number, chapter_number)
         except Exception as e:
             print(f"Error getting chapter {chapter_number}: {e}")
             return None
 
     def get_sloka_by_chapter_and_number(self, chapter_id: str, sloka_number: int):
+        snapshot = self.corpus.snapshot()
+        if snapshot is not None:
+            return snapshot.slokas_by_key.get((chapter_id, int(sloka_number)))
         try:
-            result = self.supabase.table('slokas').select('*').eq('chapter_id', chapter_id).eq('sloka_number', sloka_number).execute()
-            return result.data[0] if result.data else None
+            return self._coalesced("sloka", self.backend.get_sloka_by_chapter_and_number, chapter_id, sloka_number)
         except Exception as e:
             print(f"Error getting sloka {sloka_number}: {e}")
             return None
 
     def get_all_chapters(self):
+        snapshot = self.corpus.snapshot()
+        if snapshot is not None:
+            return list(snapshot.chapters)
         try:
-            result = self.supabase.table('chapters').select('*').order('chapter_number').execute()
-            return result.data
+            return self._coalesced("chapters", self.backend.get_all_chapters)
         except Exception as e:
             print(f"Error getting chapters: {e}")
             return []
 
     def get_slokas_by_chapter(self, chapter_id: str):
+        snapshot = self.corpus.snapshot()
+        if snapshot is not None:
+            return list(snapshot.slokas_by_chapter.get(chapter_id, []))
         try:
-            result = self.supabase.table('slokas').select('*').eq('chapter_id', chapter_id).order('sloka_number').execute()
-            return result.data
+            return self._coalesced("slokas", self.backend.get_slokas_by_chapter, chapter_id)
         except Exception as e:
             print(f"Error getting slokas for chapter {chapter_id}: {e}")
             return []
 
+    # ---------------- Search ----------------
+    def _search_index(self, snapshot: CorpusSnapshot):
+        """Search indexes for ``snapshot``: reused, loaded from disk, or built and saved"""
+        search = self._search
+        if search is not None and search[0] is snapshot:
+            return search
+        with self._search_lock:
+            if self._search is not None and self._search[0] is snapshot:
+                return self._search
+            slokas = [s for ch in snapshot.chapters for s in snapshot.slokas_by_chapter.get(ch.get('id'), [])]
+            # Hits are keyed by chapter and sloka number, so a saved index stays valid across backends
+            keys = [snapshot.key_of(s) for s in slokas]
+            # Only trust a saved index when we know which corpus version it describes
+            index = SearchIndex.load(SEARCH_INDEX_PATH, snapshot.version) if snapshot.version is not None else None
+            if index is None:
+                index = SearchIndex.build(slokas, snapshot.version, keys)
+                if snapshot.version is not None:
+                    try:
+                        index.save(SEARCH_INDEX_PATH)
+                    except OSError as e:
+                        print(f"Error saving search index: {e}")
+            # The trigram index takes milliseconds to build, so it is never persisted
+            self._search = (snapshot, index, FuzzyIndex(slokas, keys))
+            return self._search
+
+    def search_slokas(self, query: str, limit: int = SEARCH_RESULTS_LIMIT):
+        """Ranked ``{"chapter", "sloka", "score"}`` matches for a Telugu or English query"""
+        snapshot = self.corpus.snapshot()
+        if snapshot is None or not (query or "").strip():
+            return []
+        _, index, _ = self._search_index(snapshot)
+        return self._search_results(snapshot, index.search(query, limit), "score")
+
+    def fuzzy_find_slokas(self, query: str, limit: int = SEARCH_RESULTS_LIMIT):
+        """Verses whose text matches a romanized (or Telugu) query, as ``{"chapter", "sloka", "distance"}``"""
+        snapshot = self.corpus.snapshot()
+        if snapshot is None or not (query or "").strip():
+            return []
+        _, _, fuzzy = self._search_index(snapshot)
+        return self._search_results(snapshot, fuzzy.search(query, limit), "distance")
+
+    @staticmethod
+    def _search_results(snapshot: CorpusSnapshot, hits, rank_field: str):
+        results = []
+        for hit in hits:
+            sloka = snapshot.slokas_by_number.get(hit["id"])
+            if sloka is not None:
+                results.append({
+                    "chapter": snapshot.chapters_by_id.get(sloka.get('chapter_id')),
+                    "sloka": sloka,
+                    rank_field: hit[rank_field],
+                })
+        return results
+
 # Global instance - lazy initialization
 _db_manager_instance = None
+_db_manager_lock = threading.Lock()
 
 def get_db_manager():
     """Get the global database manager instance, creating it if necessary"""
     global _db_manager_instance
     if _db_manager_instance is None:
-        _db_manager_instance = DatabaseManager()
+        with _db_manager_lock:
+            if _db_manager_instance is None:
+                _db_manager_instance = DatabaseManager()
     return _db_manager_instance
 
 # For backward compatibility
@@ -57,4 +144,4 @@ class LazyDBManager:
     def __getattr__(self, name):
         return getattr(get_db_manager(), name)
 
-db_manager = LazyDBManager()
\ No newline at end of file
+db_manager = LazyDBManager()
@@ -0,0 +1,159 @@
+"""
+Transliteration-tolerant lookup of slokas by their verse text.
+
+Telugu script and the many ways people romanize it ("karmanye vadhikaraste",
+"karmaNyevAdhikAraste", "karmanyevaadhikaaraste") are all reduced to one
+lossy Latin *skeleton*: aspiration, vowel length, retroflex/dental and
+sibilant distinctions are dropped, doubled letters collapse and nasals
+before consonants become ``n``. Word breaks are removed too, since sandhi
+joins words in the verse that users type apart.
+
+Candidates come from a character-trigram index over each sloka's skeleton
+and are ranked by the edit distance between the query and the closest
+substring of the verse, computed a query character at a time with NumPy and
+abandoned once every column exceeds the distance bound.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_NGRAM = 3
+_MAX_CANDIDATES = 40
+_MAX_ERROR_RATIO = 0.3  # edit distance allowed per query character
+
+_VIRAMA = "్"
+# Telugu consonants -> skeleton letters (aspirates, retroflexes and sibilants merged)
+_CONSONANTS = dict(zip(
+    "కఖగఘఙచఛజఝఞటఠడఢణతథదధనపఫబభమయరఱలళవశషసహ",
+    ["k", "k", "g", "g", "n", "c", "c", "j", "j", "n", "t", "t", "d", "d", "n", "t", "t", "d", "d", "n",
+     "p", "p", "b", "b", "m", "y", "r", "r", "l", "l", "v", "s", "s", "s", "h"],
+))
+# Independent vowels and vowel signs, short and long merged
+_VOWELS = {
+    "అ": "a", "ఆ": "a", "ఇ": "i", "ఈ": "i", "ఉ": "u", "ఊ": "u", "ఋ": "ri", "ౠ": "ri",
+    "ఎ": "e", "ఏ": "e", "ఐ": "ai", "ఒ": "o", "ఓ": "o", "ఔ": "au",
+}
+_VOWEL_SIGNS = {
+    "ా": "a", "ి": "i", "ీ": "i", "ు": "u", "ూ": "u", "ృ": "ri", "ౄ": "ri",
+    "ె": "e", "ే": "e", "ై": "ai", "ొ": "o", "ో": "o", "ౌ": "au",
+}
+_ANUSVARA = "ం"
+_VISARGA = "ః"
+
+# Romanization spellings folded onto the skeleton alphabet (longest first)
+_ROMAN_RULES = [
+    ("chh", "c"), ("ksh", "ks"), ("kh", "k"), ("gh", "g"), ("ch", "c"), ("jh", "j"), ("th", "t"),
+    ("dh", "d"), ("ph", "p"), ("bh", "b"), ("sh", "s"), ("aa", "a"), ("ee", "i"), ("ii", "i"),
+    ("oo", "u"), ("uu", "u"), ("w", "v"), ("x", "ks"), ("z", "j"), ("q", "k"), ("f", "p"),
+]
+_ROMAN_RE = re.compile("|".join(re.escape(src) for src, _ in _ROMAN_RULES))
+_ROMAN_MAP = dict(_ROMAN_RULES)
+_NASAL_RE = re.compile(r"[mn](?=[^aeiou])")
+_REPEAT_RE = re.compile(r"(.)\1+")
+_HINT_RE = re.compile(r"\([\u0c00-\u0c7f]{1,4}\)")
+
+
+def _telugu_to_latin(text: str) -> str:
+    out = []
+    chars = list(text)
+    for i, ch in enumerate(chars):
+        if ch in _CONSONANTS:
+            out.append(_CONSONANTS[ch])
+            nxt = chars[i + 1] if i + 1 < len(chars) else ""
+            if nxt != _VIRAMA and nxt not in _VOWEL_SIGNS:
+                out.append("a")  # inherent vowel
+        elif ch in _VOWEL_SIGNS:
+            out.append(_VOWEL_SIGNS[ch])
+        elif ch in _VOWELS:
+            out.append(_VOWELS[ch])
+        elif ch == _ANUSVARA:
+            out.append("m")
+        elif ch == _VISARGA or ch == _VIRAMA:
+            continue
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def skeleton(text: str) -> str:
+    """Script- and spelling-independent form of Telugu or romanized text"""
+    if not text:
+        return ""
+    text = _HINT_RE.sub("", unicodedata.normalize("NFC", text))
+    text = _telugu_to_latin(text)
+    # Strip IAST/ISO diacritics (ā -> a, ṇ -> n, ś -> s) and case
+    text = "".join(c for c in unicodedata.normalize("NFD", text.casefold()) if not unicodedata.combining(c))
+    text = _ROMAN_RE.sub(lambda m: _ROMAN_MAP[m.group(0)], text)
+    text = re.sub(r"[^a-z]", "", text)
+    text = _NASAL_RE.sub("n", text)
+    # Visarga and final aspirate 'h' are written inconsistently; drop 'h' after vowels too
+    text = re.sub(r"(?<=[aeiou])h(?=[^aeiou]|$)", "", text)
+    return _REPEAT_RE.sub(r"\1", text)
+
+
+def substring_distance(query: str, text: str, max_distance: int) -> int:
+    """Edit distance from ``query`` to its best-matching substring of ``text``.
+
+    Returns ``max_distance + 1`` as soon as the bound can no longer be met.
+    Each DP row's horizontal (insertion) chain is resolved with
+    ``minimum.accumulate`` instead of a loop over ``text``.
+    """
+    if not query:
+        return 0
+    t = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    cols = np.arange(len(t) + 1)
+    row = np.zeros(len(t) + 1, dtype=np.int64)  # free start anywhere in text
+    for ch in query.encode("ascii"):
+        diag = row[:-1] + (t != ch)
+        best = np.empty_like(row)
+        best[0] = row[0] + 1
+        best[1:] = np.minimum(diag, row[1:] + 1)
+        row = np.minimum.accumulate(best - cols) + cols
+        if row.min() > max_distance:
+            return max_distance + 1
+    return int(row.min())
+
+
+class FuzzyIndex:
+    """Trigram index over sloka verse-text skeletons"""
+
+    def __init__(self, slokas: List[Dict], keys: Optional[List[str]] = None):
+        self.doc_ids: List[str] = []
+        self.skeletons: List[str] = []
+        self.grams: Dict[str, List[int]] = {}
+        for doc, sloka in enumerate(slokas):
+            text = sloka.get("sloka_text_telugu") or sloka.get("sloka_text") or ""
+            skel = skeleton(text)
+            self.doc_ids.append(keys[doc] if keys is not None else str(sloka.get("id")))
+            self.skeletons.append(skel)
+            for gram in {skel[i:i + _NGRAM] for i in range(len(skel) - _NGRAM + 1)}:
+                self.grams.setdefault(gram, []).append(doc)
+
+    def _candidates(self, query: str) -> List[Tuple[int, int]]:
+        counts: Dict[int, int] = {}
+        for gram in {query[i:i + _NGRAM] for i in range(len(query) - _NGRAM + 1)}:
+            for doc in self.grams.get(gram, ()):
+                counts[doc] = counts.get(doc, 0) + 1
+        return sorted(counts.items(), key=lambda item: item[1], reverse=True)[:_MAX_CANDIDATES]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Closest verses as ``{"id", "distance"}``, best first"""
+        q = skeleton(query)
+        if len(q) < _NGRAM:
+            return []
+        bound = max(1, int(len(q) * _MAX_ERROR_RATIO))
+        hits = []
+        for doc, shared in self._candidates(q):
+            distance = substring_distance(q, self.skeletons[doc], bound)
+            if distance <= bound:
+                hits.append((distance, -shared, doc))
+                if len(hits) >= limit:
+                    # Later candidates only matter if they beat the current worst of the top ``limit``
+                    hits.sort()
+                    del hits[limit:]
+                    bound = hits[-1][0]
+        hits.sort()
+        return [{"id": self.doc_ids[doc], "distance": distance} for distance, _, doc in hits[:limit]]
@@ -0,0 +1,142 @@
+"""
+In-process full-text index over sloka text and meanings.
+
+Tokens are NFC-normalised, case-folded runs of letters, digits and
+Indic combining marks, so Telugu words stay whole across vowel signs and
+viramas. The short sandhi hints printed inside sloka text (``మాం(న్)``)
+are dropped before tokenising. Documents are ranked with BM25 over the
+field-weighted term counts; every query token also matches vocabulary
+terms it is a prefix of (found by bisecting the sorted vocabulary), which
+suits Telugu's long inflected forms and search-as-you-type.
+
+The index is persisted as JSON with the corpus version it was built from
+and reused while that version is current.
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+import tempfile
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+_FORMAT_VERSION = 2  # 2: documents keyed by sloka_key instead of row id
+
+# Letters/digits plus Telugu and Devanagari combining marks (vowel signs, virama, anusvara...)
+_TOKEN_RE = re.compile(
+    r"(?:[^\W_]|[\u0c00-\u0c04\u0c3c-\u0c56\u0c62\u0c63\u0900-\u0903\u093a-\u094f\u0951-\u0957\u0962\u0963])+"
+)
+# Sandhi hints like (న్) or (స్): a few Telugu characters in brackets with no spaces
+_HINT_RE = re.compile(r"\([\u0c00-\u0c7f]{1,4}\)")
+_JOINERS = dict.fromkeys(map(ord, "\u200c\u200d"))
+
+# Field name(s) in the row -> weight of a term occurrence in that field
+FIELDS = (
+    (("sloka_text_telugu", "sloka_text"), 1.5),
+    (("meaning_telugu",), 1.0),
+    (("meaning_english",), 1.0),
+)
+
+_K1 = 1.2
+_B = 0.75
+_PREFIX_WEIGHT = 0.7  # a prefix match counts a bit less than the exact word
+_MAX_EXPANSIONS = 64
+
+
+def tokenize(text: Optional[str], strip_hints: bool = False) -> List[str]:
+    """Split text into normalised search tokens (pure numbers are dropped)"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFC", text).translate(_JOINERS)
+    if strip_hints:
+        text = _HINT_RE.sub("", text)
+    return [token for token in _TOKEN_RE.findall(text.casefold()) if not token.isdigit()]
+
+
+class SearchIndex:
+    """BM25 inverted index keyed by sloka id"""
+
+    def __init__(self, doc_ids: List[str], doc_lengths: List[float], postings: Dict[str, List[List]], version: Any = None):
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.postings = postings
+        self.version = version
+        self.vocabulary = sorted(postings)
+        self.avg_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 0.0
+        n = len(doc_ids)
+        self.idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for term, p in postings.items()}
+
+    @classmethod
+    def build(cls, slokas: List[Dict], version: Any = None, keys: Optional[List[str]] = None) -> "SearchIndex":
+        """Index ``slokas``; hits are reported by ``keys`` (one per sloka) or, without them, row id"""
+        doc_ids, doc_lengths = [], []
+        postings: Dict[str, Dict[int, float]] = {}
+        for doc, sloka in enumerate(slokas):
+            length = 0.0
+            for names, weight in FIELDS:
+                text = next((sloka.get(name) for name in names if sloka.get(name)), None)
+                for token in tokenize(text, strip_hints=names[0] == "sloka_text_telugu"):
+                    entry = postings.setdefault(token, {})
+                    entry[doc] = entry.get(doc, 0.0) + weight
+                    length += weight
+            doc_ids.append(keys[doc] if keys is not None else str(sloka.get("id")))
+            doc_lengths.append(length)
+        compact = {term: [[doc, tf] for doc, tf in docs.items()] for term, docs in postings.items()}
+        return cls(doc_ids, doc_lengths, compact, version)
+
+    def _expand(self, token: str) -> Dict[str, float]:
+        """Vocabulary terms matching ``token`` exactly or as a prefix, with their weights"""
+        terms = {}
+        start = bisect.bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + _MAX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms[term] = 1.0 if term == token else _PREFIX_WEIGHT
+        return terms
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Best matching ``{"id", "score"}`` documents, highest score first"""
+        scores: Dict[int, float] = {}
+        for token in dict.fromkeys(tokenize(query)):
+            # Each query token contributes its best-matching expansion per document
+            best: Dict[int, float] = {}
+            for term, weight in self._expand(token).items():
+                idf = self.idf[term]
+                for doc, tf in self.postings[term]:
+                    norm = tf + _K1 * (1 - _B + _B * self.doc_lengths[doc] / (self.avg_length or 1.0))
+                    value = weight * idf * tf * (_K1 + 1) / norm
+                    if value > best.get(doc, 0.0):
+                        best[doc] = value
+            for doc, value in best.items():
+                scores[doc] = scores.get(doc, 0.0) + value
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{"id": self.doc_ids[doc], "score": round(score, 4)} for doc, score in ranked]
+
+    # ---------------- Persistence ----------------
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        payload = {
+            "format": _FORMAT_VERSION,
+            "version": json.dumps(self.version, default=str),
+            "doc_ids": self.doc_ids,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, version: Any = None) -> Optional["SearchIndex"]:
+        """Saved index at ``path`` if it was built from corpus ``version``, else None"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if payload.get("format") != _FORMAT_VERSION or payload.get("version") != json.dumps(version, default=str):
+            return None
+        return cls(payload["doc_ids"], payload["doc_lengths"], payload["postings"], version)
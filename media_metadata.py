@@ -0,0 +1,58 @@
+"""
+Naming conventions for contributed recordings.
+
+``build_media_metadata`` produces the filename, title and description the
+upload UI sends with a recitation or explanation;
+``parse_recording_filename`` reads chapter, sloka and kind back out of
+filenames that follow it (or the shorter forms contributors tend to use),
+so bulk ingestion maps files onto slokas the same way.
+"""
+
+import re
+from typing import Optional, Tuple
+
+KINDS = ("recitation", "explanation")
+
+# ch2_sloka47_recitation_x.wav, chapter-2_sloka-47.mp3, ch02_s047.wav
+_NAMED_RE = re.compile(r"ch(?:apter)?[\s_-]*(\d{1,2})[\s._-]*s(?:loka)?[\s_-]*(\d{1,3})(?!\d)", re.IGNORECASE)
+# 2_47.wav, 02-047 recitation.mp3, 2.47.wav
+_NUMERIC_RE = re.compile(r"^(\d{1,2})[\s._-]+(\d{1,3})(?!\d)")
+
+
+def slugify(text: str) -> str:
+    try:
+        text = re.sub(r"[^A-Za-z0-9]+", "-", text or "").strip("-")
+        return text.lower() or "untitled"
+    except Exception:
+        return "untitled"
+
+
+def build_media_metadata(selected_chapter: dict, selected_sloka: dict, user_id: str, kind: str, original_filename: Optional[str] = None) -> Tuple[str, str, str]:
+    """Return (filename, title, description) for recitation/explanation.
+    kind: 'recitation' | 'explanation'
+    """
+    chapter_num = selected_chapter.get('chapter_number')
+    chapter_name = selected_chapter.get('chapter_name', '')
+    sloka_num = selected_sloka.get('sloka_number')
+    base = f"ch{chapter_num}_sloka{sloka_num}_{kind}"
+    # preserve extension if provided, else default wav
+    ext = None
+    if original_filename and "." in original_filename:
+        ext = "." + original_filename.rsplit(".", 1)[-1].lower()
+    if not ext:
+        ext = ".wav"
+    filename = f"{base}_{slugify(str(user_id))}{ext}"
+    title = f"Sloka {sloka_num} {kind.capitalize()} - Chapter {chapter_num}"
+    description = f"{kind.capitalize()} audio of sloka {sloka_num} from adhyaya {chapter_num} ({chapter_name})"
+    return filename, title, description
+
+
+def parse_recording_filename(name: str, default_kind: str = "recitation") -> Optional[Tuple[int, int, str]]:
+    """``(chapter_number, sloka_number, kind)`` encoded in a file name, or None"""
+    stem = name.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+    match = _NAMED_RE.search(stem) or _NUMERIC_RE.match(stem)
+    if not match:
+        return None
+    lowered = stem.lower()
+    kind = next((k for k in KINDS if k in lowered), default_kind)
+    return int(match.group(1)), int(match.group(2)), kind
@@ -0,0 +1,70 @@
+"""
+Background prefetching of reference audio for neighbouring slokas.
+
+Readers step through a chapter sequentially, so when a sloka is shown the
+previous/next slokas' reference MP3s are fetched in the background into the
+on-disk ``ReferenceAudioCache``. Sloka text needs no prefetching: it is
+already served from the process-wide corpus cache in ``DatabaseManager``.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import PREFETCH_RADIUS, PREFETCH_WORKERS
+from reference_audio_cache import ReferenceAudioCache, get_reference_audio_cache
+
+
+class AudioPrefetcher:
+    """Fills the reference audio cache from background threads"""
+
+    def __init__(self, cache: Optional[ReferenceAudioCache] = None, max_workers: int = PREFETCH_WORKERS):
+        self.cache = cache or get_reference_audio_cache()
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-prefetch")
+
+    def get(self, url: str) -> Optional[str]:
+        """Local path of the cached audio for ``url``, or None if it hasn't been fetched yet"""
+        return self.cache.cached_path(url)
+
+    def _download(self, url: str):
+        try:
+            self.cache.path_for(url)
+        except Exception as e:
+            print(f"Prefetch failed for {url}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(url)
+
+    def prefetch(self, urls: List[str]):
+        """Schedule background fetches (or revalidations) for urls not already in flight"""
+        for url in urls:
+            if not url:
+                continue
+            with self._lock:
+                if url in self._in_flight:
+                    continue
+                self._in_flight.add(url)
+            self._executor.submit(self._download, url)
+
+    def prefetch_neighbours(self, slokas: List[Dict], index: int, radius: int = PREFETCH_RADIUS):
+        """Warm the shown sloka's audio and that of ``radius`` slokas either side (next first)"""
+        order = [index]
+        for step in range(1, radius + 1):
+            order.extend([index + step, index - step])
+        self.prefetch([slokas[i].get('reference_audio_url') for i in order if 0 <= i < len(slokas)])
+
+
+_prefetcher_instance = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_audio_prefetcher() -> AudioPrefetcher:
+    """Get the process-wide prefetcher, creating it if necessary"""
+    global _prefetcher_instance
+    if _prefetcher_instance is None:
+        with _prefetcher_lock:
+            if _prefetcher_instance is None:
+                _prefetcher_instance = AudioPrefetcher()
+    return _prefetcher_instance
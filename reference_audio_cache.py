@@ -0,0 +1,205 @@
+"""
+Disk-backed LRU cache for reference audio.
+
+Reference MP3s live in remote storage and rarely change, so each one is
+downloaded once, stored under ``AUDIO_CACHE_DIR`` keyed by URL + ETag and
+served to ``st.audio`` from local disk. Entries are revalidated with a
+conditional GET (``If-None-Match`` / ``If-Modified-Since``) once they are
+older than ``AUDIO_CACHE_REVALIDATE_SECONDS``, and the least recently used
+files are evicted when the cache grows past ``AUDIO_CACHE_MAX_BYTES``.
+
+Several processes share the directory (every Streamlit worker, the feature
+build CLI). Each merges the entries the others wrote into ``index.json``
+before saving, and a cached file is checked to still exist before its path
+is handed out, since another process's eviction may have removed it.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import (
+    API_TIMEOUT,
+    AUDIO_CACHE_DIR,
+    AUDIO_CACHE_MAX_BYTES,
+    AUDIO_CACHE_REVALIDATE_SECONDS,
+)
+
+_INDEX_FILE = "index.json"
+_DOWNLOAD_BLOCK = 64 * 1024
+
+
+class ReferenceAudioCache:
+    """Size-capped on-disk cache of remote audio files"""
+
+    def __init__(self, directory: str = AUDIO_CACHE_DIR, max_bytes: int = AUDIO_CACHE_MAX_BYTES,
+                 revalidate_after: float = AUDIO_CACHE_REVALIDATE_SECONDS, session: requests.Session = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.session = session or requests.Session()
+        if session is None:
+            self.session.mount("https://", HTTPAdapter(pool_maxsize=4))
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._index: Dict[str, Dict] = self._load_index()
+
+    # ---------------- Index ----------------
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(os.path.join(self.directory, _INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose files were removed behind our back
+        return {url: e for url, e in index.items() if os.path.exists(os.path.join(self.directory, e["file"]))}
+
+    def _save_index(self):
+        """Merge in entries other processes saved, evict to fit, then write the index (call with the lock held)"""
+        for url, entry in self._load_index().items():
+            ours = self._index.get(url)
+            if ours is None or entry["checked_at"] > ours["checked_at"]:
+                self._index[url] = entry
+        self._index = {url: e for url, e in self._index.items() if os.path.exists(self._path(e))}
+        self._evict()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, os.path.join(self.directory, _INDEX_FILE))
+
+    @staticmethod
+    def _file_name(url: str, etag: Optional[str]) -> str:
+        url_key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        etag_key = hashlib.sha256((etag or "").encode("utf-8")).hexdigest()[:8]
+        ext = os.path.splitext(url.split("?", 1)[0])[1][:8] or ".bin"
+        return f"{url_key}-{etag_key}{ext}"
+
+    def _path(self, entry: Dict) -> str:
+        return os.path.join(self.directory, entry["file"])
+
+    # ---------------- Reads ----------------
+    def cached_path(self, url: str) -> Optional[str]:
+        """Local path for ``url`` if it is cached; never touches the network"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None:
+                return None
+            path = self._path(entry)
+            if not os.path.exists(path):
+                # Evicted by another process sharing the directory
+                del self._index[url]
+                return None
+            entry["last_access"] = time.time()
+            return path
+
+    def etag(self, url: str) -> Optional[str]:
+        """ETag the cached copy of ``url`` was stored under, if any"""
+        with self._lock:
+            entry = self._index.get(url)
+            return entry.get("etag") if entry else None
+
+    def path_for(self, url: str, revalidate: bool = False) -> Optional[str]:
+        """Local path for ``url``, downloading or revalidating it first when needed.
+
+        ``revalidate`` forces the conditional GET even for a fresh entry.
+        Returns the stale copy if revalidation fails, and None if the file
+        was never fetched and cannot be downloaded.
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        if entry is not None and not os.path.exists(self._path(entry)):
+            entry = None  # evicted by another process; download it again
+        if entry is not None and not revalidate and time.time() - entry["checked_at"] < self.revalidate_after:
+            return self.cached_path(url)
+
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            with self.session.get(url, headers=headers, timeout=API_TIMEOUT, stream=True) as response:
+                if response.status_code == 304 and entry is not None:
+                    with self._lock:
+                        entry["checked_at"] = time.time()
+                        self._save_index()
+                    return self.cached_path(url)
+                if response.status_code != 200:
+                    print(f"Reference audio fetch failed ({response.status_code}): {url}")
+                    return self.cached_path(url)
+                return self._store(url, response)
+        except requests.RequestException as e:
+            print(f"Reference audio fetch failed for {url}: {e}")
+            return self.cached_path(url)
+
+    # ---------------- Writes ----------------
+    def _store(self, url: str, response: requests.Response) -> str:
+        etag = response.headers.get("ETag")
+        file_name = self._file_name(url, etag)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for block in response.iter_content(_DOWNLOAD_BLOCK):
+                    f.write(block)
+                    size += len(block)
+            os.replace(tmp_path, os.path.join(self.directory, file_name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        now = time.time()
+        with self._lock:
+            old = self._index.get(url)
+            if old is not None and old["file"] != file_name:
+                self._remove_file(old)
+            self._index[url] = {
+                "file": file_name,
+                "etag": etag,
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": size,
+                "checked_at": now,
+                "last_access": now,
+            }
+            self._save_index()
+            entry = self._index.get(url)
+        return self._path(entry) if entry else None
+
+    def _remove_file(self, entry: Dict):
+        try:
+            os.remove(self._path(entry))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Drop least recently used files until the cache fits in ``max_bytes``"""
+        total = sum(e["size"] for e in self._index.values())
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            self._remove_file(entry)
+            del self._index[url]
+            total -= entry["size"]
+
+
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_reference_audio_cache() -> ReferenceAudioCache:
+    """Get the process-wide reference audio cache, creating it if necessary"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = ReferenceAudioCache()
+    return _cache_instance
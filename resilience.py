@@ -0,0 +1,224 @@
+"""
+Retries, backoff and circuit breaking for calls to the Swecha API.
+
+``resilient_request`` wraps one ``requests`` call:
+
+- Attempts are retried with full-jitter exponential backoff (a random delay
+  up to ``base * 2**attempt``, capped, or the server's ``Retry-After``) so
+  clients that failed together don't retry together.
+- Only requests that are safe to repeat are retried after the server may
+  have acted on them: idempotent methods, and POSTs the caller marks
+  idempotent (chunk uploads, keyed by upload uuid and index). Other POSTs
+  (logins, OTPs, record creation) are retried only when the request never
+  reached the server: a connect timeout, or a 429/503 rejection.
+- Every endpoint has a circuit breaker shared by the whole process. After
+  ``API_BREAKER_FAILURES`` consecutive transport errors or 5xx/429 replies
+  it opens and calls fail fast with ``CircuitOpenError`` for
+  ``API_BREAKER_RESET_SECONDS``; then a single probe request decides
+  whether it closes again. A degraded backend therefore sees one request per
+  endpoint per reset period from this app server, not one per rerun of
+  every session.
+"""
+
+import asyncio
+import random
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type
+
+import requests
+
+from config import (
+    API_BREAKER_FAILURES,
+    API_BREAKER_RESET_SECONDS,
+    API_RETRY_ATTEMPTS,
+    API_RETRY_BACKOFF,
+    API_RETRY_MAX_DELAY,
+)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Statuses meaning the request was turned away without being processed
+REJECTED_STATUSES = frozenset({429, 503})
+
+# Path segments that are ids (uuids, numbers) are folded so /users/<id>/... shares one breaker
+_ID_SEGMENT_RE = re.compile(r"/(?:[0-9a-fA-F-]{16,}|\d+)(?=/|$)")
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request while its endpoint's circuit is open"""
+
+
+class RetryPolicy:
+    """How many times, and after how long, a failed request is retried"""
+
+    def __init__(self, attempts: int = API_RETRY_ATTEMPTS, base_delay: float = API_RETRY_BACKOFF,
+                 max_delay: float = API_RETRY_MAX_DELAY):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def should_retry(self, idempotent: bool, response: Optional[requests.Response] = None,
+                     error: Optional[Exception] = None) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        if error is not None:
+            # A connect timeout never reached the server; anything else might have
+            return idempotent or isinstance(error, requests.ConnectTimeout)
+        if response is None:
+            return False
+        status = response.status_code
+        return status in REJECTED_STATUSES or (idempotent and status in RETRYABLE_STATUSES)
+
+    def delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``"""
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = API_BREAKER_FAILURES,
+                 reset_timeout: float = API_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the probe when half-open)"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record(self, failed: bool):
+        with self._lock:
+            if not failed:
+                self.state = self.CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"Circuit opened for {self.name} after {self.failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"name": self.name, "state": self.state, "failures": self.failures}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def endpoint_key(method: str, endpoint: str) -> str:
+    """Breaker name for a request, e.g. ``GET /users/*/contributions``"""
+    path = endpoint.split("?", 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT_RE.sub('/*', path)}"
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Process-wide breaker for an endpoint, created on first use"""
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def _is_failure(response: Optional[requests.Response], error: Optional[Exception]) -> bool:
+    if error is not None:
+        return True
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def resilient_request(send: Callable[[], requests.Response], method: str, endpoint: str,
+                      idempotent: Optional[bool] = None, policy: Optional[RetryPolicy] = None) -> requests.Response:
+    """Run ``send`` under the endpoint's circuit breaker with retries.
+
+    Returns the last response (which may still be an error status) or
+    raises the last ``requests`` exception, so callers keep their usual
+    error handling. ``idempotent`` defaults to whether ``method`` is.
+    """
+    policy = policy or _default_policy
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    breaker = get_circuit_breaker(endpoint_key(method, endpoint))
+
+    for attempt in range(policy.attempts):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} is temporarily unavailable (circuit open)")
+        response, error = None, None
+        try:
+            response = send()
+        except requests.RequestException as e:
+            error = e
+        except Exception:
+            breaker.record(True)  # never leave a half-open probe unresolved
+            raise
+        breaker.record(_is_failure(response, error))
+
+        last_attempt = attempt == policy.attempts - 1
+        if last_attempt or not _is_failure(response, error) or not policy.should_retry(idempotent, response, error):
+            if error is not None:
+                raise error
+            return response
+        time.sleep(policy.delay(attempt, response))
+
+
+async def resilient_request_async(send: Callable[[], Awaitable], method: str, endpoint: str,
+                                  idempotent: Optional[bool] = None, policy: Optional[RetryPolicy] = None,
+                                  errors: Tuple[Type[Exception], ...] = (requests.RequestException,)):
+    """Coroutine form of ``resilient_request`` for async HTTP clients.
+
+    Shares the same breakers and policy; ``errors`` are the client's
+    transport exceptions (e.g. ``httpx.HTTPError``). Backoff sleeps yield
+    to the event loop.
+    """
+    policy = policy or _default_policy
+    if idempotent is None:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+    breaker = get_circuit_breaker(endpoint_key(method, endpoint))
+
+    for attempt in range(policy.attempts):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{breaker.name} is temporarily unavailable (circuit open)")
+        response, error = None, None
+        try:
+            response = await send()
+        except errors as e:
+            error = e
+        except BaseException:
+            breaker.record(True)  # includes cancellation mid-probe
+            raise
+        breaker.record(_is_failure(response, error))
+
+        last_attempt = attempt == policy.attempts - 1
+        if last_attempt or not _is_failure(response, error) or not policy.should_retry(idempotent, response, error):
+            if error is not None:
+                raise error
+            return response
+        await asyncio.sleep(policy.delay(attempt, response))
+
+
+_default_policy = RetryPolicy()
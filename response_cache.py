@@ -0,0 +1,72 @@
+"""
+Size-bounded TTL cache for slow-changing Swecha API reads.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from config import API_CACHE_MAX_ENTRIES, API_CACHE_TTLS
+
+
+class ResponseCache:
+    """LRU cache whose entries expire after a per-endpoint TTL.
+
+    Keys are tuples whose first element names the endpoint (e.g.
+    ``("categories", token)``); ``ttls`` maps those names to lifetimes in
+    seconds and endpoints without a TTL are not cached. Values are deep-copied
+    on the way in and out so callers can mutate what they get back.
+    """
+
+    def __init__(self, max_entries: int = API_CACHE_MAX_ENTRIES, ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.ttls = dict(API_CACHE_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        if ttl is None:
+            ttl = self.ttls.get(key[0], 0)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Drop every entry for ``endpoint``, or everything when omitted"""
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[0] == endpoint]:
+                del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class NullCache(ResponseCache):
+    """Cache that stores nothing, for callers that always want fresh reads"""
+
+    def __init__(self):
+        super().__init__(max_entries=0, ttls={})
@@ -0,0 +1,94 @@
+"""
+Coalescing of concurrent identical reads ("single flight").
+
+When many sessions ask for the same thing at once (a class of students
+logging in together all load chapters, slokas and categories), only the
+first caller for a key runs the upstream call; callers that arrive while it
+is in flight wait for it and get the same result, or the same exception.
+Nothing is kept once the call returns: caching stays the job of
+``CorpusCache`` and ``ResponseCache``, this only collapses the overlap.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters receive"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and fans its outcome out"""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, or the result of the identical call already in flight.
+
+        Waiters get deep copies so no two callers share a mutable result.
+        """
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            try:
+                # Once the key is retired no new waiters can join, so the count is final
+                with self._lock:
+                    del self._in_flight[key]
+                    has_waiters = call.waiters > 0
+                if call.error is None and has_waiters:
+                    # Waiters copy from a snapshot taken before our caller can mutate the result
+                    call.result = copy.deepcopy(result)
+            except Exception as e:
+                # An uncopyable result (e.g. rows holding an open file) fails the waiters, not the leader
+                call.error = e
+            finally:
+                call.done.set()
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._in_flight)}
+
+
+_flight_instance = None
+_flight_lock = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    """Get the process-wide group shared by the database manager and API clients"""
+    global _flight_instance
+    if _flight_instance is None:
+        with _flight_lock:
+            if _flight_instance is None:
+                _flight_instance = SingleFlight()
+    return _flight_instance
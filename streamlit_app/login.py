@@ -12,8 +12,19 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from database.backends import sloka_key
 from database.db_utils import get_db_manager
-from api_client import api_client, get_api_client
+from api_client import api_client, get_api_client, reset_api_client
+from prefetch import get_audio_prefetcher
+from audio.analysis import check_recording, trim_wav, wav_duration_seconds
+from audio.pcm import compressed_decoder
+from audio.scoring import get_recitation_scorer
+from audio.transcode import transcode_for_upload
+from upload_queue import get_upload_queue, QUEUED, DONE, FAILED
+from upload_dedup import get_dedup_index, UPLOADED
+from upload_manifest import sha256_hex
+from config import UPLOAD_QUEUE_POLL_SECONDS
+from media_metadata import build_media_metadata as _build_media_metadata
 
 # Optional dependencies for in-app recording (prefer audio-recorder-streamlit)
 _RECORDING_AVAILABLE = False
@@ -43,44 +54,7 @@ TEST_LOGIN_OTP = os.getenv("TEST_LOGIN_OTP", "123456")
 db_manager = get_db_manager()
 
 def _compute_wav_duration_seconds(wav_bytes: bytes) -> float:
-    try:
-        import contextlib
-        with contextlib.closing(wave.open(io.BytesIO(wav_bytes), 'rb')) as wf:
-            frames = wf.getnframes()
-            rate = wf.getframerate()
-            if rate > 0:
-                return round(frames / float(rate), 2)
-    except Exception:
-        pass
-    return 0.0
-
-def _slugify(text: str) -> str:
-    try:
-        import re
-        text = re.sub(r"[^A-Za-z0-9]+", "-", text or "").strip("-")
-        return text.lower() or "untitled"
-    except Exception:
-        return "untitled"
-
-def _build_media_metadata(selected_chapter: dict, selected_sloka: dict, user_id: str, kind: str, original_filename: str | None = None) -> tuple[str, str, str]:
-    """Return (filename, title, description) for recitation/explanation.
-    kind: 'recitation' | 'explanation'
-    """
-    chapter_num = selected_chapter.get('chapter_number')
-    chapter_name = selected_chapter.get('chapter_name', '')
-    sloka_num = selected_sloka.get('sloka_number')
-    safe_ch_name = _slugify(str(chapter_name))
-    base = f"ch{chapter_num}_sloka{sloka_num}_{kind}"
-    # preserve extension if provided, else default wav
-    ext = None
-    if original_filename and "." in original_filename:
-        ext = "." + original_filename.rsplit(".", 1)[-1].lower()
-    if not ext:
-        ext = ".wav"
-    filename = f"{base}_{_slugify(str(user_id))}{ext}"
-    title = f"Sloka {sloka_num} {kind.capitalize()} - Chapter {chapter_num}"
-    description = f"{kind.capitalize()} audio of sloka {sloka_num} from adhyaya {chapter_num} ({chapter_name})"
-    return filename, title, description
+    return wav_duration_seconds(wav_bytes)
 
 def init_session_state():
     if 'user_id' not in st.session_state:
@@ -110,6 +84,18 @@ def init_session_state():
 
     # No cookie-based restore
 
+def _backend_failure_message(response: dict) -> Optional[str]:
+    """Message for a request the backend never answered or couldn't serve, else None"""
+    status_code = response.get('status_code')
+    error_data = response.get('data') or {}
+    if status_code is None:
+        return "⚠️ Could not reach the server. Please check your internet connection and try again."
+    if status_code == 503:
+        return "⚠️ The service is temporarily unavailable. Please try again in a minute."
+    if status_code == 500 or (isinstance(error_data, dict) and error_data.get('detail') == "Internal server error"):
+        return "⚠️ Internal server error from backend. Please try again later or contact support."
+    return None
+
 def handle_send_otp(phone_number):
     try:
         response = api_client.send_signup_otp(phone_number)
@@ -122,8 +108,9 @@ def handle_send_otp(phone_number):
         else:
             error_data = response.get('data', {})
             status_code = response.get('status_code', 'Unknown')
-            if status_code == 500 or error_data.get('detail') == "Internal server error":
-                st.error("⚠️ Internal server error from backend. Please try again later or contact support.")
+            failure = _backend_failure_message(response)
+            if failure:
+                st.error(failure)
                 with st.expander("Debug Information"):
                     st.json(response)
             else:
@@ -153,10 +140,9 @@ def handle_verify_signup(phone_number, otp_code, name, email, password):
             return True
         else:
             error_msg = response.get('data', {}).get('message', 'Invalid OTP or details')
-            status_code = response.get('status_code', 'Unknown')
-            error_data = response.get('data', {})
-            if status_code == 500 or error_data.get('detail') == "Internal server error":
-                st.error("⚠️ Internal server error from backend. Please try again later or contact support.")
+            failure = _backend_failure_message(response)
+            if failure:
+                st.error(failure)
                 with st.expander("Signup Debug Info"):
                     st.json(response)
             else:
@@ -416,8 +402,7 @@ def show_main_app():
 
         # Logout button with better styling
         if st.button("🚪 Logout", use_container_width=True):
-            api_client.auth_token = None
-            api_client.user_data = None
+            reset_api_client()
             for key in ['user_id', 'user_name', 'user_phone', 'user_email', 'logged_in']:
                 if key in st.session_state:
                     del st.session_state[key]
@@ -454,10 +439,15 @@ def show_main_app():
 
                 # Reference Audio at the top
                 st.subheader("📻 Reference Audio")
+                prefetcher = get_audio_prefetcher()
                 if selected_sloka.get('reference_audio_url'):
-                    st.audio(selected_sloka['reference_audio_url'], format='audio/mp3')
+                    ref_url = selected_sloka['reference_audio_url']
+                    # Play the locally cached copy; fall back to the remote URL until it is fetched
+                    st.audio(prefetcher.get(ref_url) or ref_url, format='audio/mp3')
                 else:
                     st.info("No reference audio available for this sloka")
+                # Warm the previous/next slokas' audio while this one is read
+                prefetcher.prefetch_neighbours(slokas, list(sloka_options).index(selected_sloka_display))
 
                 st.markdown("---")
 
@@ -506,6 +496,71 @@ def show_main_app():
                 
                 st.markdown("</div>", unsafe_allow_html=True)
 
+def _report_finished_upload(kind: str, job: dict, status: dict):
+    """Record the outcome of a finished upload job as a notice for the next page run"""
+    notices = st.session_state.setdefault(f"{kind}_upload_notices", [])
+    if status['status'] == DONE:
+        # Same record the synchronous flow used to keep for persistence
+        st.session_state[f"last_{kind}_upload"] = {
+            'timestamp': st.session_state.get('upload_timestamp', ''),
+            'title': job['title'],
+            'category': job['category'],
+        }
+        # The worker uploaded with its own client, so this session's cached contributions are stale
+        get_api_client().cache.invalidate("contributions")
+        if (status.get('result') or {}).get('duplicate'):
+            notices.append(('info', f"✅ {job['title']} was already uploaded earlier, so it wasn't sent again.", None))
+        else:
+            notices.append(('success', f"✅ {kind.capitalize()} uploaded successfully: {job['title']}", None))
+    else:
+        notices.append(('error', f"Upload failed: {status.get('error') or 'Unknown error'}", {
+            'job_id': job['job_id'],
+            'attempts': status['attempts'],
+            'filename': job['filename'],
+            'bytes': status['total_bytes'],
+        }))
+
+
+def _render_upload_notices(kind: str):
+    """Show (once) the outcome of upload jobs that finished since the last run"""
+    for level, message, details in st.session_state.pop(f"{kind}_upload_notices", []):
+        getattr(st, level)(message)
+        if details:
+            with st.expander("Show upload details"):
+                st.write(details)
+
+
+@st.fragment(run_every=UPLOAD_QUEUE_POLL_SECONDS)
+def _render_upload_jobs(kind: str):
+    """Poll the upload queue and show progress for this session's active uploads.
+
+    Finished jobs are reported once and dropped; the page is then rerun so the
+    outcome is shown and, once no job is left, this polling fragment is no
+    longer rendered.
+    """
+    jobs = st.session_state.get(f"{kind}_upload_jobs") or []
+    statuses = {job['id']: job for job in get_upload_queue().statuses([j['job_id'] for j in jobs])}
+    active = []
+    for job in jobs:
+        status = statuses.get(job['job_id'])
+        if status is None:
+            continue  # purged from the queue
+        if status['status'] in (DONE, FAILED):
+            _report_finished_upload(kind, job, status)
+            continue
+        active.append(job)
+        total = status['total_chunks'] or 1
+        rate_kb = status['bytes_per_sec'] / 1024
+        label = "Queued" if status['status'] == QUEUED else f"Uploading ({rate_kb:.0f} KB/s)"
+        st.progress(
+            status['chunks_done'] / total,
+            text=f"{label}: {job['title']} — chunk {status['chunks_done']}/{status['total_chunks'] or '?'}",
+        )
+    st.session_state[f"{kind}_upload_jobs"] = active
+    if len(active) < len(jobs):
+        st.rerun()
+
+
 def render_audio_uploader(kind: str, selected_chapter: dict, selected_sloka: dict, api_client, category_options: list):
     """Reusable function for rendering audio upload UI for both recitation and explanation"""
     st.markdown(f"""
@@ -753,6 +808,35 @@ def render_audio_uploader(kind: str, selected_chapter: dict, selected_sloka: dic
         else:
             st.warning("Recording not available. Please install 'audio-recorder-streamlit==0.0.10' and restart the app.")
 
+    # Compare the recitation with the reference audio before uploading
+    if audio_bytes is not None and kind == "recitation" and selected_sloka.get('reference_audio_url'):
+        # Reference recitations are MP3; without a decoder the comparison is switched off, not the app
+        can_compare = compressed_decoder() is not None
+        if not can_compare:
+            st.info("Comparing with the reference recitation is unavailable on this server "
+                    "(it needs soundfile or ffmpeg to read MP3).")
+        if st.button("🎯 Compare with reference", key=f"score_{kind}", use_container_width=True,
+                     disabled=not can_compare):
+            with st.spinner("Comparing with the reference recitation..."):
+                result = get_recitation_scorer().score(
+                    selected_sloka['reference_audio_url'], audio_bytes,
+                    sloka_key=sloka_key(selected_chapter['chapter_number'], selected_sloka['sloka_number']),
+                )
+            if result.get('success'):
+                data = result['data']
+                st.metric("Similarity to reference", f"{data['score']:.0f} / 100",
+                          help=f"Tempo: {data['tempo_ratio']:.2f}× the reference length")
+                st.bar_chart(
+                    {
+                        "Section": [f"{seg['start']:.1f}–{seg['end']:.1f}s" for seg in data['segments']],
+                        "Deviation": [seg['deviation'] for seg in data['segments']],
+                    },
+                    x="Section",
+                    y="Deviation",
+                )
+            else:
+                st.info(f"Comparison unavailable: {result['data'].get('error')}")
+
     # Upload button
     if audio_bytes is not None:
         st.markdown("""
@@ -788,52 +872,58 @@ def render_audio_uploader(kind: str, selected_chapter: dict, selected_sloka: dic
         """, unsafe_allow_html=True)
         
         if st.button(f"🚀 Upload {kind.capitalize()}", key=f"upload_{kind}", use_container_width=True):
+            recording_ok, recording_message, _ = check_recording(audio_bytes)
             if not api_client.auth_token or api_client.auth_token == 'TEST_TOKEN':
                 st.error("You must be signed in with a real account to upload.")
                 with st.expander("Why did this fail?"):
                     st.write("Uploads require a valid backend token. Test mode tokens cannot upload.")
-            elif len(audio_bytes or b"") < 1000:
-                st.error("Recording seems too short or empty. Please record again.")
+            elif not recording_ok:
+                st.error(recording_message)
             elif not category_id:
                 st.error("Please select a category for your upload.")
             else:
-                with st.spinner(f"Uploading {kind} to Swecha Corpus..."):
-                    try:
-                        # Standardize to use audio_data parameter for both types
-                        response = get_api_client().upload_complete_audio(
-                            audio_data=audio_bytes,
-                            filename=final_filename or f"{kind}.wav",
+                if recording_message:
+                    st.warning(recording_message)
+                try:
+                    # Drop dead air, then re-encode the recording (lossless FLAC by default) before it is queued
+                    encoded = transcode_for_upload(trim_wav(audio_bytes), final_filename or f"{kind}.wav")
+                    if encoded.changed:
+                        st.caption(f"🗜️ Upload size {encoded.summary()}")
+                    client = get_api_client()
+                    previous = get_dedup_index().lookup((client.user_data or {}).get('id', ''), sha256_hex(encoded.data))
+                    if previous is not None and previous['status'] == UPLOADED:
+                        st.info("✅ You've already uploaded this recording, so it wasn't sent again.")
+                    elif previous is not None:
+                        st.info("⏳ This recording is already being uploaded.")
+                    else:
+                        # Hand the upload to the background queue so this script run returns immediately
+                        job_id = get_upload_queue().enqueue(
+                            audio_data=encoded.data,
+                            filename=encoded.filename,
                             title=custom_title or title,
                             category_id=category_id,
                             language="telugu",
                             release_rights="creator",
-                            description=custom_description or description
+                            description=custom_description or description,
+                            auth_token=client.auth_token,
+                            user_data=client.user_data,
                         )
-                        if response.get('success'):
-                            st.success(f"✅ {kind.capitalize()} uploaded successfully!")
-                            # Store upload info in session for persistence
-                            upload_key = f"last_{kind}_upload"
-                            st.session_state[upload_key] = {
-                                'timestamp': st.session_state.get('upload_timestamp', ''),
-                                'title': custom_title or title,
-                                'category': selected_category.get('name', 'Unknown') if selected_category else 'Unknown'
-                            }
-                        else:
-                            data = response.get('data', {}) or {}
-                            msg = data.get('message') or data.get('error') or data.get('detail') or 'Unknown error'
-                            st.error(f"Upload failed: {msg}")
-                            with st.expander("Show server response"):
-                                st.write({
-                                    'status_code': response.get('status_code'),
-                                    'data': data,
-                                    'filename': final_filename,
-                                    'bytes': len(audio_bytes or b'')
-                                })
-                    except Exception as e:
-                        st.error(f"Upload error: {str(e)}")
+                        st.session_state.setdefault(f"{kind}_upload_jobs", []).append({
+                            'job_id': job_id,
+                            'title': custom_title or title,
+                            'category': selected_category.get('name', 'Unknown') if category_options and selected_category else 'Unknown',
+                            'filename': encoded.filename,
+                        })
+                        st.info(f"⏳ {kind.capitalize()} queued for upload. You can keep using the app.")
+                except Exception as e:
+                    st.error(f"Upload error: {str(e)}")
         
         st.markdown("</div>", unsafe_allow_html=True)
 
+    _render_upload_notices(kind)
+    if st.session_state.get(f"{kind}_upload_jobs"):
+        _render_upload_jobs(kind)
+
 def main():
     st.set_page_config(
         page_title="Gita Guru",
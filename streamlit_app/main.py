@@ -10,6 +10,7 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from database.db_utils import get_db_manager
+from prefetch import get_audio_prefetcher
 
 # Page configuration
 st.set_page_config(
@@ -204,6 +205,56 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def _chapter_label(chapter):
+    return f"Chapter {chapter['chapter_number']}: {chapter['chapter_name']}"
+
+
+def _open_search_hit(chapter, sloka):
+    """Point the chapter/sloka selectors at a search result"""
+    st.session_state["chapter_select"] = _chapter_label(chapter)
+    st.session_state["sloka_select"] = f"Sloka {sloka['sloka_number']}"
+
+
+def _reset_sloka_select():
+    st.session_state.pop("sloka_select", None)
+
+
+def render_search(db_manager):
+    """Word and romanized-verse search; results jump to the sloka"""
+    st.markdown("""
+    <div class="section-header">
+        <h3>🔍 Search Slokas</h3>
+    </div>
+    """, unsafe_allow_html=True)
+    query = st.text_input(
+        "Search by a Telugu or English word, or type the verse in English letters:",
+        key="sloka_search",
+        placeholder="e.g. భక్తి, devotion or nityayukta upasate",
+    )
+    if not query.strip():
+        return
+    results = db_manager.search_slokas(query)
+    # Romanized verse text ("karmanye vadhikaraste") only matches through the fuzzy lookup
+    seen = {hit['sloka'].get('id') for hit in results}
+    verse_matches = [hit for hit in db_manager.fuzzy_find_slokas(query, 5) if hit['sloka'].get('id') not in seen]
+    if not results and not verse_matches:
+        st.caption("No matching slokas found.")
+        return
+    for group, hits in (("verse", verse_matches), ("search", results)):
+        for i, hit in enumerate(hits):
+            chapter, sloka = hit['chapter'], hit['sloka']
+            if not chapter:
+                continue
+            preview = (sloka.get('meaning_english') or sloka.get('meaning_telugu') or '')[:110]
+            st.button(
+                f"Chapter {chapter['chapter_number']}, Sloka {sloka['sloka_number']} — {preview}",
+                key=f"{group}_hit_{i}",
+                on_click=_open_search_hit,
+                args=(chapter, sloka),
+                use_container_width=True,
+            )
+
+
 def main():
     # Initialize database manager
     db_manager = get_db_manager()
@@ -223,6 +274,8 @@ def main():
         st.error("No chapters found in database. Please check your database connection.")
         return
     
+    render_search(db_manager)
+
     # Chapter selection
     st.markdown("""
     <div class="section-header">
@@ -230,10 +283,12 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    chapter_options = {f"Chapter {ch['chapter_number']}: {ch['chapter_name']}": ch for ch in chapters}
+    chapter_options = {_chapter_label(ch): ch for ch in chapters}
     selected_chapter_display = st.selectbox(
         "Choose a chapter to explore:",
-        ["Select a Chapter"] + list(chapter_options.keys())
+        ["Select a Chapter"] + list(chapter_options.keys()),
+        key="chapter_select",
+        on_change=_reset_sloka_select,
     )
     
     if selected_chapter_display != "Select a Chapter":
@@ -259,7 +314,8 @@ def main():
         sloka_options = {f"Sloka {sloka['sloka_number']}": sloka for sloka in slokas}
         selected_sloka_display = st.selectbox(
             "Choose a sloka to read:",
-            ["Select a Sloka"] + list(sloka_options.keys())
+            ["Select a Sloka"] + list(sloka_options.keys()),
+            key="sloka_select",
         )
         
         if selected_sloka_display != "Select a Sloka":
@@ -326,11 +382,13 @@ def main():
             """, unsafe_allow_html=True)
             
             ref_url = selected_sloka.get("reference_audio_url")
+            prefetcher = get_audio_prefetcher()
             if ref_url:
                 st.markdown("""
                 <div class="audio-player">
                 """, unsafe_allow_html=True)
-                st.audio(ref_url, format="audio/mp3")
+                # Play the locally cached copy; fall back to the remote URL until it is fetched
+                st.audio(prefetcher.get(ref_url) or ref_url, format="audio/mp3")
                 st.markdown("</div>", unsafe_allow_html=True)
             else:
                 st.markdown("""
@@ -338,6 +396,9 @@ def main():
                     <p>No reference audio available for this sloka.</p>
                 </div>
                 """, unsafe_allow_html=True)
+
+            # Warm the previous/next slokas' audio while this one is read
+            prefetcher.prefetch_neighbours(slokas, list(sloka_options).index(selected_sloka_display))
     
     # Footer
     st.markdown("---")
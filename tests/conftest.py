@@ -0,0 +1,80 @@
+"""Shared fixtures for the unit tests"""
+
+import json
+import os
+import sys
+
+import pytest
+import requests
+
+# The app modules live at the repository root rather than in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_response(status_code: int = 200, body=None, headers=None) -> requests.Response:
+    """Build a ``requests.Response`` without a network round trip"""
+    response = requests.Response()
+    response.status_code = status_code
+    if isinstance(body, (dict, list)):
+        response._content = json.dumps(body).encode("utf-8")
+    elif isinstance(body, str):
+        response._content = body.encode("utf-8")
+    else:
+        response._content = body or b""
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture(autouse=True)
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run every test in its own directory so relative ``.cache`` paths never touch the checkout"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Circuit breakers are process-wide; start every test with all circuits closed"""
+    import resilience
+
+    resilience._breakers.clear()
+    yield
+    resilience._breakers.clear()
+
+
+class FakeSession:
+    """Stands in for ``requests.Session``: records calls and answers from ``handler``"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.headers = {}
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self.handler(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+# Chapter number -> (sloka number, verse text, English meaning) rows, in the data/chapter*.json layout
+SAMPLE_CORPUS = {
+    12: [(2, "mayy aaveshya", "fixing the mind on me"), (1, "evam satata", "devotees")],
+    15: [(1, "urdhva mulam", "the eternal banyan tree")],
+}
+
+
+def write_corpus_dir(directory) -> str:
+    """Write ``SAMPLE_CORPUS`` as data/chapter*.json files and return the directory"""
+    directory.mkdir(parents=True, exist_ok=True)
+    for chapter, rows in SAMPLE_CORPUS.items():
+        data = [{"chapter": chapter, "chapter_name": f"Chapter {chapter}", "sloka_number": str(number),
+                 "sloka_text": text, "telugu_meaning": "", "english_meaning": meaning,
+                 "audio_link": f"https://audio.example/{chapter}/{number}.mp3"}
+                for number, text, meaning in rows]
+        (directory / f"chapter{chapter}.json").write_text(json.dumps(data), encoding="utf-8")
+    return str(directory)
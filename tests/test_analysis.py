@@ -0,0 +1,65 @@
+"""Tests for recording analysis and silence trimming"""
+
+import numpy as np
+
+from audio.analysis import (
+    AudioStats,
+    check_recording,
+    trim_silence,
+    trim_wav,
+    wav_duration_seconds,
+)
+from audio.pcm import decode_wav, encode_wav
+
+RATE = 16000
+
+
+def _recording(silence_before=0.5, speech=1.5, silence_after=0.5, amplitude=0.3):
+    """Mono tone surrounded by digital silence"""
+    t = np.arange(int(speech * RATE)) / RATE
+    tone = amplitude * np.sin(2 * np.pi * 220 * t)
+    signal = np.concatenate([np.zeros(int(silence_before * RATE)), tone, np.zeros(int(silence_after * RATE))])
+    return signal.astype(np.float32)[:, None]
+
+
+def test_stats_measure_duration_and_silence():
+    stats = AudioStats(_recording(), RATE)
+
+    assert stats.duration == 2.5
+    assert abs(stats.leading_silence - 0.5) < 0.02
+    assert abs(stats.trailing_silence - 0.5) < 0.02
+    assert abs(stats.voiced_duration - 1.5) < 0.04
+    assert stats.clipping_ratio == 0.0
+
+
+def test_trim_keeps_speech_plus_padding():
+    trimmed = trim_silence(_recording(), RATE, padding_ms=100)
+
+    assert abs(len(trimmed) / RATE - 1.7) < 0.04
+    assert np.abs(trimmed).max() > 0.29
+
+
+def test_trim_wav_leaves_unchanged_and_non_wav_input_alone():
+    speech_only = encode_wav(_recording(0, 1.5, 0), RATE)
+    assert trim_wav(speech_only) is speech_only
+    assert trim_wav(b"ID3 mp3 bytes") == b"ID3 mp3 bytes"
+
+    samples, rate = decode_wav(trim_wav(encode_wav(_recording(), RATE)))
+    assert rate == RATE and len(samples) < 2.5 * RATE
+
+
+def test_check_recording_rejects_silence_and_warns_on_clipping():
+    ok, message, _ = check_recording(encode_wav(np.zeros((RATE * 2, 1), dtype=np.float32), RATE))
+    assert not ok and "silent" in message
+
+    ok, message, stats = check_recording(encode_wav(_recording(amplitude=1.0), RATE))
+    assert ok and "clipping" in message and stats.clipping_ratio > 0
+
+    assert check_recording(encode_wav(_recording(), RATE))[:2] == (True, "")
+    assert check_recording(b"")[0] is False
+    assert check_recording(b"OggS not a wav")[:2] == (True, "")
+
+
+def test_wav_duration_seconds():
+    assert wav_duration_seconds(encode_wav(_recording(), RATE)) == 2.5
+    assert wav_duration_seconds(b"not audio") == 0.0
@@ -0,0 +1,127 @@
+"""Tests for SwechaAPIClient request handling"""
+
+from conftest import FakeSession, make_response
+
+from api_client import SwechaAPIClient, _shared_adapter
+
+
+def test_clients_share_one_connection_pool():
+    """Every client mounts the process-wide adapter but keeps its own headers"""
+    first, second = SwechaAPIClient(), SwechaAPIClient()
+
+    assert first.session is not second.session
+    assert first.session.get_adapter("https://api.corpus.swecha.org") is _shared_adapter
+    assert second.session.get_adapter("https://api.corpus.swecha.org") is _shared_adapter
+
+
+def test_make_request_parses_json_and_reports_status():
+    """A 2xx JSON body comes back as data with success set"""
+    client = SwechaAPIClient()
+    client.session = FakeSession(lambda method, url, **kw: make_response(200, {"ok": True}))
+
+    result = client._make_request("GET", "/health")
+
+    assert result == {"status_code": 200, "data": {"ok": True}, "success": True}
+
+
+def test_unauthenticated_request_does_not_send_session_token():
+    """Login-style calls drop the bearer token the session carries after login"""
+    client = SwechaAPIClient()
+    client.session = FakeSession(lambda method, url, **kw: make_response(200, {}))
+    client.auth_token = "secret"
+
+    client._make_request("POST", "/auth/login/send-otp", {"phone_number": "1"})
+    client._make_request("GET", "/auth/me", require_auth=True)
+
+    unauthenticated, authenticated = (call[2]["headers"] for call in client.session.calls)
+    assert unauthenticated["authorization"] is None
+    assert authenticated["authorization"] == "Bearer secret"
+
+
+def _upload_client(handler, chunk_size=4):
+    client = SwechaAPIClient()
+    client.session = FakeSession(handler)
+    client.auth_token = "token"
+    client.user_data = {"id": "user-1"}
+    client.chunk_size = chunk_size
+    return client
+
+
+def _chunk_index(kwargs):
+    return kwargs["data"]["chunk_index"]
+
+
+def test_upload_sends_every_chunk_then_finalizes():
+    """Chunks go out concurrently and the record is finalized only after all are acked"""
+    events = []
+
+    def handler(method, url, **kwargs):
+        if url.endswith("/records/upload/chunk"):
+            events.append(("chunk", _chunk_index(kwargs), kwargs["files"]["chunk"][1].tobytes()))
+            return make_response(200, {"ok": True})
+        events.append(("finalize", kwargs["data"]["total_chunks"]))
+        return make_response(201, {"id": "record-1"})
+
+    client = _upload_client(handler)
+    progress = []
+
+    result = client.upload_complete_audio(
+        audio_data=b"0123456789", filename="take.wav", max_in_flight=2,
+        progress_callback=lambda done, total, sent: progress.append((done, total, sent)),
+        resumable=False, notify=False, skip_duplicates=False,
+    )
+
+    assert result["success"]
+    chunks = sorted(event for event in events if event[0] == "chunk")
+    assert chunks == [("chunk", 0, b"0123"), ("chunk", 1, b"4567"), ("chunk", 2, b"89")]
+    assert events[-1] == ("finalize", 3)
+    assert progress[-1] == (3, 3, 10)
+
+
+def test_client_error_on_a_chunk_fails_without_finalizing():
+    """A 4xx chunk reply is not retried and the upload is never finalized"""
+    attempts = []
+
+    def handler(method, url, **kwargs):
+        if url.endswith("/records/upload"):
+            raise AssertionError("finalize must not be called")
+        attempts.append(_chunk_index(kwargs))
+        status = 400 if _chunk_index(kwargs) == 1 else 200
+        return make_response(status, {"detail": "bad chunk"})
+
+    client = _upload_client(handler)
+
+    result = client.upload_complete_audio(
+        audio_data=b"0123456789", filename="take.wav", max_in_flight=1,
+        resumable=False, notify=False, skip_duplicates=False,
+    )
+
+    assert not result["success"]
+    assert result["chunk_index"] == 1
+    assert result["acked"] == [0]
+    assert attempts.count(1) == 1
+
+
+def test_transient_chunk_failure_is_retried(monkeypatch):
+    """A 503 on a chunk is retried and the upload still completes"""
+    monkeypatch.setattr("resilience.time.sleep", lambda seconds: None)
+    failed_once = set()
+
+    def handler(method, url, **kwargs):
+        if url.endswith("/records/upload/chunk"):
+            index = _chunk_index(kwargs)
+            if index not in failed_once:
+                failed_once.add(index)
+                return make_response(503, "busy")
+            return make_response(200, {"ok": True})
+        return make_response(201, {"id": "record-1"})
+
+    client = _upload_client(handler)
+
+    result = client.upload_complete_audio(
+        audio_data=b"0123456789", filename="take.wav",
+        resumable=False, notify=False, skip_duplicates=False,
+    )
+
+    assert result["success"]
+    assert failed_once == {0, 1, 2}
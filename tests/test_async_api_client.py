@@ -0,0 +1,173 @@
+"""Tests for AsyncSwechaAPIClient"""
+
+import asyncio
+import re
+
+import httpx
+from conftest import FakeSession, make_response
+
+import resilience
+from api_client import SwechaAPIClient
+from async_api_client import AsyncSwechaAPIClient
+from upload_manifest import ManifestStore
+
+
+def _form_field(request: httpx.Request, name: str) -> str:
+    body = request.read().decode("latin-1")
+    match = re.search(rf'name="{name}"\r\n\r\n([^\r]*)', body) or re.search(rf"{name}=([^&]*)", body)
+    return match.group(1)
+
+
+def _client(handler, manifest_dir=None) -> AsyncSwechaAPIClient:
+    client = AsyncSwechaAPIClient()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client.auth_token = "token"
+    client.user_data = {"id": "user-1"}
+    if manifest_dir is not None:
+        client.manifests = ManifestStore(str(manifest_dir))
+    return client
+
+
+async def _run(client, coroutine):
+    async with client:
+        return await coroutine
+
+
+def test_non_json_success_bodies_do_not_raise(tmp_path):
+    """A 2xx chunk or finalize reply with a plain-text body still counts as success"""
+    client = _client(lambda request: httpx.Response(200, text="OK"), tmp_path)
+    client.chunk_size = 4
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav")))
+
+    assert result["success"]
+    assert result["data"]["data"] == {"raw": "OK"}
+
+
+def test_transport_errors_report_no_status_code():
+    """Like the sync client, a request that got no HTTP response has status_code None"""
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    client = _client(handler)
+
+    result = asyncio.run(_run(client, client.get_user_info()))
+
+    assert result["status_code"] is None
+    assert not result["success"]
+
+
+def test_resumes_an_upload_started_by_the_sync_client(tmp_path):
+    """Both clients share manifests, whichever chunk size the partial upload used"""
+    def sync_handler(method, url, **kwargs):
+        status = 400 if kwargs["data"]["chunk_index"] == 2 else 200
+        return make_response(status, {"ok": status == 200})
+
+    sync_client = SwechaAPIClient()
+    sync_client.session = FakeSession(sync_handler)
+    sync_client.auth_token = "token"
+    sync_client.user_data = {"id": "user-1"}
+    sync_client.chunk_size = 4
+    sync_client.manifests = ManifestStore(str(tmp_path))
+    failed = sync_client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav", max_in_flight=1,
+                                               notify=False, skip_duplicates=False)
+    assert not failed["success"]
+
+    sent = []
+
+    def async_handler(request):
+        if request.url.path.endswith("/records/upload/chunk"):
+            sent.append((_form_field(request, "upload_uuid"), _form_field(request, "chunk_index")))
+        return httpx.Response(200, json={"ok": True})
+
+    client = _client(async_handler, tmp_path)  # chunk size left to the sizer
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav")))
+
+    assert result["success"]
+    assert sent == [(failed["upload_uuid"], "2")]
+
+
+def test_chunk_retries_share_the_resilience_policy_and_breaker(tmp_path, monkeypatch):
+    """Transient chunk failures back off per RetryPolicy and count towards the endpoint's circuit"""
+    delays = []
+
+    async def no_sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr("resilience.asyncio.sleep", no_sleep)
+    replies = iter([503, 503, 200])
+
+    def handler(request):
+        if request.url.path.endswith("/records/upload/chunk"):
+            return httpx.Response(next(replies), json={})
+        return httpx.Response(200, json={"ok": True})
+
+    client = _client(handler, tmp_path)
+    client.chunk_size = 16
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav")))
+
+    assert result["success"]
+    assert len(delays) == 2
+    assert resilience.get_circuit_breaker("POST /records/upload/chunk").snapshot()["failures"] == 0
+
+
+def test_open_circuit_fails_chunks_fast(tmp_path):
+    sent = []
+
+    def handler(request):
+        sent.append(request.url.path)
+        return httpx.Response(200, json={})
+
+    breaker = resilience.get_circuit_breaker("POST /records/upload/chunk")
+    for _ in range(breaker.failure_threshold):
+        breaker.record(True)
+    client = _client(handler, tmp_path)
+    client.chunk_size = 4
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav")))
+
+    assert not result["success"]
+    assert result["status_code"] is None
+    assert sent == []
+
+
+def test_no_more_chunks_are_sent_after_a_permanent_failure(tmp_path):
+    """Like the sync client, a chunk the server refuses stops the rest of the upload"""
+    sent = []
+
+    def handler(request):
+        index = _form_field(request, "chunk_index")
+        sent.append(index)
+        return httpx.Response(400 if index == "1" else 200, json={})
+
+    client = _client(handler, tmp_path)
+    client.chunk_size = 2
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav",
+                                                                   max_in_flight=1)))
+
+    assert not result["success"]
+    assert result["chunk_index"] == 1
+    assert result["acked"] == [0]
+    assert sent == ["0", "1"]
+
+
+def test_chunk_views_are_streamed_intact(tmp_path):
+    bodies = {}
+
+    def handler(request):
+        if request.url.path.endswith("/records/upload/chunk"):
+            body = request.read()
+            start = body.index(b"\r\n\r\n", body.index(b'name="chunk"')) + 4
+            bodies[_form_field(request, "chunk_index")] = body[start:body.index(b"\r\n--", start)]
+        return httpx.Response(200, json={})
+
+    client = _client(handler, tmp_path)
+    client.chunk_size = 4
+
+    result = asyncio.run(_run(client, client.upload_complete_audio(audio_data=bytearray(b"0123456789"), filename="take.wav")))
+
+    assert result["success"]
+    assert bodies == {"0": b"0123", "1": b"4567", "2": b"89"}
@@ -0,0 +1,80 @@
+"""Tests for the corpus backends"""
+
+import pytest
+from conftest import write_corpus_dir
+
+from database.backends import (
+    CorpusBackend,
+    FallbackBackend,
+    LocalFileBackend,
+    sloka_key,
+)
+from database.db_utils import DatabaseManager
+
+
+@pytest.fixture
+def corpus_dir(tmp_path):
+    write_corpus_dir(tmp_path)
+    return tmp_path
+
+
+class RenamedIds(CorpusBackend):
+    """The same rows under different ids, as Supabase and the offline corpus have"""
+
+    name = "renamed"
+
+    def __init__(self, source: CorpusBackend):
+        self.source = source
+
+    def load_corpus(self):
+        chapters, slokas = self.source.load_corpus()
+        chapters = [dict(ch, id="remote-" + ch["id"]) for ch in chapters]
+        slokas = [dict(s, id="remote-" + s["id"], chapter_id="remote-" + s["chapter_id"]) for s in slokas]
+        return chapters, slokas
+
+    def corpus_version(self):
+        return "same-version"
+
+
+def test_local_backend_normalizes_rows_to_the_supabase_schema(corpus_dir):
+    backend = LocalFileBackend(str(corpus_dir))
+
+    chapter = backend.get_chapter_by_number(12)
+    slokas = backend.get_slokas_by_chapter(chapter["id"])
+
+    assert [ch["chapter_number"] for ch in backend.get_all_chapters()] == [12, 15]
+    assert [s["sloka_number"] for s in slokas] == [1, 2]
+    assert slokas[1]["meaning_english"] == "fixing the mind on me"
+    assert backend.get_sloka_by_chapter_and_number(chapter["id"], 2) is slokas[1]
+
+
+def test_fallback_is_used_when_the_primary_fails(corpus_dir):
+    class Down(CorpusBackend):
+        name = "down"
+        calls = 0
+
+        def get_all_chapters(self):
+            Down.calls += 1
+            raise ConnectionError("timeout")
+
+    backend = FallbackBackend(Down(), LocalFileBackend(str(corpus_dir)), cooldown=60)
+
+    assert len(backend.get_all_chapters()) == 2
+    assert len(backend.get_all_chapters()) == 2
+    assert Down.calls == 1  # skipped during the cooldown
+
+
+def test_search_hits_use_keys_that_survive_a_backend_switch(corpus_dir, monkeypatch):
+    """An index saved while serving one backend resolves against another's ids"""
+    monkeypatch.setattr("database.db_utils.SEARCH_INDEX_PATH", str(corpus_dir / "search.json"))
+    local = LocalFileBackend(str(corpus_dir))
+    local.corpus_version = lambda: "same-version"
+
+    first = DatabaseManager(local).search_slokas("banyan")
+    second = DatabaseManager(RenamedIds(local)).search_slokas("banyan")
+
+    assert (corpus_dir / "search.json").exists()
+    assert first[0]["sloka"]["id"] != second[0]["sloka"]["id"]
+    assert [sloka_key(15, 1)] * 2 == [
+        sloka_key(hit["chapter"]["chapter_number"], hit["sloka"]["sloka_number"]) for hit in (first[0], second[0])
+    ]
@@ -0,0 +1,56 @@
+"""Tests for the memory-mapped binary corpus"""
+
+import pytest
+from conftest import write_corpus_dir
+
+from database.backends import BinaryFileBackend, LocalFileBackend
+from database.binary_corpus import BinaryCorpus, build_binary_corpus
+
+
+def test_round_trip_preserves_every_row(tmp_path):
+    """Rows read back from the file equal the rows it was built from, None and Unicode included"""
+    chapters = [{"id": "c2", "chapter_number": 2, "chapter_name": "సాంఖ్యయోగము"},
+                {"id": "c1", "chapter_number": 1, "chapter_name": None}]
+    slokas = [
+        {"id": "s3", "chapter_id": "c2", "sloka_number": 1, "sloka_text_telugu": "ధృతరాష్ట్ర ఉవాచ",
+         "meaning_telugu": "", "meaning_english": "Dhritarashtra said", "reference_audio_url": None},
+        {"id": "s2", "chapter_id": "c1", "sloka_number": 2, "sloka_text_telugu": "b",
+         "meaning_telugu": "m", "meaning_english": "e", "reference_audio_url": "https://x/2.mp3"},
+        {"id": "s1", "chapter_id": "c1", "sloka_number": 1, "sloka_text_telugu": "a",
+         "meaning_telugu": "m", "meaning_english": "e", "reference_audio_url": "https://x/1.mp3"},
+        {"id": "orphan", "chapter_id": "missing", "sloka_number": 1},
+    ]
+    path = build_binary_corpus(chapters, slokas, str(tmp_path / "corpus.bin"), source_version={"v": 1})
+
+    corpus = BinaryCorpus(path)
+
+    assert corpus.source_version == {"v": 1}
+    assert [dict(ch) for ch in corpus.chapters()] == [
+        {"chapter_number": 1, "id": "c1", "chapter_name": None},
+        {"chapter_number": 2, "id": "c2", "chapter_name": "సాంఖ్యయోగము"},
+    ]
+    assert [dict(s) for s in corpus.slokas_for_chapter(0)] == [slokas[2], slokas[1]]
+    assert [dict(s) for s in corpus.slokas_for_chapter(1)] == [slokas[0]]
+    assert corpus.sloka_count == 3
+    corpus.close()
+
+
+def test_binary_backend_serves_the_same_corpus_as_its_source(tmp_path):
+    source = LocalFileBackend(write_corpus_dir(tmp_path / "data"))
+    chapters, slokas = source.load_corpus()
+    build_binary_corpus(chapters, slokas, str(tmp_path / "corpus.bin"), source.corpus_version())
+
+    backend = BinaryFileBackend(str(tmp_path / "corpus.bin"))
+
+    assert [dict(ch) for ch in backend.get_all_chapters()] == chapters
+    chapter = backend.get_chapter_by_number(12)
+    assert [dict(s) for s in backend.get_slokas_by_chapter(chapter["id"])] == source.get_slokas_by_chapter(chapter["id"])
+    assert dict(backend.get_sloka_by_chapter_and_number(chapter["id"], 2)) == source.get_sloka_by_chapter_and_number(chapter["id"], 2)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "corpus.bin"
+    path.write_bytes(b"NOPE" + bytes(64))
+
+    with pytest.raises(ValueError):
+        BinaryCorpus(str(path))
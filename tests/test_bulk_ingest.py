@@ -0,0 +1,87 @@
+"""Tests for the bulk ingestion CLI's ingester"""
+
+import json
+
+import numpy as np
+
+import bulk_ingest
+from audio.pcm import encode_wav
+from bulk_ingest import BulkIngester, Ledger, SlokaLookup, TokenBucket, find_audio_files
+
+
+class FakeDB:
+    def get_all_chapters(self):
+        return [{"id": "ch-12", "chapter_number": 12, "chapter_name": "Bhakti Yoga"}]
+
+    def get_slokas_by_chapter(self, chapter_id):
+        return [{"id": "s-1", "sloka_number": 1}, {"id": "s-2", "sloka_number": 2}]
+
+
+class FakeClient:
+    user_data = {"id": "u1"}
+
+    def __init__(self):
+        self.uploads = []
+
+    def upload_complete_audio(self, audio_data, filename, title, **kwargs):
+        self.uploads.append((filename, title, bytes(audio_data.read(0, audio_data.total_size))))
+        return {"success": True, "data": {"data": {"id": f"rec-{len(self.uploads)}"}}}
+
+
+def _speech(freq=220, seconds=1.5, rate=16000):
+    t = np.arange(int(seconds * rate)) / rate
+    return encode_wav((0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)[:, None], rate)
+
+
+def _ingester(tmp_path, client):
+    ledger = Ledger(str(tmp_path / "ledger.jsonl"))
+    return BulkIngester(client, SlokaLookup(FakeDB()), ledger, "cat", workers=2)
+
+
+def test_ingests_a_folder_once_per_distinct_recording(tmp_path):
+    folder = tmp_path / "recordings"
+    (folder / "copies").mkdir(parents=True)
+    (folder / "ch12_sloka2_recitation.wav").write_bytes(_speech())
+    (folder / "copies" / "12_2.wav").write_bytes(_speech())  # same content, different name
+    (folder / "ch12_sloka1_explanation.wav").write_bytes(_speech(330))
+    (folder / "ch12_sloka9.wav").write_bytes(_speech(440))  # no such sloka
+    (folder / "ch12_sloka1_quiet.wav").write_bytes(encode_wav(np.zeros((16000, 1), dtype=np.float32), 16000))
+    (folder / "notes.txt").write_text("not audio")
+    client = FakeClient()
+
+    paths = find_audio_files(str(folder))
+    counts = _ingester(tmp_path, client).run(paths)
+
+    assert len(paths) == 5
+    assert counts == {"uploaded": 2, "duplicate": 1, "unmapped": 1, "rejected": 1}
+    assert sorted(title for _, title, _ in client.uploads) == [
+        "Sloka 1 Explanation - Chapter 12", "Sloka 2 Recitation - Chapter 12",
+    ]
+    with open(tmp_path / "ledger.jsonl") as f:
+        assert sorted(json.loads(line)["status"] for line in f) == ["duplicate", "rejected", "unmapped", "uploaded", "uploaded"]
+
+
+def test_rerun_skips_content_already_in_the_ledger(tmp_path):
+    folder = tmp_path / "recordings"
+    folder.mkdir()
+    (folder / "ch12_sloka2.wav").write_bytes(_speech())
+    _ingester(tmp_path, FakeClient()).run(find_audio_files(str(folder)))
+
+    (folder / "ch12_sloka2.wav").rename(folder / "renamed_12_2.wav")
+    client = FakeClient()
+    counts = _ingester(tmp_path, client).run(find_audio_files(str(folder)))
+
+    assert counts == {"duplicate": 1}
+    assert client.uploads == []
+
+
+def test_token_bucket_makes_callers_wait_off_their_debt(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bulk_ingest.time, "sleep", sleeps.append)
+    monkeypatch.setattr(bulk_ingest.time, "monotonic", lambda: 100.0)
+    bucket = TokenBucket(rate=1000)
+
+    bucket.consume(500)
+    bucket.consume(1500)
+
+    assert sleeps == [1.0]
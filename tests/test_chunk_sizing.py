@@ -0,0 +1,49 @@
+"""Tests for adaptive upload chunk sizing"""
+
+from chunk_sizing import ChunkSizer
+
+KB = 1024
+MB = 1024 * KB
+
+
+def _sizer(**kwargs):
+    options = {"initial": 2 * MB, "minimum": 256 * KB, "maximum": 8 * MB, "target_seconds": 4}
+    options.update(kwargs)
+    return ChunkSizer(**options)
+
+
+def test_initial_size_until_something_is_measured():
+    assert _sizer().plan() == 2 * MB
+    assert _sizer(initial=64 * MB).plan() == 8 * MB
+
+
+def test_settles_on_the_size_whose_round_trip_is_the_target():
+    """1 MB/s with 0.5 s of fixed latency per request: 3.5 MB chunks take 4 s"""
+    sizer = _sizer()
+    for _ in range(30):
+        size = sizer.plan()
+        for _ in range(5):
+            sizer.observe(size, 0.5 + size / MB)
+
+    assert abs(sizer.plan() - 3.5 * MB) <= 128 * KB
+    assert sizer.plan() % (64 * KB) == 0
+
+
+def test_changes_are_bounded_per_upload_and_by_the_limits():
+    sizer = _sizer()
+    sizer.observe(2 * MB, 0.01)  # a burst at 200 MB/s
+    assert sizer.plan() == 8 * MB  # 4x step, capped at the maximum
+
+    slow = _sizer()
+    slow.observe(2 * MB, 200)
+    assert slow.plan() == 512 * KB  # at most 4x smaller per upload
+    assert slow.plan() == 256 * KB  # then held at the minimum
+
+
+def test_failures_halve_the_estimate():
+    sizer = _sizer()
+    sizer.observe(MB, 1)
+    sizer.failed()
+
+    assert sizer.stats()["throughput"] == MB / 2
+    assert sizer.plan() == 2 * MB
@@ -0,0 +1,87 @@
+"""Tests for the zero-copy upload chunk readers"""
+
+import io
+import os
+
+from chunk_source import (
+    BufferChunkSource,
+    FileObjectChunkSource,
+    MmapChunkSource,
+    open_chunk_source,
+)
+
+CONTENT = bytes(range(256)) * 40
+
+
+def _chunks(source, size):
+    return [bytes(view) for _, view in source.iter_chunks(size)]
+
+
+def _expected(size):
+    return [CONTENT[i:i + size] for i in range(0, len(CONTENT), size)]
+
+
+class _Pipe(io.RawIOBase):
+    """Non-seekable stream, like a socket or a pipe"""
+
+    def __init__(self, data):
+        self._inner = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._inner.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def test_every_source_kind_yields_the_same_chunks(tmp_path):
+    """Paths, buffers, BytesIO, real files and plain streams all chunk identically"""
+    path = tmp_path / "take.wav"
+    path.write_bytes(CONTENT)
+
+    with open(path, "rb") as f:
+        sources = [
+            (str(path), MmapChunkSource),
+            (CONTENT, BufferChunkSource),
+            (io.BytesIO(CONTENT), BufferChunkSource),
+            (f, MmapChunkSource),
+            (io.BufferedReader(_Pipe(CONTENT)), MmapChunkSource),
+        ]
+        for raw, kind in sources:
+            with open_chunk_source(raw) as source:
+                assert isinstance(source, kind)
+                assert source.total_size == len(CONTENT)
+                assert _chunks(source, 1000) == _expected(1000)
+
+
+def test_buffer_reads_are_views_not_copies():
+    """Chunks of an in-memory buffer share its memory"""
+    buffer = bytearray(CONTENT)
+    source = BufferChunkSource(buffer)
+
+    view = source.read(10, 5)
+    buffer[10] = 0xFF
+
+    assert view[0] == 0xFF
+
+
+def test_seekable_stream_reads_from_its_current_position():
+    """A stream already advanced past a header is chunked from there"""
+    stream = io.BufferedReader(io.BytesIO(b"HEADER" + CONTENT))
+    stream.read(6)
+
+    source = FileObjectChunkSource(stream)
+
+    assert source.total_size == len(CONTENT)
+    assert bytes(source.read(0, 4)) == CONTENT[:4]
+
+
+def test_spooled_stream_is_removed_on_close():
+    """The temporary copy of a non-seekable stream doesn't outlive the upload"""
+    source = open_chunk_source(io.BufferedReader(_Pipe(CONTENT)))
+    spool_path = source.path
+    source.close()
+
+    assert not os.path.exists(spool_path)
@@ -0,0 +1,77 @@
+"""Tests for the process-wide corpus cache"""
+
+from database import corpus_cache
+from database.corpus_cache import CorpusCache
+
+CHAPTERS = [{"id": "c2", "chapter_number": 2}, {"id": "c1", "chapter_number": 1}]
+SLOKAS = [{"id": "s2", "chapter_id": "c1", "sloka_number": 2}, {"id": "s1", "chapter_id": "c1", "sloka_number": 1}]
+
+
+class Loader:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("backend down")
+        return CHAPTERS, SLOKAS
+
+
+def test_snapshot_is_loaded_once_and_indexed():
+    loader = Loader()
+    cache = CorpusCache(loader, refresh_interval=0)
+
+    snapshot = cache.snapshot()
+    assert cache.snapshot() is snapshot
+    assert loader.calls == 1
+    assert [ch["chapter_number"] for ch in snapshot.chapters] == [1, 2]
+    assert [s["id"] for s in snapshot.slokas_by_chapter["c1"]] == ["s1", "s2"]
+    assert snapshot.slokas_by_key[("c1", 2)]["id"] == "s2"
+
+
+def test_unchanged_version_skips_the_reload(monkeypatch):
+    """After the refresh interval only the cheap version probe runs, until the version moves"""
+    clock = [0.0]
+    monkeypatch.setattr(corpus_cache.time, "monotonic", lambda: clock[0])
+    loader = Loader()
+    version = ["v1"]
+    cache = CorpusCache(loader, refresh_interval=10, version_probe=lambda: version[0])
+
+    first = cache.snapshot()
+    clock[0] = 11
+    assert cache.snapshot() is first
+    assert loader.calls == 1
+
+    version[0] = "v2"
+    clock[0] = 22
+    assert cache.snapshot() is not first
+    assert loader.calls == 2
+
+
+def test_failed_refresh_keeps_serving_the_old_snapshot(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(corpus_cache.time, "monotonic", lambda: clock[0])
+    loader = Loader()
+    cache = CorpusCache(loader, refresh_interval=10)
+    first = cache.snapshot()
+
+    loader.fail = True
+    clock[0] = 11
+    assert cache.snapshot() is first
+
+
+def test_invalidate_forces_a_reload():
+    loader = Loader()
+    cache = CorpusCache(loader, refresh_interval=0, version_probe=lambda: "v1")
+    cache.snapshot()
+
+    cache.invalidate()
+    cache.snapshot()
+
+    assert loader.calls == 2
+
+
+def test_never_loaded_corpus_returns_none():
+    assert CorpusCache(Loader(fail=True)).snapshot() is None
@@ -0,0 +1,52 @@
+"""Tests for the incremental reference feature index build"""
+
+import io
+
+import numpy as np
+from conftest import make_response
+
+from audio import feature_index
+from audio.feature_index import ReferenceFeatureIndex
+from audio.pcm import encode_wav
+from reference_audio_cache import ReferenceAudioCache
+
+URL = "https://audio.example/12/2.mp3"
+
+
+def _tone(freq, rate=16000):
+    t = np.arange(rate) / rate
+    return encode_wav((0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)[:, None], rate)
+
+
+class AudioServer:
+    def __init__(self, body, etag):
+        self.body, self.etag = body, etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            response, body = make_response(304), b""
+        else:
+            response, body = make_response(200, headers={"ETag": self.etag}), self.body
+        response.raw = io.BytesIO(body)
+        return response
+
+
+def test_build_revalidates_fresh_cache_entries(tmp_path, monkeypatch):
+    server = AudioServer(_tone(220), '"v1"')
+    # A day-long freshness window would hide a re-upload without the forced conditional GET
+    cache = ReferenceAudioCache(str(tmp_path / "audio"), revalidate_after=86400, session=server)
+    monkeypatch.setattr(feature_index, "get_reference_audio_cache", lambda: cache)
+    index = ReferenceFeatureIndex(str(tmp_path / "features"))
+    slokas = [("12.2", {"reference_audio_url": URL}), ("12.3", {})]
+
+    assert index.build(slokas, workers=1) == {"built": 1, "unchanged": 0, "skipped": 1, "failed": 0}
+    assert index.get("12.2", URL) is not None
+
+    assert index.build(slokas, workers=1)["unchanged"] == 1
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+
+    server.body, server.etag = _tone(440), '"v2"'
+    assert index.build(slokas, workers=1)["built"] == 1
+    assert index.info("12.2")["source"] == '"v2"'
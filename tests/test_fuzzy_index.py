@@ -0,0 +1,36 @@
+"""Tests for romanized fuzzy verse lookup"""
+
+from database.fuzzy_index import FuzzyIndex, skeleton, substring_distance
+
+SLOKAS = [
+    {"id": "a", "sloka_text_telugu": "మయ్యావేశ్య మనో యే మాం(న్) నిత్యయుక్తా ఉపాసతే"},
+    {"id": "b", "sloka_text_telugu": "ఏవం సతతయుక్తా యే భక్తాస్త్వాం పర్యుపాసతే"},
+    {"id": "c", "sloka_text_telugu": "ఊర్ధ్వమూలమధఃశాఖమ్ అశ్వత్థం ప్రాహురవ్యయమ్"},
+]
+
+
+def test_skeleton_matches_telugu_iast_and_loose_spellings():
+    telugu = skeleton("ఏవం సతత")
+    assert skeleton("evaṃ satata") == telugu
+    assert skeleton("Evam Sathatha") == telugu
+
+
+def test_substring_distance():
+    assert substring_distance("sat", "evansatata", 2) == 0
+    assert substring_distance("sxt", "evansatata", 2) == 1
+    assert substring_distance("zzzz", "evansatata", 2) == 3  # bound exceeded
+
+
+def test_finds_verses_from_misspelled_romanized_text():
+    index = FuzzyIndex(SLOKAS, keys=["12.2", "12.1", "15.1"])
+
+    assert index.search("evam satata yukta")[0] == {"id": "12.1", "distance": 0}
+    assert index.search("mayyavesya mano ye")[0]["id"] == "12.2"
+    assert index.search("urdva mulam adhah sakham")[0]["id"] == "15.1"
+
+
+def test_unrelated_or_short_queries_find_nothing():
+    index = FuzzyIndex(SLOKAS)
+
+    assert index.search("ev") == []
+    assert index.search("completely unrelated words") == []
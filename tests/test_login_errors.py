@@ -0,0 +1,78 @@
+"""Tests for the error messages the signup handlers show"""
+
+import contextlib
+
+import pytest
+
+from streamlit_app import login
+
+
+class FakeStreamlit:
+    """Records st.error calls; everything else the handlers touch is a no-op"""
+
+    def __init__(self):
+        self.errors = []
+        self.session_state = {}
+
+    def error(self, message):
+        self.errors.append(message)
+
+    def expander(self, label):
+        return contextlib.nullcontext()
+
+    def json(self, value):
+        pass
+
+
+class FailingClient:
+    def __init__(self, response):
+        self.response = response
+
+    def send_signup_otp(self, phone_number):
+        return self.response
+
+    def verify_signup_otp(self, *args):
+        return self.response
+
+
+@pytest.fixture
+def st(monkeypatch):
+    fake = FakeStreamlit()
+    monkeypatch.setattr(login, "st", fake)
+    return fake
+
+
+def _send(monkeypatch, response):
+    monkeypatch.setattr(login, "api_client", FailingClient(response))
+    return login.handle_send_otp("+919999999999")
+
+
+def _verify(monkeypatch, response):
+    monkeypatch.setattr(login, "api_client", FailingClient(response))
+    return login.handle_verify_signup("+919999999999", "123456", "Name", "a@b.c", "secret")
+
+
+@pytest.mark.parametrize("handler", [_send, _verify])
+def test_connection_failure_is_reported_as_unreachable(st, monkeypatch, handler):
+    assert handler(monkeypatch, {"success": False, "status_code": None, "data": {"error": "Connection refused"}}) is False
+
+    assert st.errors == ["⚠️ Could not reach the server. Please check your internet connection and try again."]
+
+
+@pytest.mark.parametrize("handler", [_send, _verify])
+def test_open_circuit_is_reported_as_temporarily_unavailable(st, monkeypatch, handler):
+    response = {"success": False, "status_code": 503, "data": {"error": "POST /auth/send-otp is temporarily unavailable"}}
+
+    assert handler(monkeypatch, response) is False
+
+    assert st.errors == ["⚠️ The service is temporarily unavailable. Please try again in a minute."]
+
+
+def test_other_failures_keep_their_specific_messages(st, monkeypatch):
+    _send(monkeypatch, {"success": False, "status_code": 500, "data": {}})
+    _send(monkeypatch, {"success": False, "status_code": 400, "data": {"message": "Invalid phone"}})
+
+    assert st.errors == [
+        "⚠️ Internal server error from backend. Please try again later or contact support.",
+        "Failed to send OTP (Status: 400): Invalid phone",
+    ]
@@ -0,0 +1,51 @@
+"""Tests for background prefetching of neighbouring slokas' audio"""
+
+import threading
+
+from prefetch import AudioPrefetcher
+
+
+class RecordingCache:
+    """Reference audio cache stand-in whose downloads block until released"""
+
+    def __init__(self):
+        self.fetched = []
+        self.release = threading.Event()
+
+    def path_for(self, url):
+        self.release.wait(5)
+        self.fetched.append(url)
+        return f"/cache/{url}"
+
+    def cached_path(self, url):
+        return f"/cache/{url}" if url in self.fetched else None
+
+
+def _slokas(count):
+    return [{"reference_audio_url": f"s{i}.mp3"} for i in range(count)] + [{"reference_audio_url": None}]
+
+
+def test_shown_sloka_then_neighbours_are_fetched_next_first():
+    cache = RecordingCache()
+    cache.release.set()
+    prefetcher = AudioPrefetcher(cache, max_workers=1)
+
+    prefetcher.prefetch_neighbours(_slokas(6), 2, radius=2)
+    prefetcher._executor.shutdown(wait=True)
+
+    assert cache.fetched == ["s2.mp3", "s3.mp3", "s1.mp3", "s4.mp3", "s0.mp3"]
+    assert prefetcher.get("s3.mp3") == "/cache/s3.mp3"
+
+
+def test_urls_already_in_flight_are_not_fetched_twice():
+    """Reruns while a download is running don't queue it again; edges and missing audio are skipped"""
+    cache = RecordingCache()
+    prefetcher = AudioPrefetcher(cache, max_workers=2)
+
+    prefetcher.prefetch_neighbours(_slokas(2), 1, radius=1)
+    prefetcher.prefetch_neighbours(_slokas(2), 1, radius=1)
+    cache.release.set()
+    prefetcher._executor.shutdown(wait=True)
+
+    assert sorted(cache.fetched) == ["s0.mp3", "s1.mp3"]
+    assert prefetcher.get("missing.mp3") is None
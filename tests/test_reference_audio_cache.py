@@ -0,0 +1,97 @@
+"""Tests for the on-disk reference audio cache"""
+
+import io
+
+from conftest import make_response
+
+from reference_audio_cache import ReferenceAudioCache
+
+
+class AudioServer:
+    """Stands in for the storage bucket: serves bytes per URL and honours If-None-Match"""
+
+    def __init__(self, files):
+        self.files = files
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        headers = headers or {}
+        self.requests.append((url, dict(headers)))
+        body, etag = self.files[url]
+        if headers.get("If-None-Match") == etag:
+            response = make_response(304)
+            body = b""
+        else:
+            response = make_response(200, headers={"ETag": etag})
+        response.raw = io.BytesIO(body)  # path_for streams the body
+        return response
+
+
+def _cache(directory, server, **kwargs):
+    return ReferenceAudioCache(str(directory), session=server, **kwargs)
+
+
+def test_downloads_once_then_serves_from_disk(tmp_path):
+    server = AudioServer({"https://a/1.mp3": (b"one", '"v1"')})
+    cache = _cache(tmp_path, server)
+
+    path = cache.path_for("https://a/1.mp3")
+
+    assert open(path, "rb").read() == b"one"
+    assert cache.path_for("https://a/1.mp3") == path
+    assert len(server.requests) == 1
+
+
+def test_stale_entries_are_revalidated_with_a_conditional_get(tmp_path):
+    server = AudioServer({"https://a/1.mp3": (b"one", '"v1"')})
+    cache = _cache(tmp_path, server, revalidate_after=0)
+    first = cache.path_for("https://a/1.mp3")
+
+    assert cache.path_for("https://a/1.mp3") == first
+    assert server.requests[1][1]["If-None-Match"] == '"v1"'
+
+    server.files["https://a/1.mp3"] = (b"two", '"v2"')
+    changed = cache.path_for("https://a/1.mp3")
+    assert open(changed, "rb").read() == b"two"
+    assert cache.etag("https://a/1.mp3") == '"v2"'
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    server = AudioServer({f"https://a/{n}.mp3": (b"x" * 10, f'"{n}"') for n in range(3)})
+    cache = _cache(tmp_path, server, max_bytes=20)
+
+    cache.path_for("https://a/0.mp3")
+    cache.path_for("https://a/1.mp3")
+    cache.cached_path("https://a/0.mp3")
+    cache.path_for("https://a/2.mp3")
+
+    assert cache.cached_path("https://a/1.mp3") is None
+    assert cache.cached_path("https://a/0.mp3") is not None
+
+
+def test_files_evicted_by_another_process_are_not_handed_out(tmp_path):
+    """A worker's index may still list a file the CLI's eviction deleted"""
+    server = AudioServer({f"https://a/{n}.mp3": (b"x" * 10, f'"{n}"') for n in range(2)})
+    worker = _cache(tmp_path, server, max_bytes=10)
+    worker.path_for("https://a/0.mp3")
+    cli = _cache(tmp_path, server, max_bytes=10)
+
+    cli.path_for("https://a/1.mp3")  # evicts 0.mp3 from the shared directory
+
+    assert worker.cached_path("https://a/0.mp3") is None
+    refetched = worker.path_for("https://a/0.mp3")
+    assert open(refetched, "rb").read() == b"x" * 10
+
+
+def test_entries_saved_by_another_process_are_kept(tmp_path):
+    """Saving the index merges other processes' entries instead of overwriting them"""
+    server = AudioServer({f"https://a/{n}.mp3": (b"x", f'"{n}"') for n in range(2)})
+    first = _cache(tmp_path, server)
+    second = _cache(tmp_path, server)
+
+    first.path_for("https://a/0.mp3")
+    second.path_for("https://a/1.mp3")
+
+    reopened = _cache(tmp_path, server)
+    assert reopened.cached_path("https://a/0.mp3") is not None
+    assert reopened.cached_path("https://a/1.mp3") is not None
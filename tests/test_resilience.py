@@ -0,0 +1,112 @@
+"""Tests for retries, backoff and circuit breaking"""
+
+import pytest
+import requests
+from conftest import make_response
+
+import resilience
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    endpoint_key,
+    resilient_request,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(resilience.time, "sleep", clock.sleep)
+    return clock
+
+
+def _replies(*outcomes):
+    """``send`` callable returning (or raising) ``outcomes`` in order, counting calls"""
+    outcomes = list(outcomes)
+
+    def send():
+        send.calls += 1
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(outcome)
+
+    send.calls = 0
+    return send
+
+
+def test_idempotent_requests_are_retried_until_they_succeed(clock):
+    send = _replies(502, requests.ConnectionError("reset"), 200)
+
+    response = resilient_request(send, "GET", "/chapters", policy=RetryPolicy(attempts=3, base_delay=1, max_delay=10))
+
+    assert response.status_code == 200 and send.calls == 3
+    assert len(clock.sleeps) == 2 and clock.sleeps[0] <= 1 and clock.sleeps[1] <= 2
+
+
+def test_non_idempotent_posts_are_only_retried_when_never_processed(clock):
+    policy = RetryPolicy(attempts=3, base_delay=0)
+
+    send = _replies(500, 200)
+    assert resilient_request(send, "POST", "/auth/login", policy=policy).status_code == 500
+    assert send.calls == 1
+
+    send = _replies(503, requests.ConnectTimeout("connect"), 201)
+    assert resilient_request(send, "POST", "/auth/login", policy=policy).status_code == 201
+
+    send = _replies(requests.ReadTimeout("read"))
+    with pytest.raises(requests.ReadTimeout):
+        resilient_request(send, "POST", "/auth/login", policy=policy)
+
+    send = _replies(500, 200)
+    assert resilient_request(send, "POST", "/records/upload/chunk", idempotent=True, policy=policy).status_code == 200
+
+
+def test_retry_after_is_honoured_up_to_the_cap():
+    policy = RetryPolicy(base_delay=1, max_delay=30)
+
+    assert policy.delay(0, make_response(429, headers={"Retry-After": "7"})) == 7
+    assert policy.delay(0, make_response(429, headers={"Retry-After": "120"})) == 30
+    assert 0 <= policy.delay(10, make_response(503)) <= 30
+
+
+def test_breaker_opens_fails_fast_and_closes_after_a_good_probe(clock):
+    breaker = resilience._breakers.setdefault("GET /slow", CircuitBreaker("GET /slow", failure_threshold=2, reset_timeout=30))
+    policy = RetryPolicy(attempts=1)
+
+    for _ in range(2):
+        resilient_request(_replies(500), "GET", "/slow", policy=policy)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    send = _replies(200)
+    with pytest.raises(CircuitOpenError):
+        resilient_request(send, "GET", "/slow", policy=policy)
+    assert send.calls == 0
+
+    clock.now += 30
+    resilient_request(_replies(500), "GET", "/slow", policy=policy)  # failed probe re-opens at once
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now += 30
+    assert resilient_request(_replies(200), "GET", "/slow", policy=policy).status_code == 200
+    assert breaker.snapshot() == {"name": "GET /slow", "state": "closed", "failures": 0}
+
+
+def test_endpoint_keys_fold_ids():
+    assert endpoint_key("get", "/users/3fa85f64-5717-4562-b3fc-2c963f66afa6/contributions?x=1") == "GET /users/*/contributions"
+    assert endpoint_key("POST", "/records/42") == "POST /records/*"
@@ -0,0 +1,79 @@
+"""Tests for the TTL response cache and the client reads that use it"""
+
+from conftest import FakeSession, make_response
+
+import resilience
+import response_cache
+from api_client import SwechaAPIClient
+from response_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_endpoint_ttl(monkeypatch):
+    """Each endpoint has its own lifetime and endpoints without one are not stored"""
+    clock = Clock()
+    monkeypatch.setattr(response_cache.time, "monotonic", clock)
+    cache = ResponseCache(ttls={"categories": 60})
+
+    cache.set(("categories", "t"), {"data": 1})
+    cache.set(("profile", "t"), {"data": 2})
+    clock.now += 59
+    assert cache.get(("categories", "t")) == {"data": 1}
+    assert cache.get(("profile", "t")) is None
+    clock.now += 2
+    assert cache.get(("categories", "t")) is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2, ttls={"e": 60})
+    cache.set(("e", 1), 1)
+    cache.set(("e", 2), 2)
+    cache.get(("e", 1))
+    cache.set(("e", 3), 3)
+
+    assert cache.get(("e", 2)) is None
+    assert cache.get(("e", 1)) == 1
+
+
+def test_callers_get_copies():
+    """Mutating a returned value never changes what the cache holds"""
+    cache = ResponseCache(ttls={"e": 60})
+    value = {"items": [1]}
+    cache.set(("e",), value)
+    value["items"].append(2)
+    cache.get(("e",))["items"].append(3)
+
+    assert cache.get(("e",)) == {"items": [1]}
+
+
+def test_client_caches_successful_reads_and_invalidates_on_upload(monkeypatch):
+    """Reads are fetched once per login, failures are retried, uploads refresh contributions"""
+    replies = {"/users/u1/contributions": [make_response(500, "down"), make_response(200, {"total": 1}),
+                                            make_response(200, {"total": 2})]}
+
+    def handler(method, url, **kwargs):
+        if url.endswith("/records/upload/chunk") or url.endswith("/records/upload"):
+            return make_response(200, {"id": "record"})
+        return replies[url.split("/api/v1", 1)[1]].pop(0)
+
+    client = SwechaAPIClient(cache=ResponseCache(ttls={"contributions": 60}))
+    client.session = FakeSession(handler)
+    client.auth_token = "token"
+    client.user_data = {"id": "u1"}
+    client.chunk_size = 4
+
+    monkeypatch.setattr(resilience._default_policy, "attempts", 1)  # the 500 is not retried
+
+    assert not client.get_user_contributions("u1")["success"]
+    assert client.get_user_contributions("u1")["data"] == {"total": 1}
+    assert client.get_user_contributions("u1")["data"] == {"total": 1}
+    client.upload_complete_audio(audio_data=b"abc", filename="a.wav", resumable=False,
+                                 notify=False, skip_duplicates=False)
+    assert client.get_user_contributions("u1")["data"] == {"total": 2}
@@ -0,0 +1,94 @@
+"""Tests for banded DTW alignment and recitation scoring"""
+
+import numpy as np
+import pytest
+
+from audio import feature_index, pcm, scoring
+from audio.alignment import banded_dtw, frame_costs
+from audio.pcm import encode_wav
+from audio.scoring import RecitationScorer
+
+
+def _features(n, seed=0):
+    rng = np.random.default_rng(seed)
+    feats = rng.random((n, 3)).astype(np.float32)
+    feats[:, 2] = (feats[:, 2] > 0.3).astype(np.float32)  # voicing flag
+    return feats
+
+
+def _full_dtw(ref, user):
+    """Unbanded textbook DTW with the same frame distance"""
+    n, m = len(ref), len(user)
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for i in range(n):
+        cost = frame_costs(ref, user, 0, m, i)
+        for j in range(m):
+            acc[i + 1, j + 1] = cost[j] + min(acc[i, j], acc[i, j + 1], acc[i + 1, j])
+    return acc[n, m]
+
+
+def test_wide_band_matches_full_dtw():
+    ref, user = _features(40, seed=1), _features(55, seed=2)
+
+    total, path, steps = banded_dtw(ref, user, band_ratio=1.0)
+
+    assert total == pytest.approx(_full_dtw(ref, user), rel=1e-5)
+    assert steps.sum() == pytest.approx(total, rel=1e-5)
+
+
+def test_path_is_monotone_and_spans_both_sequences():
+    ref = _features(30)
+    user = np.repeat(ref, 2, axis=0)  # same recitation at half speed
+
+    total, path, _ = banded_dtw(ref, user, band_ratio=0.1)
+
+    assert total == pytest.approx(0.0, abs=1e-6)
+    assert tuple(path[0]) == (0, 0) and tuple(path[-1]) == (29, 59)
+    assert (np.diff(path, axis=0) >= 0).all()
+
+
+def test_identical_recording_scores_near_full_marks(tmp_path, monkeypatch):
+    rate = 16000
+    t = np.arange(2 * rate) / rate
+    glide = 0.4 * np.sin(2 * np.pi * (180 + 40 * t) * t)
+    wav = encode_wav(glide.astype(np.float32)[:, None], rate)
+    reference = tmp_path / "ref.wav"
+    reference.write_bytes(wav)
+
+    class Cache:
+        def path_for(self, url):
+            return str(reference)
+
+    monkeypatch.setattr(scoring, "get_reference_audio_cache", lambda: Cache())
+
+    result = RecitationScorer(segments=4).score("https://audio.example/12/2.mp3", wav)
+
+    assert result["success"]
+    assert result["data"]["score"] > 99
+    assert result["data"]["tempo_ratio"] == 1.0
+    assert len(result["data"]["segments"]) == 4
+
+
+def test_missing_mp3_decoder_only_disables_comparison(tmp_path, monkeypatch):
+    """The scorer still starts; only the feature build refuses to run"""
+    monkeypatch.setattr(pcm, "SOUNDFILE_AVAILABLE", False)
+    monkeypatch.setattr(pcm.shutil, "which", lambda name: None)
+    reference = tmp_path / "ref.mp3"
+    reference.write_bytes(b"ID3 not really mp3")
+
+    class Cache:
+        def path_for(self, url):
+            return str(reference)
+
+    monkeypatch.setattr(scoring, "get_reference_audio_cache", lambda: Cache())
+
+    assert pcm.compressed_decoder() is None
+    result = RecitationScorer().score("https://audio.example/12/2.mp3", b"RIFF")
+    assert result["success"] is False and "soundfile" in result["data"]["error"]
+    with pytest.raises(SystemExit) as exited:
+        feature_index.main(["build", "--output", str(tmp_path / "features")])
+    assert exited.value.code == 1
+
+    monkeypatch.setattr(pcm.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    assert pcm.require_compressed_decoder() == "ffmpeg"
@@ -0,0 +1,47 @@
+"""Tests for the BM25 sloka search index"""
+
+from database.search_index import SearchIndex, tokenize
+
+SLOKAS = [
+    {"id": "a", "sloka_text_telugu": "మయ్యావేశ్య మనో యే మాం(న్)", "meaning_english": "Those who fix their mind on me"},
+    {"id": "b", "sloka_text_telugu": "ఏవం సతతయుక్తా యే", "meaning_english": "Devotees who are always steadfast"},
+    {"id": "c", "sloka_text_telugu": "ఊర్ధ్వమూలమధఃశాఖమ్", "meaning_english": "The eternal banyan tree, roots above"},
+]
+
+
+def test_tokenize_keeps_telugu_words_whole_and_drops_hints():
+    assert tokenize("మనో యే మాం(న్)", strip_hints=True) == ["మనో", "యే", "మాం"]
+    assert tokenize("Chapter 12: The Mind") == ["chapter", "the", "mind"]
+
+
+def test_ranks_documents_by_bm25():
+    index = SearchIndex.build(SLOKAS, keys=["12.2", "12.1", "15.1"])
+
+    hits = index.search("mind")
+    assert [hit["id"] for hit in hits] == ["12.2"]
+
+    # A rarer term outweighs a common one
+    hits = index.search("who banyan")
+    assert hits[0]["id"] == "15.1"
+    assert {hit["id"] for hit in hits} == {"12.2", "12.1", "15.1"}
+
+
+def test_prefix_matches_count_less_than_exact_words():
+    index = SearchIndex.build([{"id": "x", "meaning_english": "devotee"}, {"id": "y", "meaning_english": "devotees"}])
+
+    hits = index.search("devotee")
+
+    assert [hit["id"] for hit in hits] == ["x", "y"]
+    assert hits[1]["score"] < hits[0]["score"]
+    assert [hit["id"] for hit in SearchIndex.build(SLOKAS).search("ఏవ")] == ["b"]  # search-as-you-type
+
+
+def test_saved_index_is_reused_only_for_the_same_corpus_version(tmp_path):
+    path = str(tmp_path / "search.json")
+    index = SearchIndex.build(SLOKAS, version={"slokas": 3})
+    index.save(path)
+
+    loaded = SearchIndex.load(path, {"slokas": 3})
+    assert loaded.search("banyan") == index.search("banyan")
+    assert SearchIndex.load(path, {"slokas": 4}) is None
+    assert SearchIndex.load(str(tmp_path / "missing.json"), {"slokas": 3}) is None
@@ -0,0 +1,49 @@
+"""Tests for per-session API clients"""
+
+from types import SimpleNamespace
+
+import api_client as api_module
+from api_client import SessionAPIClient, get_api_client, reset_api_client
+
+
+def _use_session(monkeypatch, state):
+    monkeypatch.setattr(api_module, "_in_streamlit_session", lambda: True)
+    monkeypatch.setattr(api_module, "st", SimpleNamespace(session_state=state))
+
+
+def test_each_session_gets_its_own_client(monkeypatch):
+    """Tokens set through the proxy stay in the calling session"""
+    first_state, second_state = {}, {}
+    proxy = SessionAPIClient()
+
+    _use_session(monkeypatch, first_state)
+    proxy.auth_token = "first-token"
+    first = get_api_client()
+    _use_session(monkeypatch, second_state)
+    second = get_api_client()
+
+    assert first is not second
+    assert first.auth_token == "first-token"
+    assert second.auth_token is None
+    assert proxy.auth_token is None
+
+
+def test_reset_drops_the_session_client(monkeypatch):
+    """Logging out leaves no credentials behind for the next request"""
+    state = {}
+    _use_session(monkeypatch, state)
+    get_api_client().auth_token = "token"
+
+    reset_api_client()
+
+    assert get_api_client().auth_token is None
+
+
+def test_scripts_share_a_process_client():
+    """Outside a Streamlit run every caller gets the same client until reset"""
+    reset_api_client()
+    client = get_api_client()
+
+    assert get_api_client() is client
+    reset_api_client()
+    assert get_api_client() is not client
@@ -0,0 +1,98 @@
+"""Tests for coalescing concurrent identical reads"""
+
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def _run_concurrently(flight, key, fn, callers):
+    """Start ``callers`` threads on ``flight.do(key, fn)`` once the first is inside ``fn``"""
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call, daemon=True)
+    leader.start()
+    fn.entered.wait(5)
+    waiters = [threading.Thread(target=call, daemon=True) for _ in range(callers - 1)]
+    for thread in waiters:
+        thread.start()
+    # Waiters register under the lock before blocking; release the leader once all have joined
+    while flight._in_flight[key].waiters < callers - 1:
+        time.sleep(0.001)
+    fn.release.set()
+    for thread in [leader] + waiters:
+        thread.join(5)
+    return results, errors
+
+
+def _blocking(result=None, error=None):
+    def fn():
+        fn.calls += 1
+        fn.entered.set()
+        fn.release.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    fn.calls = 0
+    fn.entered, fn.release = threading.Event(), threading.Event()
+    return fn
+
+
+def test_concurrent_callers_share_one_call_and_get_their_own_copy():
+    flight = SingleFlight()
+    fn = _blocking(result={"chapters": [1, 2]})
+
+    results, errors = _run_concurrently(flight, "chapters", fn, callers=4)
+
+    assert fn.calls == 1 and errors == []
+    assert results == [{"chapters": [1, 2]}] * 4
+    results[0]["chapters"].append(3)
+    assert all(r["chapters"] == [1, 2] for r in results[1:])
+    assert flight.stats() == {"calls": 1, "shared": 3, "in_flight": 0}
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    fn = _blocking(error=ValueError("backend down"))
+
+    results, errors = _run_concurrently(flight, "chapters", fn, callers=3)
+
+    assert fn.calls == 1 and results == []
+    assert [str(e) for e in errors] == ["backend down"] * 3
+
+
+def test_nothing_is_cached_after_the_call_returns():
+    flight = SingleFlight()
+    calls = []
+
+    assert flight.do("k", lambda: calls.append(1) or len(calls)) == 1
+    assert flight.do("k", lambda: calls.append(1) or len(calls)) == 2
+    with pytest.raises(KeyError):
+        flight.do("k", lambda: {}["missing"])
+    assert flight.stats()["in_flight"] == 0
+
+
+class _Uncopyable:
+    def __deepcopy__(self, memo):
+        raise TypeError("cannot pickle '_io.BufferedReader' object")
+
+
+def test_waiters_are_released_when_the_result_cannot_be_copied():
+    flight = SingleFlight()
+    value = _Uncopyable()
+    fn = _blocking(result=value)
+
+    results, errors = _run_concurrently(flight, "slokas", fn, callers=2)
+
+    assert results == [value]  # the leader keeps its own result
+    assert [type(e) for e in errors] == [TypeError]
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,65 @@
+"""Tests for loading the corpus from Supabase in one embedded query"""
+
+from types import SimpleNamespace
+
+from database.backends import SupabaseBackend
+from database.db_utils import DatabaseManager
+
+
+class FakeQuery:
+    """Just enough of the postgrest builder for ``SupabaseBackend.load_corpus``"""
+
+    def __init__(self, rows, log):
+        self.rows = rows
+        self.log = log
+        self.start = self.end = None
+
+    def select(self, columns):
+        self.log.append(columns)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.start, self.end = start, end
+        return self
+
+    def execute(self):
+        page = self.rows[self.start:self.end + 1]
+        # Each request returns fresh row dicts, as the real client does
+        return SimpleNamespace(data=[dict(row, slokas=[dict(s) for s in row["slokas"]]) for row in page])
+
+
+def _backend(chapter_count, page_size):
+    rows = [{"id": f"c{n}", "chapter_number": n,
+             "slokas": [{"id": f"c{n}s{k}", "sloka_number": k} for k in (2, 1)]}
+            for n in range(1, chapter_count + 1)]
+    log = []
+    backend = SupabaseBackend.__new__(SupabaseBackend)
+    backend.page_size = page_size
+    backend.supabase = SimpleNamespace(table=lambda name: FakeQuery(rows, log))
+    return backend, log
+
+
+def test_chapters_and_slokas_load_in_one_request_per_page():
+    backend, log = _backend(chapter_count=5, page_size=2)
+
+    chapters, slokas = backend.load_corpus()
+
+    assert log == ["*, slokas(*)"] * 3
+    assert [ch["chapter_number"] for ch in chapters] == [1, 2, 3, 4, 5]
+    assert all("slokas" not in ch for ch in chapters)
+    assert len(slokas) == 10
+    assert slokas[0] == {"id": "c1s2", "sloka_number": 2, "chapter_id": "c1"}
+
+
+def test_sloka_lookups_are_served_from_the_index():
+    backend, log = _backend(chapter_count=2, page_size=1000)
+    backend.corpus_version = lambda: "v1"
+    db = DatabaseManager(backend)
+
+    assert db.get_sloka_by_chapter_and_number("c2", 1)["id"] == "c2s1"
+    assert [s["sloka_number"] for s in db.get_slokas_by_chapter("c1")] == [1, 2]
+    assert db.get_sloka_by_chapter_and_number("c2", 9) is None
+    assert len(log) == 1
@@ -0,0 +1,80 @@
+"""Tests for pre-upload audio encoding"""
+
+import io
+
+import numpy as np
+import pytest
+
+import config
+from audio import transcode
+from audio.pcm import decode_wav, encode_wav, wav_sample_width
+from audio.transcode import transcode_for_upload
+
+
+def _stereo_wav(seconds=1.0, rate=44100, sample_width=2):
+    t = np.arange(int(seconds * rate)) / rate
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    return encode_wav(np.stack([tone, tone], axis=1).astype(np.float32), rate, sample_width)
+
+
+def test_defaults_are_lossless_at_the_recorded_rate_and_channels():
+    assert config.UPLOAD_ENCODE_FORMAT == "flac"
+    assert config.UPLOAD_ENCODE_MONO is False
+    assert config.UPLOAD_ENCODE_SAMPLE_RATE == 0
+
+
+def test_off_uploads_the_recording_unchanged():
+    data = _stereo_wav()
+    result = transcode_for_upload(data, "take.wav", fmt="off")
+
+    assert result.data is data and not result.changed
+    assert result.summary() == f"{len(data) / 1e6:.2f} MB (uploaded as recorded)"
+
+
+def test_wav_downmix_and_resample_are_applied_when_asked():
+    data = _stereo_wav()
+    result = transcode_for_upload(data, "take.wav", fmt="wav", mono=True, sample_rate=16000)
+
+    samples, rate = decode_wav(result.data)
+    assert (rate, samples.shape[1]) == (16000, 1)
+    assert result.changed and result.filename == "take.wav"
+    assert 0.8 < result.reduction < 0.85
+    assert result.summary().endswith(f"WAV ({result.reduction:.0%} smaller)")
+
+
+def test_missing_encoder_falls_back_to_the_original(monkeypatch):
+    monkeypatch.setattr(transcode, "SOUNDFILE_AVAILABLE", False)
+    monkeypatch.setattr(transcode.shutil, "which", lambda name: None)
+    data = _stereo_wav()
+
+    result = transcode_for_upload(data, "take.wav", fmt="flac")
+
+    assert result.data is data and result.codec == "original"
+
+
+def test_24_bit_wav_round_trips():
+    samples = np.linspace(-1.0, 1.0, 1001, dtype=np.float32)[:, None]
+    data = encode_wav(samples, 48000, sample_width=3)
+
+    decoded, rate = decode_wav(data)
+    assert (wav_sample_width(data), rate) == (3, 48000)
+    assert np.abs(decoded - samples).max() < 2e-7
+
+
+@pytest.mark.parametrize("sample_width, subtype", [(2, "PCM_16"), (3, "PCM_24")])
+def test_flac_keeps_the_recorded_bit_depth(sample_width, subtype):
+    sf = pytest.importorskip("soundfile")
+    result = transcode_for_upload(_stereo_wav(sample_width=sample_width), "take.wav", fmt="flac")
+
+    assert result.codec == "flac"
+    assert sf.info(io.BytesIO(result.data)).subtype == subtype
+
+
+def test_ffmpeg_fallback_is_fed_24_bit_audio(monkeypatch):
+    sent = []
+    monkeypatch.setattr(transcode, "SOUNDFILE_AVAILABLE", False)
+    monkeypatch.setattr(transcode, "_encode_ffmpeg", lambda data, fmt, mono, sample_rate: sent.append(data))
+
+    transcode_for_upload(_stereo_wav(sample_width=3), "take.wav", fmt="flac", mono=True)
+
+    assert wav_sample_width(sent[0]) == 3
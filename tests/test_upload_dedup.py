@@ -0,0 +1,75 @@
+"""Tests for the content-hash dedup index and its use by uploads"""
+
+import hashlib
+
+import pytest
+from test_upload_manifest import FlakyServer, _client
+
+import api_client
+from upload_dedup import PENDING, UPLOADED, DedupIndex
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-upload: nothing gets to clean up"""
+
+
+class CrashingServer(FlakyServer):
+    def __call__(self, method, url, **kwargs):
+        if url.endswith("/records/upload/chunk") and kwargs["data"]["chunk_index"] == 1:
+            raise Crash()
+        return super().__call__(method, url, **kwargs)
+
+
+@pytest.fixture
+def dedup(tmp_path, monkeypatch):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"))
+    monkeypatch.setattr(api_client, "get_dedup_index", lambda: index)
+    return index
+
+
+def _content_hash():
+    return hashlib.sha256(b"0123456789").hexdigest()
+
+
+def _upload(client):
+    return client.upload_complete_audio(audio_data=b"0123456789", filename="take.wav", max_in_flight=1, notify=False)
+
+
+def test_claim_lifecycle(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.sqlite3"), pending_timeout=60)
+
+    assert index.claim("u1", "hash", "uuid-1", "take.wav", 10) is None
+    assert index.claim("u1", "hash", "uuid-2", "take.wav", 10)["status"] == PENDING
+    assert index.claim("u2", "hash", "uuid-3", "take.wav", 10) is None  # per user
+
+    index.release("u1", "hash")
+    assert index.lookup("u1", "hash") is None
+
+    assert index.claim("u1", "hash", "uuid-2", "take.wav", 10) is None
+    index.complete("u1", "hash", {"id": "record-1"})
+    entry = index.claim("u1", "hash", "uuid-2", "take.wav", 10)
+    assert (entry["status"], entry["record"]) == (UPLOADED, {"id": "record-1"})
+
+
+def test_resumed_upload_owns_the_claim_its_crashed_attempt_left(tmp_path, dedup):
+    with pytest.raises(Crash):
+        _upload(_client(CrashingServer(), tmp_path / "manifests"))
+    assert dedup.lookup("user-1", _content_hash())["status"] == PENDING
+
+    server = FlakyServer()
+    result = _upload(_client(server, tmp_path / "manifests"))
+
+    assert result["success"] and not result.get("duplicate")
+    assert [index for _, index in server.received] == [1, 2]
+    assert dedup.lookup("user-1", _content_hash())["status"] == UPLOADED
+
+    again = _upload(_client(FlakyServer(), tmp_path / "manifests"))
+    assert again["duplicate"] and again["success"]
+
+
+def test_a_different_upload_of_claimed_content_is_a_duplicate(tmp_path, dedup):
+    dedup.claim("user-1", _content_hash(), "someone-elses-uuid", "take.wav", 10)
+
+    result = _upload(_client(FlakyServer(), tmp_path / "manifests"))
+
+    assert (result["success"], result["status_code"]) == (False, 409)
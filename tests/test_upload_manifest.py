@@ -0,0 +1,80 @@
+"""Tests for resuming chunked uploads from a manifest"""
+
+from conftest import FakeSession, make_response
+
+from api_client import SwechaAPIClient
+from upload_manifest import ManifestStore
+
+
+class FlakyServer:
+    """Chunk endpoint that rejects the chunks listed in ``failing`` and records the rest"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.received = []
+        self.finalized = []
+
+    def __call__(self, method, url, **kwargs):
+        data = kwargs["data"]
+        if url.endswith("/records/upload/chunk"):
+            if data["chunk_index"] in self.failing:
+                return make_response(400, {"detail": "rejected"})
+            self.received.append((data["upload_uuid"], data["chunk_index"]))
+            return make_response(200, {"ok": True})
+        self.finalized.append((data["upload_uuid"], data["filename"]))
+        return make_response(201, {"id": "record-1"})
+
+
+def _client(server, manifest_dir):
+    client = SwechaAPIClient()
+    client.session = FakeSession(server)
+    client.auth_token = "token"
+    client.user_data = {"id": "user-1"}
+    client.chunk_size = 4
+    client.manifests = ManifestStore(str(manifest_dir))
+    return client
+
+
+def _upload(client, **kwargs):
+    return client.upload_complete_audio(audio_data=b"0123456789", max_in_flight=1, notify=False,
+                                        skip_duplicates=False, **kwargs)
+
+
+def test_retry_resumes_with_the_same_uuid_and_only_missing_chunks(tmp_path):
+    """A failed upload leaves a manifest; a fresh client finishes it"""
+    first = FlakyServer(failing={1})
+    assert not _upload(_client(first, tmp_path), filename="take.wav")["success"]
+    [(upload_uuid, acked)] = first.received
+    assert acked == 0
+
+    second = FlakyServer()
+    result = _upload(_client(second, tmp_path), filename="take.wav")
+
+    assert result["success"]
+    assert second.received == [(upload_uuid, 1), (upload_uuid, 2)]
+    assert second.finalized == [(upload_uuid, "take.wav")]
+    assert list(tmp_path.iterdir()) == []  # manifest removed after finalize
+
+
+def test_nameless_uploads_resume_under_a_content_derived_name(tmp_path):
+    """Uploads without a filename get the same name on retry, so they can resume"""
+    first = FlakyServer(failing={2})
+    assert not _upload(_client(first, tmp_path))["success"]
+
+    second = FlakyServer()
+    assert _upload(_client(second, tmp_path))["success"]
+
+    [(upload_uuid, filename)] = second.finalized
+    assert filename.startswith("audio_") and filename.endswith(".wav")
+    assert {uuid for uuid, _ in first.received} == {upload_uuid}
+    assert [index for _, index in second.received] == [2]
+
+
+def test_manifest_is_dropped_when_content_changes(tmp_path):
+    """Chunk hashes that no longer match mean the partial upload can't be reused"""
+    store = ManifestStore(str(tmp_path))
+    store.create("user-1", "uuid-1", "take.wav", "content", 4, 10, ["a", "b", "c"])
+
+    assert store.find("user-1", "take.wav", "content", 4, ["a", "b", "c"]).upload_uuid == "uuid-1"
+    assert store.find("user-1", "take.wav", "content", 4, ["a", "x", "c"]) is None
+    assert store.chunk_size_for("user-1", "take.wav", "content") is None
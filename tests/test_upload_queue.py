@@ -0,0 +1,172 @@
+"""Tests for the durable background upload queue"""
+
+import os
+import sqlite3
+import stat
+import time
+
+from conftest import make_response
+from test_upload_manifest import FlakyServer, _client
+
+import api_client
+from upload_dedup import DedupIndex
+from upload_queue import DONE, FAILED, QUEUED, RUNNING, UploadQueue
+
+
+class FixedDelay:
+    """Retry policy stand-in with a predictable backoff"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.attempts = []
+
+    def delay(self, attempt, response=None):
+        self.attempts.append(attempt)
+        return self.seconds
+
+
+class FakeClient:
+    """Records the credentials it was given and returns canned upload results"""
+
+    def __init__(self, results):
+        self.results = results
+        self.auth_token = None
+        self.user_data = None
+        self.seen = []
+
+    def upload_complete_audio(self, filepath, progress_callback=None, notify=True, **params):
+        self.seen.append((self.auth_token, params["title"]))
+        progress_callback(1, 1, os.path.getsize(filepath))
+        return self.results.pop(0)
+
+
+def _queue(tmp_path, results, **kwargs):
+    client = FakeClient(results)
+    # No worker threads: the tests drive _claim/_run themselves
+    queue = UploadQueue(db_path=str(tmp_path / "queue.sqlite3"), spool_dir=str(tmp_path / "spool"),
+                        workers=0, client_factory=lambda: client, **kwargs)
+    return queue, client
+
+
+def _enqueue(queue, title="Sloka 12.2"):
+    return queue.enqueue(b"RIFF audio", "12_2.wav", title, "cat", "telugu", "creator", "", "token-123", {"id": "u1"})
+
+
+def _row(queue, job_id):
+    return queue._connect().execute("SELECT * FROM upload_jobs WHERE id = ?", (job_id,)).fetchone()
+
+
+def test_database_is_created_owner_only(tmp_path):
+    queue, _ = _queue(tmp_path, [])
+    assert stat.S_IMODE(os.stat(queue.db_path).st_mode) == 0o600
+
+
+def test_finished_job_drops_credentials_and_spooled_audio(tmp_path):
+    queue, client = _queue(tmp_path, [{"success": True, "data": {"id": "rec-1"}}])
+    job_id = _enqueue(queue)
+
+    queue._run(queue._claim())
+
+    status = queue.status(job_id)
+    assert status["status"] == DONE
+    assert status["result"] == {"id": "rec-1"}
+    assert client.seen == [("token-123", "Sloka 12.2")]
+    row = _row(queue, job_id)
+    assert row["auth_token"] is None and row["user_data"] is None
+    assert not os.path.exists(row["spool_path"])
+
+
+def test_retryable_failures_requeue_until_attempts_run_out(tmp_path):
+    failure = {"success": False, "status_code": 503, "data": {"error": "busy"}}
+    queue, _ = _queue(tmp_path, [dict(failure), dict(failure)], max_attempts=2, retry_policy=FixedDelay(0))
+    job_id = _enqueue(queue)
+
+    queue._run(queue._claim())
+    assert queue.status(job_id)["status"] == QUEUED
+    assert _row(queue, job_id)["auth_token"] == "token-123"
+
+    queue._run(queue._claim())
+    status = queue.status(job_id)
+    assert (status["status"], status["error"], status["attempts"]) == (FAILED, "busy", 2)
+    assert _row(queue, job_id)["auth_token"] is None
+
+
+def test_running_job_without_heartbeat_is_requeued(tmp_path):
+    """A job whose worker died mid-upload is picked up again"""
+    queue, _ = _queue(tmp_path, [], stale_after=60)
+    job_id = _enqueue(queue)
+    assert queue._claim()["id"] == job_id
+    assert queue._claim() is None  # still running with a fresh heartbeat
+
+    queue._update(job_id, heartbeat_at=time.time() - 61)
+
+    assert queue._claim()["id"] == job_id
+    assert queue.status(job_id)["status"] == RUNNING
+    assert queue.status(job_id)["attempts"] == 2
+
+
+def test_old_finished_jobs_are_purged(tmp_path):
+    queue, _ = _queue(tmp_path, [{"success": True, "data": {}}], retention=3600)
+    old, recent = _enqueue(queue, "old"), _enqueue(queue, "recent")
+    queue._run(queue._claim())
+    queue._update(recent, status=FAILED)
+    queue._connect().execute("UPDATE upload_jobs SET updated_at = ? WHERE id = ?", (time.time() - 7200, old))
+
+    queue._claim()
+
+    assert queue.status(old) is None
+    assert queue.status(recent)["status"] == FAILED
+
+
+def test_retries_wait_for_their_backoff(tmp_path):
+    failure = {"success": False, "status_code": None, "data": {"error": "connection reset"}}
+    policy = FixedDelay(30)
+    queue, _ = _queue(tmp_path, [dict(failure)], retry_policy=policy, stale_after=120)
+    job_id = _enqueue(queue)
+
+    queue._run(queue._claim())
+
+    assert queue.status(job_id)["status"] == QUEUED
+    assert policy.attempts == [0]
+    assert queue._claim() is None  # not due yet
+    assert 29 < queue._idle_wait() <= 30
+
+    queue._update(job_id, next_attempt_at=time.time() - 1)
+    assert queue._claim()["id"] == job_id
+
+
+class RejectingFinalize(FlakyServer):
+    def __call__(self, method, url, **kwargs):
+        if url.endswith("/records/upload"):
+            return make_response(422, {"detail": "category_id is invalid"})
+        return super().__call__(method, url, **kwargs)
+
+
+def test_permanent_finalize_errors_are_not_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(api_client, "get_dedup_index", lambda: DedupIndex(str(tmp_path / "dedup.sqlite3")))
+    client = _client(RejectingFinalize(), tmp_path / "manifests")
+    queue = UploadQueue(db_path=str(tmp_path / "queue.sqlite3"), spool_dir=str(tmp_path / "spool"),
+                        workers=0, retry_policy=FixedDelay(0), client_factory=lambda: client)
+    job_id = _enqueue(queue)
+
+    queue._run(queue._claim())
+
+    status = queue.status(job_id)
+    assert (status["status"], status["attempts"]) == (FAILED, 1)
+
+
+def test_queue_files_from_before_backoff_are_migrated(tmp_path):
+    db_path = tmp_path / "queue.sqlite3"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute("CREATE TABLE upload_jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, spool_path TEXT NOT NULL,"
+                 " params TEXT NOT NULL, auth_token TEXT, user_data TEXT, attempts INTEGER NOT NULL DEFAULT 0,"
+                 " chunks_done INTEGER NOT NULL DEFAULT 0, total_chunks INTEGER NOT NULL DEFAULT 0,"
+                 " bytes_sent INTEGER NOT NULL DEFAULT 0, total_bytes INTEGER NOT NULL DEFAULT 0,"
+                 " bytes_per_sec REAL NOT NULL DEFAULT 0, error TEXT, result TEXT, created_at REAL NOT NULL,"
+                 " updated_at REAL NOT NULL, heartbeat_at REAL)")
+    conn.commit()
+    conn.close()
+
+    queue, _ = _queue(tmp_path, [])
+
+    assert queue._claim() is None
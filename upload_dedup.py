@@ -0,0 +1,130 @@
+"""
+Local index of uploaded audio content, keyed by user and SHA-256.
+
+``upload_complete_audio`` claims the content hash before sending anything.
+A hash already recorded as uploaded (or being uploaded right now by another
+thread or process) is a duplicate and can be answered from the index
+instead of sending the audio again. Entries for uploads that failed are
+released so the content can be retried. A claim left behind by a crashed
+process belongs to the upload that made it: resuming that upload (same
+``upload_uuid``, from its manifest) takes the claim over, and anyone else
+waits until it expires after ``UPLOAD_DEDUP_PENDING_SECONDS``.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from config import UPLOAD_DEDUP_DB, UPLOAD_DEDUP_PENDING_SECONDS
+
+PENDING = "pending"
+UPLOADED = "uploaded"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploaded_content (
+    user_id TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    upload_uuid TEXT,
+    filename TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    record TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, content_hash)
+);
+"""
+
+
+class DedupIndex:
+    """SQLite table of content hashes a user has uploaded or is uploading"""
+
+    def __init__(self, db_path: str = UPLOAD_DEDUP_DB, pending_timeout: float = UPLOAD_DEDUP_PENDING_SECONDS):
+        self.db_path = db_path
+        self.pending_timeout = pending_timeout
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _entry(row: sqlite3.Row) -> Dict:
+        entry = dict(row)
+        entry["record"] = json.loads(entry["record"]) if entry["record"] else None
+        return entry
+
+    def lookup(self, user_id: str, content_hash: str) -> Optional[Dict]:
+        """The live entry for this content, or None if it hasn't been uploaded"""
+        row = self._connect().execute(
+            "SELECT * FROM uploaded_content WHERE user_id = ? AND content_hash = ?", (user_id, content_hash)
+        ).fetchone()
+        if row is None or (row["status"] == PENDING and time.time() - row["updated_at"] > self.pending_timeout):
+            return None
+        return self._entry(row)
+
+    def claim(self, user_id: str, content_hash: str, upload_uuid: str, filename: str, size: int) -> Optional[Dict]:
+        """Mark content as being uploaded.
+
+        Returns None if the caller now owns the upload, or the existing
+        entry if the content is already uploaded or claimed by another
+        upload. A pending claim made under the same ``upload_uuid`` is the
+        caller's own (a resumed upload) and is renewed.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = self.lookup(user_id, content_hash)
+            if existing is not None and existing["status"] == PENDING and existing["upload_uuid"] == upload_uuid:
+                existing = None
+            if existing is None:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO uploaded_content"
+                    " (user_id, content_hash, status, upload_uuid, filename, size, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (user_id, content_hash, PENDING, upload_uuid, filename, size, now, now),
+                )
+            conn.execute("COMMIT")
+            return existing
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def complete(self, user_id: str, content_hash: str, record: Optional[Dict]):
+        """Record a finished upload and the record the server created"""
+        self._connect().execute(
+            "UPDATE uploaded_content SET status = ?, record = ?, updated_at = ? WHERE user_id = ? AND content_hash = ?",
+            (UPLOADED, json.dumps(record, default=str), time.time(), user_id, content_hash),
+        )
+
+    def release(self, user_id: str, content_hash: str):
+        """Drop a pending claim after a failed upload so the content can be retried"""
+        self._connect().execute(
+            "DELETE FROM uploaded_content WHERE user_id = ? AND content_hash = ? AND status = ?",
+            (user_id, content_hash, PENDING),
+        )
+
+
+_dedup_instance = None
+_dedup_lock = threading.Lock()
+
+
+def get_dedup_index() -> DedupIndex:
+    """Get the process-wide dedup index, creating it if necessary"""
+    global _dedup_instance
+    if _dedup_instance is None:
+        with _dedup_lock:
+            if _dedup_instance is None:
+                _dedup_instance = DedupIndex()
+    return _dedup_instance
@@ -0,0 +1,151 @@
+"""
+On-disk manifests for resumable chunked uploads.
+
+A manifest records which chunks of an upload the server has acknowledged,
+so a retry after a failed chunk (or a crashed process) reuses the same
+``upload_uuid`` and only sends what is still missing.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from config import UPLOAD_MANIFEST_DIR, UPLOAD_MANIFEST_MAX_AGE
+
+
+def sha256_hex(data) -> str:
+    """Hex SHA-256 of a bytes-like object"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadManifest:
+    """Progress record for one chunked upload"""
+
+    def __init__(self, path: str, upload_uuid: str, filename: str, content_hash: str, chunk_size: int,
+                 total_size: int, chunk_hashes: List[str], acked: Optional[List[int]] = None,
+                 created_at: Optional[float] = None):
+        self.path = path
+        self.upload_uuid = upload_uuid
+        self.filename = filename
+        self.content_hash = content_hash
+        self.chunk_size = chunk_size
+        self.total_size = total_size
+        self.chunk_hashes = chunk_hashes
+        self.acked = set(acked or [])
+        self.created_at = created_at or time.time()
+
+    @property
+    def total_chunks(self) -> int:
+        return len(self.chunk_hashes)
+
+    def missing_chunks(self) -> List[int]:
+        return [i for i in range(self.total_chunks) if i not in self.acked]
+
+    def mark_acked(self, chunk_index: int):
+        """Record an acknowledged chunk and persist immediately"""
+        self.acked.add(chunk_index)
+        self.save()
+
+    def to_dict(self) -> Dict:
+        return {
+            "upload_uuid": self.upload_uuid,
+            "filename": self.filename,
+            "content_hash": self.content_hash,
+            "chunk_size": self.chunk_size,
+            "total_size": self.total_size,
+            "chunk_hashes": self.chunk_hashes,
+            "acked": sorted(self.acked),
+            "created_at": self.created_at,
+        }
+
+    def save(self):
+        """Write the manifest atomically so a crash never leaves a torn file"""
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def load(cls, path: str) -> Optional["UploadManifest"]:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(path=path, **data)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Ignoring unreadable upload manifest {path}: {e}")
+            return None
+
+
+class ManifestStore:
+    """Directory of upload manifests keyed by user, filename and content"""
+
+    def __init__(self, directory: str = UPLOAD_MANIFEST_DIR, max_age: float = UPLOAD_MANIFEST_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+
+    def _path(self, user_id: str, filename: str, content_hash: str) -> str:
+        key = sha256_hex(f"{user_id}\0{filename}\0{content_hash}".encode())
+        return os.path.join(self.directory, f"{key}.json")
+
+    def chunk_size_for(self, user_id: str, filename: str, content_hash: str) -> Optional[int]:
+        """Chunk size of an unexpired partial upload of this content, if any.
+
+        A retry has to keep that size: the server already holds chunks cut
+        at it, and chunk sizes are otherwise re-planned for every upload.
+        """
+        path = self._path(user_id, filename, content_hash)
+        if not os.path.exists(path):
+            return None
+        manifest = UploadManifest.load(path)
+        if manifest is None or time.time() - manifest.created_at > self.max_age:
+            return None
+        return manifest.chunk_size
+
+    def find(self, user_id: str, filename: str, content_hash: str, chunk_size: int,
+             chunk_hashes: List[str]) -> Optional[UploadManifest]:
+        """Return a resumable manifest for this exact content, if one exists.
+
+        Manifests older than ``max_age`` (the server may have discarded the
+        partial upload) or whose chunk hashes no longer match are dropped.
+        """
+        path = self._path(user_id, filename, content_hash)
+        if not os.path.exists(path):
+            return None
+        manifest = UploadManifest.load(path)
+        if manifest is None:
+            return None
+        if (time.time() - manifest.created_at > self.max_age or manifest.chunk_size != chunk_size
+                or manifest.chunk_hashes != chunk_hashes):
+            manifest.delete()
+            return None
+        return manifest
+
+    def create(self, user_id: str, upload_uuid: str, filename: str, content_hash: str, chunk_size: int,
+               total_size: int, chunk_hashes: List[str]) -> UploadManifest:
+        manifest = UploadManifest(
+            path=self._path(user_id, filename, content_hash),
+            upload_uuid=upload_uuid,
+            filename=filename,
+            content_hash=content_hash,
+            chunk_size=chunk_size,
+            total_size=total_size,
+            chunk_hashes=chunk_hashes,
+        )
+        manifest.save()
+        return manifest
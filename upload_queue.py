@@ -0,0 +1,353 @@
+"""
+Durable background queue for audio uploads.
+
+The Streamlit script thread only spools the audio to disk and inserts a job
+row; a pool of worker threads picks jobs up, runs the chunked upload with a
+progress callback and writes status back to SQLite. Because jobs and their
+audio live on disk, uploads queued before a crash or restart are picked up
+again (running jobs whose heartbeat went stale are requeued, and the upload
+manifest resumes them from the last acknowledged chunk). Jobs that failed
+with a transient error are retried after a full-jitter backoff
+(``resilience.RetryPolicy``); permanent errors (4xx other than 429) fail the
+job straight away.
+
+The job row holds the user's bearer token so a restarted worker can finish
+the upload. The token and user data are cleared as soon as the job is done or
+has failed, the queue file is created readable by its owner only, and
+finished jobs are deleted once they are older than
+``UPLOAD_QUEUE_RETENTION_SECONDS``.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from config import (
+    UPLOAD_QUEUE_DB,
+    UPLOAD_QUEUE_MAX_ATTEMPTS,
+    UPLOAD_QUEUE_RETENTION_SECONDS,
+    UPLOAD_QUEUE_RETRY_BACKOFF,
+    UPLOAD_QUEUE_RETRY_MAX_DELAY,
+    UPLOAD_QUEUE_SPOOL_DIR,
+    UPLOAD_QUEUE_STALE_SECONDS,
+    UPLOAD_QUEUE_WORKERS,
+)
+from resilience import RetryPolicy
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+_FINISHED = (DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    spool_path TEXT NOT NULL,
+    params TEXT NOT NULL,
+    auth_token TEXT,
+    user_data TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    chunks_done INTEGER NOT NULL DEFAULT 0,
+    total_chunks INTEGER NOT NULL DEFAULT 0,
+    bytes_sent INTEGER NOT NULL DEFAULT 0,
+    total_bytes INTEGER NOT NULL DEFAULT 0,
+    bytes_per_sec REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    result TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    heartbeat_at REAL,
+    next_attempt_at REAL
+);
+CREATE INDEX IF NOT EXISTS upload_jobs_status ON upload_jobs (status, created_at);
+"""
+
+# Columns returned to the UI; credentials and spool paths stay internal
+_PUBLIC_COLUMNS = (
+    "id", "status", "attempts", "chunks_done", "total_chunks", "bytes_sent", "total_bytes",
+    "bytes_per_sec", "error", "result", "created_at", "updated_at",
+)
+
+
+def _default_client_factory():
+    from api_client import SwechaAPIClient
+
+    return SwechaAPIClient()
+
+
+class UploadQueue:
+    """SQLite-backed job queue drained by background worker threads"""
+
+    def __init__(self, db_path: str = UPLOAD_QUEUE_DB, spool_dir: str = UPLOAD_QUEUE_SPOOL_DIR,
+                 workers: int = UPLOAD_QUEUE_WORKERS, max_attempts: int = UPLOAD_QUEUE_MAX_ATTEMPTS,
+                 stale_after: float = UPLOAD_QUEUE_STALE_SECONDS, retention: float = UPLOAD_QUEUE_RETENTION_SECONDS,
+                 retry_policy: Optional[RetryPolicy] = None, client_factory: Callable = None):
+        self.db_path = db_path
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+        self.retention = retention
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts, UPLOAD_QUEUE_RETRY_BACKOFF, UPLOAD_QUEUE_RETRY_MAX_DELAY)
+        self.client_factory = client_factory or _default_client_factory
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._threads: List[threading.Thread] = []
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        os.makedirs(spool_dir, mode=0o700, exist_ok=True)
+        # The rows hold bearer tokens: create the file owner-only before SQLite opens it
+        os.close(os.open(db_path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(db_path, 0o600)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(upload_jobs)")}
+            if "next_attempt_at" not in columns:
+                # Queue files created before retries were delayed
+                conn.execute("ALTER TABLE upload_jobs ADD COLUMN next_attempt_at REAL")
+            # Rows finished before credentials were cleared on completion
+            conn.execute(
+                "UPDATE upload_jobs SET auth_token = NULL, user_data = NULL WHERE status IN (?, ?)", _FINISHED
+            )
+
+    # ---------------- Storage ----------------
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; WAL lets the UI read while workers write"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # SQLite gives the -wal/-shm files the main file's permissions
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _update(self, job_id: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(f"UPDATE upload_jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def _finish(self, job_id: str, status: str, **fields):
+        """Move a job to a terminal state, dropping the credentials it no longer needs"""
+        self._update(job_id, status=status, auth_token=None, user_data=None, **fields)
+
+    # ---------------- Producer side ----------------
+    def enqueue(self, audio_data: bytes, filename: str, title: str, category_id: str, language: str,
+                release_rights: str, description: str, auth_token: str, user_data: Dict) -> str:
+        """Spool ``audio_data`` to disk, queue an upload job and return its id"""
+        job_id = uuid.uuid4().hex
+        spool_path = os.path.join(self.spool_dir, f"{job_id}.audio")
+        tmp_path = f"{spool_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio_data)
+        os.replace(tmp_path, spool_path)
+
+        params = {
+            "filename": filename,
+            "title": title,
+            "category_id": category_id,
+            "language": language,
+            "release_rights": release_rights,
+            "description": description,
+        }
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO upload_jobs (id, status, spool_path, params, auth_token, user_data, total_bytes, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, QUEUED, spool_path, json.dumps(params), auth_token, json.dumps(user_data or {}),
+             len(audio_data), now, now),
+        )
+        self.start()
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Current state and progress of a job, or None if unknown"""
+        row = self._connect().execute(
+            f"SELECT {', '.join(_PUBLIC_COLUMNS)} FROM upload_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def statuses(self, job_ids: List[str]) -> List[Dict]:
+        return [job for job in (self.status(job_id) for job_id in job_ids) if job]
+
+    # ---------------- Workers ----------------
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._wakeup:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"upload-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = None):
+        """Ask workers to exit after their current job; queued jobs stay on disk"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _requeue_stale(self, conn: sqlite3.Connection):
+        """Return jobs whose worker died (no heartbeat for ``stale_after`` seconds) to the queue"""
+        conn.execute(
+            "UPDATE upload_jobs SET status = ?, updated_at = ? WHERE status = ? AND heartbeat_at < ?",
+            (QUEUED, time.time(), RUNNING, time.time() - self.stale_after),
+        )
+
+    def _purge_finished(self, conn: sqlite3.Connection):
+        """Delete done and failed jobs last touched more than ``retention`` seconds ago"""
+        conn.execute(
+            "DELETE FROM upload_jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (*_FINISHED, time.time() - self.retention),
+        )
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._requeue_stale(conn)
+            self._purge_finished(conn)
+            row = conn.execute(
+                "SELECT * FROM upload_jobs WHERE status = ? AND (next_attempt_at IS NULL OR next_attempt_at <= ?)"
+                " ORDER BY created_at LIMIT 1",
+                (QUEUED, time.time()),
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                conn.execute(
+                    "UPDATE upload_jobs SET status = ?, attempts = attempts + 1, heartbeat_at = ?, updated_at = ? WHERE id = ?",
+                    (RUNNING, now, now, row["id"]),
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _worker(self):
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"Upload queue error: {e}")
+                job = None
+            if job is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        # Poll occasionally so jobs orphaned by another process are noticed
+                        self._wakeup.wait(timeout=self._idle_wait())
+                continue
+            self._run(job)
+
+    def _idle_wait(self) -> float:
+        """Seconds until the next backed-off job is due, at most ``stale_after / 2``"""
+        wait = self.stale_after / 2
+        try:
+            row = self._connect().execute(
+                "SELECT MIN(next_attempt_at) FROM upload_jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()
+        except sqlite3.Error:
+            return wait
+        if row[0] is not None:
+            wait = min(wait, max(0.0, row[0] - time.time()))
+        return wait
+
+    def _run(self, job: sqlite3.Row):
+        job_id = job["id"]
+        if not os.path.exists(job["spool_path"]):
+            self._finish(job_id, FAILED, error="Queued audio is missing")
+            return
+        params = json.loads(job["params"])
+        client = self.client_factory()
+        client.auth_token = job["auth_token"]
+        client.user_data = json.loads(job["user_data"] or "{}")
+        started = time.monotonic()
+        finished = threading.Event()
+
+        def beat():
+            # Keep the heartbeat fresh while a slow chunk is in flight
+            while not finished.wait(self.stale_after / 4):
+                self._update(job_id, heartbeat_at=time.time())
+
+        threading.Thread(target=beat, name=f"upload-heartbeat-{job_id[:8]}", daemon=True).start()
+
+        def on_progress(chunks_done: int, total_chunks: int, bytes_sent: int):
+            elapsed = time.monotonic() - started
+            self._update(
+                job_id,
+                chunks_done=chunks_done,
+                total_chunks=total_chunks,
+                bytes_sent=bytes_sent,
+                bytes_per_sec=bytes_sent / elapsed if elapsed > 0 else 0.0,
+                heartbeat_at=time.time(),
+            )
+
+        try:
+            result = client.upload_complete_audio(
+                filepath=job["spool_path"], progress_callback=on_progress, notify=False, **params
+            )
+        except Exception as e:
+            result = {"success": False, "data": {"error": str(e)}}
+        finally:
+            finished.set()
+
+        if result.get("success"):
+            self._finish(job_id, DONE, error=None, result=json.dumps(result.get("data"), default=str))
+            self._discard_spool(job)
+            return
+
+        data = result.get("data") or {}
+        error = data.get("error") or data.get("message") or data.get("detail") or "Upload failed"
+        status = result.get("status_code")
+        retryable = status is None or status >= 500 or status == 429
+        if retryable and job["attempts"] + 1 < self.max_attempts:
+            delay = self.retry_policy.delay(job["attempts"])
+            self._update(job_id, status=QUEUED, error=str(error), next_attempt_at=time.time() + delay)
+        else:
+            self._finish(job_id, FAILED, error=str(error))
+            self._discard_spool(job)
+
+    @staticmethod
+    def _discard_spool(job: sqlite3.Row):
+        try:
+            os.remove(job["spool_path"])
+        except OSError:
+            pass
+
+
+_queue_instance = None
+_queue_lock = threading.Lock()
+
+
+def get_upload_queue() -> UploadQueue:
+    """Get the process-wide upload queue, starting its workers if necessary.
+
+    Starting the workers also resumes any jobs left over from a previous run.
+    """
+    global _queue_instance
+    if _queue_instance is None:
+        with _queue_lock:
+            if _queue_instance is None:
+                _queue_instance = UploadQueue()
+                _queue_instance.start()
+    return _queue_instance